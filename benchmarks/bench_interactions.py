@@ -0,0 +1,37 @@
+"""Benchmarks of the associations between columns.
+
+They are computed on a random sample of the rows, as in
+``summarize_dataframe``.
+"""
+
+from skrubview import _interactions
+from skrubview._sampling import SAMPLE_SIZE, draw_sample
+
+from .common import BACKENDS, DTYPES, SHAPES, make_dataframe, parse_shape
+
+# cramer_v returns the full (n_columns, n_columns) matrix
+_MAX_CRAMER_V_COLUMNS = 500
+
+
+class Interactions:
+    params = [SHAPES, list(DTYPES), BACKENDS]
+    param_names = ["shape", "dtypes", "backend"]
+    timeout = 600
+
+    def setup(self, shape, dtypes, backend):
+        self.sample = draw_sample(
+            make_dataframe(shape, dtypes, backend), size=SAMPLE_SIZE
+        )
+        self.n_columns = parse_shape(shape)[1]
+
+    def time_cramer_v(self, *params):
+        if self.n_columns > _MAX_CRAMER_V_COLUMNS:
+            # asv (and run.py) skip a benchmark that raises NotImplementedError
+            raise NotImplementedError()
+        _interactions.cramer_v(self.sample)
+
+    def time_top_associations(self, *params):
+        _interactions.top_associations(self.sample, k=20)
+
+    def peakmem_top_associations(self, *params):
+        _interactions.top_associations(self.sample, k=20)
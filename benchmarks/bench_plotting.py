@@ -0,0 +1,49 @@
+"""Benchmarks of the plots of each kind, on all the rows of a column."""
+
+from collections import Counter
+
+from skrub import _dataframe as sbd
+
+from skrubview import _plotting
+
+from .common import BACKENDS, ROW_SHAPES, make_dataframe
+
+
+class Plotting:
+    params = [ROW_SHAPES, BACKENDS, ["svg", "json", "matplotlib"]]
+    param_names = ["shape", "backend", "plot_backend"]
+    timeout = 600
+
+    def setup(self, shape, backend, plot_backend):
+        if plot_backend == "matplotlib":
+            try:
+                import matplotlib  # noqa: F401
+            except ImportError:
+                raise NotImplementedError()
+        self.plot_backend = plot_backend
+        df = make_dataframe(shape, "mixed", backend)
+        self.floats = sbd.col(df, "float_0")
+        self.dates = sbd.col(df, "datetime_4")
+        strings = sbd.to_numpy(sbd.col(df, "str_2"))
+        self.value_counts = dict(Counter(strings).most_common(10))
+        self.n_rows = len(strings)
+
+    def time_histogram(self, *params):
+        _plotting.histogram(self.floats, backend=self.plot_backend)
+
+    def time_histogram_datetime(self, *params):
+        _plotting.histogram(self.dates, backend=self.plot_backend)
+
+    def time_line(self, *params):
+        _plotting.line(self.dates, self.floats, backend=self.plot_backend)
+
+    def time_value_counts(self, *params):
+        _plotting.value_counts(
+            self.value_counts,
+            len(self.value_counts),
+            self.n_rows,
+            backend=self.plot_backend,
+        )
+
+    def peakmem_line(self, *params):
+        _plotting.line(self.dates, self.floats, backend=self.plot_backend)
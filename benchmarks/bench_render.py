@@ -0,0 +1,36 @@
+"""Benchmarks of the HTML and text reports, from a summary with plots.
+
+The summary does not depend on the number of rows, so only the number of
+columns is swept. The first HTML render parses and compiles the templates;
+the next ones reuse the compiled templates of the shared jinja environment.
+"""
+
+from skrubview import _html
+from skrubview._html import to_html
+from skrubview._text import to_text
+
+from .common import COLUMN_SHAPES, DTYPES, make_summary
+
+
+class Render:
+    params = [COLUMN_SHAPES, list(DTYPES), ["svg", "json"]]
+    param_names = ["shape", "dtypes", "plot_backend"]
+    timeout = 600
+
+    def setup(self, shape, dtypes, plot_backend):
+        self.summary = make_summary(shape, dtypes, "polars", plot_backend)
+        # compile the templates outside of the timed renders
+        to_html(self.summary)
+
+    def time_to_html(self, *params):
+        to_html(self.summary)
+
+    def time_to_html_first_render(self, *params):
+        _html._get_jinja_env.cache_clear()
+        to_html(self.summary)
+
+    def time_to_text(self, *params):
+        to_text(self.summary)
+
+    def peakmem_to_html(self, *params):
+        to_html(self.summary)
@@ -0,0 +1,20 @@
+"""Benchmarks of ``summarize_dataframe`` (statistics and associations)."""
+
+from skrubview._summarize import summarize_dataframe
+
+from .common import BACKENDS, DTYPES, SHAPES, make_dataframe
+
+
+class Summarize:
+    params = [SHAPES, list(DTYPES), BACKENDS]
+    param_names = ["shape", "dtypes", "backend"]
+    timeout = 600
+
+    def setup(self, shape, dtypes, backend):
+        self.df = make_dataframe(shape, dtypes, backend)
+
+    def time_summarize_dataframe(self, *params):
+        summarize_dataframe(self.df, with_plots=False)
+
+    def peakmem_summarize_dataframe(self, *params):
+        summarize_dataframe(self.df, with_plots=False)
@@ -0,0 +1,62 @@
+"""Data shared by the benchmarks.
+
+Dataframes are built with the generators of ``tests/conftest.py``. Shapes
+are ``"<n_rows>x<n_columns>"`` strings: the rows are swept with 10 columns
+and the columns with 1000 rows, rather than taking all the combinations.
+"""
+
+import functools
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "tests"))
+
+from conftest import _make_dataframe  # noqa: E402
+
+from skrubview._summarize import summarize_dataframe  # noqa: E402
+
+ROW_SHAPES = ["1000x10", "100000x10", "10000000x10"]
+COLUMN_SHAPES = ["1000x10", "1000x500", "1000x5000"]
+SHAPES = ROW_SHAPES + COLUMN_SHAPES[1:]
+DTYPES = {
+    "mixed": ["float", "int", "str", "category", "datetime"],
+    "numeric": ["float", "int"],
+    "string": ["str", "category"],
+}
+BACKENDS = ["pandas", "polars"]
+# larger dataframes are resampled from one of this size, which is much
+# faster than generating all the values (the columns have few distinct
+# values anyway)
+_MAX_GENERATED_ROWS = 100_000
+
+
+def parse_shape(shape):
+    n_rows, n_columns = shape.split("x")
+    return int(n_rows), int(n_columns)
+
+
+@functools.lru_cache(maxsize=2)
+def make_dataframe(shape, dtypes="mixed", backend="polars"):
+    n_rows, n_columns = parse_shape(shape)
+    kinds = DTYPES[dtypes]
+    columns = []
+    for i in range(n_columns):
+        kind = kinds[i % len(kinds)]
+        columns.append({"dtype": kind, "name": f"{kind}_{i}"})
+    df = _make_dataframe(
+        {"n_rows": min(n_rows, _MAX_GENERATED_ROWS), "columns": columns}
+    )
+    if n_rows > df.shape[0]:
+        df = df.sample(n_rows, with_replacement=True, seed=0)
+    if backend == "pandas":
+        df = df.to_pandas()
+    return df
+
+
+@functools.lru_cache(maxsize=1)
+def make_summary(shape, dtypes="mixed", backend="polars", plot_backend="svg"):
+    return summarize_dataframe(
+        make_dataframe(shape, dtypes, backend),
+        with_plots=True,
+        plot_backend=plot_backend,
+    )
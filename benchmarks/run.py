@@ -0,0 +1,219 @@
+"""Run the benchmarks and compare them to saved results, without asv.
+
+The benchmarks of the ``bench_*.py`` modules follow asv's conventions
+(``time_*`` and ``peakmem_*`` methods, ``params``), so they can also be run
+with ``asv run --config benchmarks/asv.conf.json``. This script runs them
+in the current environment::
+
+    python benchmarks/run.py -k Summarize --quick --save before.json
+    # ... change the code ...
+    python benchmarks/run.py -k Summarize --quick --compare before.json
+
+``time_*`` benchmarks report the median of at least ``--repeat`` runs
+(for about a second), after a warm-up run. ``peakmem_*`` benchmarks run in
+a new process and report its maximum resident memory, including the data
+built by ``setup`` (as asv does). With ``--compare``, the script exits with
+an error if a benchmark is more than ``--max-ratio`` times slower, or uses
+more memory, than in the saved results.
+"""
+
+import argparse
+import importlib
+import itertools
+import json
+import platform
+import re
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import warnings
+from pathlib import Path
+
+_ROOT = Path(__file__).resolve().parents[1]
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+from benchmarks.common import parse_shape  # noqa: E402
+
+MODULES = [
+    "bench_summarize",
+    "bench_interactions",
+    "bench_plotting",
+    "bench_render",
+]
+# --quick skips dataframes with more cells
+_QUICK_MAX_CELLS = 10**6
+
+
+class _Benchmark:
+    def __init__(self, module, cls, method, params):
+        self.module = module
+        self.cls = cls
+        self.method = method
+        self.params = params
+        self.name = f"{cls.__name__}.{method}({', '.join(map(str, params))})"
+
+    def prepare(self):
+        instance = self.cls()
+        if hasattr(instance, "setup"):
+            instance.setup(*self.params)
+        return getattr(instance, self.method)
+
+
+def iter_benchmarks(pattern=None, quick=False):
+    for module_name in MODULES:
+        module = importlib.import_module(f"benchmarks.{module_name}")
+        classes = [c for c in vars(module).values() if hasattr(c, "params")]
+        for cls in classes:
+            for params in itertools.product(*cls.params):
+                shape = dict(zip(cls.param_names, params)).get("shape")
+                if quick and shape is not None:
+                    n_rows, n_columns = parse_shape(shape)
+                    if n_rows * n_columns > _QUICK_MAX_CELLS:
+                        continue
+                for method in sorted(vars(cls)):
+                    if not method.startswith(("time_", "peakmem_")):
+                        continue
+                    bench = _Benchmark(module_name, cls, method, params)
+                    if pattern is None or re.search(pattern, bench.name):
+                        yield bench
+
+
+def time_benchmark(bench, repeat=5, min_time=1.0):
+    func = bench.prepare()
+    start = time.perf_counter()
+    func()
+    first = time.perf_counter() - start
+    # slow benchmarks are not repeated: their first run is the measure
+    if first > min_time:
+        return first
+    times = []
+    # fast benchmarks are repeated for about min_time, to reduce the noise
+    while len(times) < repeat or (sum(times) < min_time and len(times) < 1000):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def _max_rss():
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on linux, bytes on macOS
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def peakmem_benchmark(bench):
+    result = subprocess.run(
+        [sys.executable, __file__, "--peakmem-one", bench.name],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode:
+        raise RuntimeError(result.stderr)
+    return int(result.stdout.split()[-1])
+
+
+def _run_peakmem_one(name):
+    warnings.simplefilter("ignore")
+    (bench,) = [b for b in iter_benchmarks() if b.name == name]
+    bench.prepare()()
+    print(_max_rss())
+
+
+def run(pattern=None, quick=False, repeat=5):
+    # e.g. matplotlib's missing glyphs for the control characters of the data
+    warnings.simplefilter("ignore")
+    results = {}
+    for bench in iter_benchmarks(pattern, quick):
+        try:
+            if bench.method.startswith("peakmem_"):
+                value = peakmem_benchmark(bench)
+            else:
+                value = time_benchmark(bench, repeat=repeat)
+        except NotImplementedError:
+            print(f"{bench.name}: skipped", flush=True)
+            continue
+        results[bench.name] = value
+        print(f"{bench.name}: {_format(bench.name, value)}", flush=True)
+    return results
+
+
+def _format(name, value):
+    if name.startswith("peakmem_", name.index(".") + 1):
+        return f"{value / 2**20:.1f} MiB"
+    return f"{value * 1000:.2f} ms"
+
+
+def compare(results, baseline, max_ratio):
+    """Print the changes and return the names of the regressions."""
+    regressions = []
+    for name, value in results.items():
+        if name not in baseline:
+            continue
+        ratio = value / baseline[name] if baseline[name] else float("inf")
+        is_regression = ratio > max_ratio
+        if is_regression:
+            regressions.append(name)
+        print(
+            f"{'REGRESSION ' if is_regression else ''}{name}: "
+            f"{_format(name, baseline[name])} -> {_format(name, value)} "
+            f"({ratio:.2f}x)"
+        )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "-k",
+        dest="pattern",
+        default=None,
+        help="Only run the benchmarks whose name matches this regex.",
+    )
+    parser.add_argument(
+        "--quick",
+        action="store_true",
+        help=f"Skip dataframes with more than {_QUICK_MAX_CELLS} cells.",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Minimum number of timed runs."
+    )
+    parser.add_argument("--save", default=None, help="Store the results in this file.")
+    parser.add_argument(
+        "--compare", default=None, help="Compare to the results stored in this file."
+    )
+    parser.add_argument(
+        "--max-ratio",
+        type=float,
+        default=1.5,
+        help="With --compare, fail if a result is this many times the saved one.",
+    )
+    parser.add_argument("--peakmem-one", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.peakmem_one is not None:
+        _run_peakmem_one(args.peakmem_one)
+        return
+    results = run(args.pattern, quick=args.quick, repeat=args.repeat)
+    if args.save is not None:
+        Path(args.save).write_text(
+            json.dumps(
+                {
+                    "machine": platform.node(),
+                    "python": platform.python_version(),
+                    "results": results,
+                },
+                indent=2,
+            ),
+            "UTF-8",
+        )
+    if args.compare is not None:
+        baseline = json.loads(Path(args.compare).read_text("UTF-8"))["results"]
+        regressions = compare(results, baseline, args.max_ratio)
+        if regressions:
+            sys.exit(f"{len(regressions)} benchmark(s) regressed.")
+
+
+if __name__ == "__main__":
+    main()
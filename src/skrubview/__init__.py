@@ -1,7 +1,32 @@
 """Summarize the contents of a dataframe and generate an HTML or text report."""
 
-from ._cli import run
-from ._report import Report
+from ._profile import add_hook as add_profile_hook
+from ._profile import remove_hook as remove_profile_hook
 
 __version__ = "0.0.1"
-__all__ = ["run", "Report", "__version__"]
+__all__ = [
+    "run",
+    "Report",
+    "add_profile_hook",
+    "remove_profile_hook",
+    "__version__",
+]
+
+
+def __getattr__(name):
+    # Report and run are imported on first access: they need skrub and the
+    # dataframe libraries, which take seconds to import, and importing
+    # skrubview (for example to run "skrubview --help") should not.
+    if name == "Report":
+        from ._report import Report
+
+        return Report
+    if name == "run":
+        from ._cli import run
+
+        return run
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,40 @@
+"""Time budget of ``summarize_dataframe(..., time_budget=...)``.
+
+The stages of a summary get successive shares of the budget, counted from
+the start of the summary: the statistics must be done by
+``STATISTICS_SHARE`` of it and the search for associations stops at
+``ASSOCIATIONS_SHARE``; the rest is left for the plots. A stage that would
+not fit in its share works on the random sample instead of the whole
+dataframe, and the summary marks what was degraded.
+"""
+
+import time
+
+STATISTICS_SHARE = 0.5
+ASSOCIATIONS_SHARE = 0.75
+
+
+class TimeBudget:
+    """A number of seconds, starting now.
+
+    Parameters
+    ----------
+    seconds : float
+        The budget.
+    """
+
+    def __init__(self, seconds):
+        if not seconds > 0:
+            raise ValueError(
+                f"'time_budget' should be a positive number of seconds, got {seconds!r}."
+            )
+        self.seconds = seconds
+        self.start = time.perf_counter()
+
+    def deadline(self, share=1.0):
+        """The ``time.perf_counter()`` value at which ``share`` of it is spent."""
+        return self.start + share * self.seconds
+
+    def fits(self, seconds, share=1.0):
+        """Whether work taking ``seconds`` from now ends by ``deadline(share)``."""
+        return time.perf_counter() + seconds <= self.deadline(share)
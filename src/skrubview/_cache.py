@@ -0,0 +1,129 @@
+"""Store the summaries of files on disk, to reuse them in later runs.
+
+A summary is stored under a key computed from a fingerprint of the file, the
+skrubview version and the options of ``summarize_dataframe``. When the file
+or the options change the key changes, so stale entries are never read; they
+are eventually evicted, least recently used first, when the cache grows over
+its size limit.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from pathlib import Path
+
+DEFAULT_MAX_BYTES = 500 * 2**20
+FINGERPRINTS = ("mtime", "content")
+_SUFFIX = ".pickle"
+_CHUNK_SIZE = 2**20
+
+
+def file_fingerprint(file_path, fingerprint="mtime"):
+    """Identify the contents of a file.
+
+    ``"mtime"`` uses the path, size and modification time, which is free to
+    compute. ``"content"`` hashes the bytes of the file instead, which is
+    slower but also recognizes a file that was copied or checked out again
+    (for example in a new CI job) without being modified.
+    """
+    file_path = Path(file_path).resolve()
+    stat = file_path.stat()
+    if fingerprint == "mtime":
+        return {
+            "path": str(file_path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }
+    if fingerprint == "content":
+        digest = hashlib.blake2b(digest_size=20)
+        with open(file_path, "rb") as stream:
+            for chunk in iter(lambda: stream.read(_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return {"size": stat.st_size, "blake2b": digest.hexdigest()}
+    raise ValueError(
+        f"'fingerprint' should be one of {FINGERPRINTS}, got {fingerprint!r}"
+    )
+
+
+class SummaryCache:
+    """Summaries stored as pickle files in a directory.
+
+    Entries are written to a temporary file which is then renamed, so that
+    processes sharing the directory never read a partial entry; if two
+    processes store the same entry, the last one wins. Reading an entry
+    updates its modification time, which is used to evict the least recently
+    used entries when the total size exceeds ``max_bytes``.
+
+    Parameters
+    ----------
+    directory : str or Path
+        Where the entries are stored. It is created if needed.
+    max_bytes : int or None
+        Size limit of the cache. ``None`` means no limit.
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    def key(self, fingerprint, options):
+        from . import __version__
+
+        description = {
+            "version": __version__,
+            "file": fingerprint,
+            "options": options,
+        }
+        return hashlib.sha256(
+            json.dumps(description, sort_keys=True, default=repr).encode("UTF-8")
+        ).hexdigest()
+
+    def get(self, key):
+        """The stored summary, or ``None`` if there is none."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as stream:
+                summary = pickle.load(stream)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            # evicted by another process in the meantime
+            pass
+        return summary
+
+    def put(self, key, summary):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as stream:
+                pickle.dump(summary, stream, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        self.evict()
+
+    def evict(self):
+        """Remove the least recently used entries until the cache fits."""
+        if self.max_bytes is None:
+            return
+        entries = []
+        for path in self.directory.glob(f"*{_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def _path(self, key):
+        return self.directory / f"{key}{_SUFFIX}"
@@ -1,10 +1,11 @@
 import argparse
+import functools
+import os
+import sys
 from pathlib import Path
 
-from rich import print as rprint
-
-from ._report import Report
-from . import _utils
+from ._cache import DEFAULT_MAX_BYTES, FINGERPRINTS
+from ._profile import format_profile
 
 
 def run():
@@ -14,9 +15,13 @@ def run():
     parser.add_argument(
         "input_file",
         type=str,
-        help="CSV or Parquet file for which a report will be generated. "
-        "The filename extension must be '.csv' or '.parquet' . "
-        "CSV files will be parsed with Polars' default configuration.",
+        help="CSV, Parquet or Arrow IPC file for which a report will be "
+        "generated. The filename extension must be '.csv', '.parquet', "
+        "'.arrow', '.feather' or '.ipc'. Arrow IPC files are memory-mapped. "
+        "CSV files will be parsed with Polars' default configuration. "
+        "A directory (possibly with hive-style partitions) or a quoted glob "
+        "pattern such as 'data/**/*.parquet' is summarized as one dataset, "
+        "one file per job.",
     )
     parser.add_argument(
         "--order_by",
@@ -26,6 +31,130 @@ def run():
         "Other numerical columns will be plotted as function of the sorting column. "
         "Must be of numerical or datetime type.",
     )
+    parser.add_argument(
+        "--n_jobs",
+        type=int,
+        default=None,
+        help="Number of threads used to summarize columns in parallel. "
+        "-1 means using all processors.",
+    )
+    parser.add_argument(
+        "--approximate",
+        action="store_true",
+        help="Estimate quantiles in a single pass with bounded memory "
+        "instead of computing them exactly.",
+    )
+    parser.add_argument(
+        "--sketch_threshold",
+        type=int,
+        default=None,
+        help="Columns with more distinct values than this get approximate "
+        "value counts computed in bounded memory.",
+    )
+    parser.add_argument(
+        "--max_associations",
+        type=int,
+        default=None,
+        help="Number of most strongly associated pairs of columns to show.",
+    )
+    parser.add_argument(
+        "--association_threshold",
+        type=float,
+        default=None,
+        help="Do not show pairs of columns with an association (Cramér's V) "
+        "below this value.",
+    )
+    parser.add_argument(
+        "--sample_size",
+        type=int,
+        default=None,
+        help="Number of rows in the random sample used for associations "
+        "between columns and plots.",
+    )
+    parser.add_argument(
+        "--random_state",
+        type=int,
+        default=0,
+        help="Seed used to draw the sample.",
+    )
+    parser.add_argument(
+        "--stratify_by",
+        type=str,
+        default=None,
+        help="Stratify the sample on this column.",
+    )
+    parser.add_argument(
+        "--columns",
+        nargs="+",
+        default=None,
+        help="Only read and summarize these columns. Each value is a column "
+        "name or a (quoted) glob pattern such as 'price_*'.",
+    )
+    parser.add_argument(
+        "--plot_backend",
+        choices=["svg", "matplotlib", "json"],
+        default="svg",
+        help=(
+            "Draw the plots directly as SVG (the default), with matplotlib, or "
+            "in the browser from their data (json)."
+        ),
+    )
+    parser.add_argument(
+        "--stream_csv",
+        action="store_true",
+        help="Read a CSV file in blocks, in a single pass, so that memory does "
+        "not depend on the size of the file. Statistics are then approximate.",
+    )
+    parser.add_argument(
+        "--csv_block_size",
+        type=int,
+        default=None,
+        help="Size in bytes of the blocks read with --stream_csv "
+        "(default: 8 MiB).",
+    )
+    parser.add_argument(
+        "--cache_dir",
+        type=str,
+        default=os.environ.get("SKRUBVIEW_CACHE_DIR"),
+        help="Store the summary in this directory and reuse it for later "
+        "reports of the same unmodified file with the same options. "
+        "Defaults to the SKRUBVIEW_CACHE_DIR environment variable, if set.",
+    )
+    parser.add_argument(
+        "--cache_max_bytes",
+        type=int,
+        default=DEFAULT_MAX_BYTES,
+        help="Size limit of the cache directory; the least recently used "
+        "summaries are removed to stay below it.",
+    )
+    parser.add_argument(
+        "--cache_fingerprint",
+        choices=list(FINGERPRINTS),
+        default="mtime",
+        help="Recognize a file by its path, size and modification time "
+        "(mtime, the default) or by a hash of its contents (content).",
+    )
+    parser.add_argument(
+        "--no_cache",
+        "--no-cache",
+        action="store_true",
+        help="Do not read or store summaries in the cache directory.",
+    )
+    parser.add_argument(
+        "--time_budget",
+        "--time-budget",
+        type=float,
+        default=None,
+        help="Number of seconds computing the statistics should take. When "
+        "it would take longer, statistics, plots and associations are "
+        "estimated from the random sample, and marked as such.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print the slowest stages and columns (to stderr) after the "
+        "report.",
+    )
     format_group = parser.add_mutually_exclusive_group()
     format_group.add_argument(
         "--html", action="store_true", help="Generate HTML report."
@@ -48,13 +177,59 @@ def run():
         "(mostly for debugging).",
     )
     args = parser.parse_args()
+    # imported only now, as skrub and the dataframe libraries are slow to
+    # import, so that --help and mistyped arguments get an immediate answer
+    from ._report import Report
+    from ._summarize import (
+        ASSOCIATION_THRESHOLD,
+        MAX_ASSOCIATIONS,
+        SAMPLE_SIZE,
+        SKETCH_THRESHOLD,
+    )
+    from ._utils import CSV_BLOCK_SIZE
+
+    for name, default in [
+        ("sketch_threshold", SKETCH_THRESHOLD),
+        ("max_associations", MAX_ASSOCIATIONS),
+        ("association_threshold", ASSOCIATION_THRESHOLD),
+        ("sample_size", SAMPLE_SIZE),
+    ]:
+        if getattr(args, name) is None:
+            setattr(args, name, default)
 
     input_file = Path(args.input_file).resolve()
-    dataframe = _utils.read(input_file)
-    report = Report(dataframe, order_by=args.order_by, title=input_file.name)
+    if args.stream_csv:
+        block_size = args.csv_block_size
+        if block_size is None:
+            block_size = CSV_BLOCK_SIZE
+        make_report = functools.partial(Report.from_csv, block_size=block_size)
+    else:
+        make_report = Report
+    report = make_report(
+        input_file,
+        order_by=args.order_by,
+        title=input_file.name,
+        n_jobs=args.n_jobs,
+        approximate=args.approximate,
+        sketch_threshold=args.sketch_threshold,
+        max_associations=args.max_associations,
+        association_threshold=args.association_threshold,
+        sample_size=args.sample_size,
+        random_state=args.random_state,
+        stratify_by=args.stratify_by,
+        plot_backend=args.plot_backend,
+        cache_dir=None if args.no_cache else args.cache_dir,
+        cache_max_bytes=args.cache_max_bytes,
+        cache_fingerprint=args.cache_fingerprint,
+        columns=None if args.columns is None else _columns_selector(args.columns),
+        profile=args.profile,
+        time_budget=args.time_budget,
+    )
     if args.open:
         report.open()
     elif args.dict:
+        from rich import print as rprint
+
         rprint(report.summary_without_plots)
     elif args.json:
         print(report.json)
@@ -64,3 +239,24 @@ def run():
         print(report.text)
     else:
         print(report.text)
+    if args.profile:
+        _print_profile(report)
+
+
+def _print_profile(report):
+    profile = report._any_summary.get("profile")
+    if profile is None:
+        print("No profile: the summary was read from the cache.", file=sys.stderr)
+        return
+    print(format_profile(profile), file=sys.stderr)
+
+
+def _columns_selector(values):
+    from skrub import selectors as s
+
+    names = [v for v in values if not any(char in v for char in "*?[")]
+    selector = s.cols(*names)
+    for pattern in values:
+        if pattern not in names:
+            selector = selector | s.glob(pattern)
+    return selector
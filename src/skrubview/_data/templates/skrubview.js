@@ -1,5 +1,15 @@
 function updateColSelection(event) {
-    updateSelectedColsSnippet(event.target.dataset.reportId);
+    const reportId = event.target.dataset.reportId;
+    const wideReport = wideReports[reportId];
+    if (wideReport !== undefined) {
+        const colIdx = Number(event.target.dataset.columnIdx);
+        if (event.target.checked) {
+            wideReport.selected.add(colIdx);
+        } else {
+            wideReport.selected.delete(colIdx);
+        }
+    }
+    updateSelectedColsSnippet(reportId);
 }
 
 function isSelectedCol(columnElem) {
@@ -10,15 +20,25 @@ function isSelectedCol(columnElem) {
 
 function updateSelectedColsSnippet(reportId) {
     const reportElem = document.getElementById(reportId);
-    const allCols = reportElem.querySelectorAll(".skrubview-column-summary");
-    const selectedCols = Array.from(allCols).filter(c => isSelectedCol(c));
-    const snippet = selectedCols.map(col => col.dataset.nameRepr).join(", ");
+    const wideReport = wideReports[reportId];
+    let snippet;
+    if (wideReport !== undefined) {
+        snippet = wideReport.data.names_repr.filter(
+            (_, i) => wideReport.selected.has(i)).join(", ");
+    } else {
+        const allCols = reportElem.querySelectorAll(".skrubview-column-summary");
+        const selectedCols = Array.from(allCols).filter(c => isSelectedCol(c));
+        snippet = selectedCols.map(col => col.dataset.nameRepr).join(", ");
+    }
     const bar = reportElem.querySelector(".selected-columns-box");
     bar.textContent = "[" + snippet + "]";
 }
 
 function clearSelectedCols(reportId) {
     const reportElem = document.getElementById(reportId);
+    if (reportId in wideReports) {
+        wideReports[reportId].selected.clear();
+    }
     reportElem.querySelectorAll(
         "input.skrubview-select-column-checkbox[type='checkbox']").forEach(
         box => {
@@ -30,6 +50,9 @@ function clearSelectedCols(reportId) {
 
 function selectAllCols(reportId) {
     const reportElem = document.getElementById(reportId);
+    if (reportId in wideReports) {
+        wideReports[reportId].selected = new Set(wideReports[reportId].accepted);
+    }
     reportElem.querySelectorAll(".skrubview-column-summary").forEach(
         elem => {
             const box = elem.querySelector(
@@ -194,6 +217,10 @@ function revealColCard(reportId, colIdx) {
     allCols.forEach(col => {
         col.removeAttribute("data-is-selected-in-table");
     });
+    if (reportId in wideReports) {
+        revealWideColCard(reportId, colIdx);
+        return;
+    }
     if (colIdx === null) {
         return;
     }
@@ -226,14 +253,25 @@ function onFilterChange(colFilterId) {
     const filterName = selectElem.value;
     const acceptedCols = colFilters[filterName]["columns"];
     const reportElem = document.getElementById(reportId);
-    const colElements = reportElem.querySelectorAll(".skrubview-filterable-column");
-    colElements.forEach(elem => {
-        if (acceptedCols.includes(elem.dataset.columnName)) {
-            elem.removeAttribute("data-is-excluded-by-filter");
-        } else {
-            elem.dataset.isExcludedByFilter = "";
-        }
-    });
+    const wideReport = wideReports[reportId];
+    if (wideReport !== undefined) {
+        // only the accepted columns are rendered, one page at a time
+        const accepted = new Set(acceptedCols);
+        wideReport.accepted = wideReport.data.names.flatMap(
+            (name, i) => accepted.has(name) ? [i] : []);
+        wideReport.page = 0;
+        renderWidePage(reportId);
+    } else {
+        const colElements = reportElem.querySelectorAll(
+            ".skrubview-filterable-column");
+        colElements.forEach(elem => {
+            if (acceptedCols.includes(elem.dataset.columnName)) {
+                elem.removeAttribute("data-is-excluded-by-filter");
+            } else {
+                elem.dataset.isExcludedByFilter = "";
+            }
+        });
+    }
     document.getElementById(`${reportId}_display_n_columns`).textContent = acceptedCols
         .length.toString();
     const tableElem = reportElem.querySelector(".skrubview-dataframe-sample-table");
@@ -257,3 +295,507 @@ function clearColFilter(event){
     selectElem.value = "all()";
     onFilterChange(selectElem.id);
 }
+
+/* Wide mode: the column cards and the columns of the sample table are kept
+ * as data, and only the current page of the columns accepted by the filter
+ * is turned into DOM elements. */
+
+// the script is included again by each report shown in a notebook; var
+// (unlike const) can be declared again, and the state of earlier reports
+// is kept
+var wideReports = window.wideReports || {};
+
+function initWideReport(reportId) {
+    const dataElem = document.getElementById(`${reportId}_wide_data`);
+    if (dataElem === null) {
+        return;
+    }
+    const data = JSON.parse(dataElem.textContent);
+    const allCols = data.names.map((_, i) => i);
+    wideReports[reportId] = {
+        data: data,
+        accepted: allCols,
+        selected: new Set(allCols),
+        page: 0,
+    };
+}
+
+function changeWidePage(event) {
+    const reportId = event.target.closest(".skrubview-report").id;
+    wideReports[reportId].page += Number(event.target.dataset.pageStep);
+    renderWidePage(reportId);
+}
+
+function renderWidePage(reportId) {
+    const wideReport = wideReports[reportId];
+    const pageSize = wideReport.data.page_size;
+    const nPages = Math.max(1, Math.ceil(wideReport.accepted.length / pageSize));
+    wideReport.page = Math.max(0, Math.min(wideReport.page, nPages - 1));
+    const start = wideReport.page * pageSize;
+    const cols = wideReport.accepted.slice(start, start + pageSize);
+    const reportElem = document.getElementById(reportId);
+    const tableElem = reportElem.querySelector(".skrubview-dataframe-sample-table");
+    renderWideTable(tableElem, wideReport.data, cols);
+    renderWideCards(reportId, cols);
+    reportElem.querySelectorAll(".skrubview-wide-pager").forEach(pager => {
+        pager.querySelector(".skrubview-wide-pager-text").textContent =
+            `Columns ${start + 1}–${start + cols.length} of ` +
+            `${wideReport.accepted.length}`;
+        pager.querySelector("[data-page-step='-1']").disabled = wideReport.page === 0;
+        pager.querySelector("[data-page-step='1']").disabled =
+            wideReport.page === nPages - 1;
+    });
+    // the selected cell may not be on this page anymore
+    clearTableCellSelection(tableElem);
+    drawPlotsWhenVisible(reportId);
+}
+
+function renderWideTable(tableElem, data, cols) {
+    const header = tableElem.querySelector("thead tr");
+    header.replaceChildren(...cols.map(col => {
+        const th = document.createElement("th");
+        th.className = "skrubview-filterable-column";
+        th.dataset.columnName = data.names[col];
+        th.dataset.columnIdx = col;
+        th.onclick = displayFirstCellValue;
+        th.textContent = data.names[col];
+        return th;
+    }));
+    for (let tablePart of ["head", "tail"]) {
+        tableElem.querySelector(`tbody[data-table-part="${tablePart}"]`).replaceChildren(
+            ...data[tablePart].map(row => {
+                const tr = document.createElement("tr");
+                tr.replaceChildren(...cols.map(col => wideTableCell(tableElem, data,
+                    col, row[col])));
+                return tr;
+            }));
+    }
+    tableElem.querySelector('tr[data-table-part="ellipsis"]').replaceChildren(
+        ...cols.map(col => {
+            const td = document.createElement("td");
+            td.className = "skrubview-ellided-table-part skrubview-filterable-column";
+            td.dataset.columnName = data.names[col];
+            td.textContent = "⋮";
+            return td;
+        }));
+}
+
+function wideTableCell(tableElem, data, col, cell) {
+    // the same attributes as the cells of table-part.html
+    const [valueStr, valueRepr, valueIsNone] = cell;
+    const td = document.createElement("td");
+    td.className = "skrubview-table-cell skrubview-ellided-short " +
+        "skrubview-filterable-column";
+    Object.assign(td.dataset, {
+        columnName: data.names[col],
+        parentTableId: tableElem.id,
+        displayBoxId: `${tableElem.id}_value_box`,
+        filterSnippetBoxId: `${tableElem.id}_filter_snippet_box`,
+        valueReprBoxId: `${tableElem.id}_value_repr_box`,
+        columnIdx: col,
+        columnNameRepr: data.names_repr[col],
+        valueStr: valueStr,
+        valueRepr: valueRepr,
+        colNameStr: data.names[col],
+        colNameRepr: data.names_repr[col],
+        dataframeModule: data.dataframe_module,
+    });
+    if (valueIsNone) {
+        td.dataset.valueIsNone = "";
+    } else {
+        td.textContent = valueStr;
+    }
+    td.onclick = displayValue;
+    return td;
+}
+
+function renderWideCards(reportId, cols) {
+    const wideReport = wideReports[reportId];
+    const data = wideReport.data;
+    const container = document.getElementById(`${reportId}_column_cards`);
+    container.innerHTML = cols.map(col => data.cards[col]).join("");
+    container.querySelectorAll("input.skrubview-select-column-checkbox").forEach(
+        box => {
+            box.checked = wideReport.selected.has(Number(box.dataset.columnIdx));
+        });
+    const constantList = document.getElementById(
+        `${reportId}_constant_columns_list`);
+    if (constantList === null) {
+        return;
+    }
+    constantList.replaceChildren(...cols.filter(
+        col => data.constant_values[col] !== null).flatMap(col => {
+        const dt = document.createElement("dt");
+        dt.className = "skrubview-select-all skrubview-filterable-column";
+        dt.dataset.colIndex = col;
+        dt.dataset.columnName = data.names[col];
+        dt.textContent = data.names[col];
+        const dd = document.createElement("dd");
+        dd.className = "skrubview-filterable-column";
+        dd.dataset.columnName = data.names[col];
+        dd.textContent = data.constant_values[col];
+        return [dt, dd];
+    }));
+}
+
+function revealWideColCard(reportId, colIdx) {
+    const container = document.getElementById(reportId).querySelector(
+        ".skrubview-columns-in-sample-tab");
+    if (colIdx === null) {
+        container.replaceChildren();
+        return;
+    }
+    // the card of the columns tab, with the ids used in the sample tab
+    const colId = `${reportId}_col_${colIdx}`;
+    container.innerHTML = wideReports[reportId].data.cards[colIdx].replace(
+        new RegExp(`${colId}(?![0-9])`, "g"), `${colId}_in_sample_tab`);
+    container.querySelectorAll("input.skrubview-select-column-checkbox").forEach(
+        box => box.remove());
+    container.firstElementChild.dataset.isSelectedInTable = "";
+    drawPlotsWhenVisible(reportId);
+}
+
+/* Charts drawn in the browser from the plots' data (plot_backend="json").
+ * This mirrors the SVG drawn by skrubview's _svg module. */
+
+var PLOT_FONT_SIZE = 9;
+var PLOT_SMALL_FONT_SIZE = 8;
+var PLOT_CHAR_WIDTH = 5.5;
+var PLOT_TICK_LENGTH = 3;
+var PLOT_MAX_TICKS = 5;
+var PLOT_WIDTH = 150;
+var PLOT_HEIGHT = 75;
+var PLOT_BAR_HEIGHT = 12;
+var PLOT_ROW_HEIGHT = 16;
+var PLOT_BAR_MAX_WIDTH = 120;
+var PLOT_AXIS_STYLE = 'fill="none" stroke="#000" stroke-width=".8"';
+
+function plotNum(value) {
+    return (Math.round(value * 10) / 10).toString();
+}
+
+function plotEscape(content) {
+    return String(content).replace(/&/g, "&amp;").replace(/</g, "&lt;").replace(
+        />/g, "&gt;");
+}
+
+function plotText(x, y, content, anchor = "end", rotate = null, small = false) {
+    let attributes = `x="${plotNum(x)}" y="${plotNum(y)}" dy=".35em"`;
+    if (anchor !== "start") {
+        attributes += ` text-anchor="${anchor}"`;
+    }
+    if (rotate !== null) {
+        attributes += ` transform="rotate(${rotate} ${plotNum(x)} ${plotNum(y)})"`;
+    }
+    if (small) {
+        attributes += ` font-size="${PLOT_SMALL_FONT_SIZE}"`;
+    }
+    return `<text ${attributes}>${plotEscape(content)}</text>`;
+}
+
+function plotRect(x, y, width, height) {
+    return `<rect x="${plotNum(x)}" y="${plotNum(y)}" width="${plotNum(width)}" ` +
+        `height="${plotNum(height)}"/>`;
+}
+
+function plotTextWidth(labels) {
+    return Math.max(0, ...labels.map(label => label.length)) * PLOT_CHAR_WIDTH;
+}
+
+function plotDocument(width, height, elements) {
+    width = Math.ceil(width);
+    height = Math.ceil(height);
+    return `<svg xmlns="http://www.w3.org/2000/svg" width="${width}" ` +
+        `height="${height}" viewBox="0 0 ${width} ${height}" ` +
+        `font-family="sans-serif" font-size="${PLOT_FONT_SIZE}">` +
+        elements.join("") + "</svg>";
+}
+
+function formatGeneral(value) {
+    // like python's "{:.3g}" format
+    const exponent = Math.floor(Math.log10(Math.abs(value)));
+    if (exponent < -4 || exponent >= 3) {
+        const [mantissa, power] = value.toExponential(2).split("e");
+        const sign = power[0] === "-" ? "-" : "+";
+        const digits = power.replace(/^[+-]/, "").padStart(2, "0");
+        return `${mantissa.replace(/\.?0+$/, "")}e${sign}${digits}`;
+    }
+    return value.toPrecision(3).replace(/(\.\d*?)0+$/, "$1").replace(/\.$/, "");
+}
+
+function numericTicks(low, high, integer = false) {
+    const span = high - low;
+    const magnitude = 10 ** Math.floor(Math.log10(span / PLOT_MAX_TICKS));
+    let step = magnitude;
+    for (let multiple of [1, 2, 2.5, 5, 10]) {
+        step = multiple * magnitude;
+        if (integer && step % 1) {
+            continue;
+        }
+        if (span / step <= PLOT_MAX_TICKS) {
+            break;
+        }
+    }
+    const ticks = [];
+    const first = Math.ceil(low / step - 1e-9);
+    const last = Math.floor(high / step + 1e-9);
+    for (let i = first; i <= last; i++) {
+        ticks.push(i * step);
+    }
+    const fraction = step.toFixed(10).replace(/0+$/, "").split(".")[1];
+    const decimals = fraction ? fraction.length : 0;
+    const labels = ticks.map(tick => {
+        if (Math.abs(tick) < step * 1e-9) {
+            return "0";
+        }
+        if (Math.abs(tick) >= 1e6 || decimals > 4) {
+            return formatGeneral(tick);
+        }
+        return tick.toFixed(decimals);
+    });
+    return [ticks, labels];
+}
+
+var PLOT_TIME_UNITS = {
+    s: 1e3,
+    m: 60e3,
+    h: 3600e3,
+    D: 86400e3,
+};
+var PLOT_TIME_STEPS = [
+    [1, "s"], [10, "s"], [30, "s"], [1, "m"], [10, "m"], [30, "m"],
+    [1, "h"], [3, "h"], [6, "h"], [12, "h"], [1, "D"], [2, "D"], [7, "D"],
+    [14, "D"], [1, "M"], [2, "M"], [3, "M"], [6, "M"], [1, "Y"], [2, "Y"],
+    [5, "Y"], [10, "Y"], [20, "Y"], [50, "Y"], [100, "Y"],
+];
+
+function timeUnitIndex(ms, unit) {
+    // number of whole units since the epoch, as numpy's datetime64 casts
+    const date = new Date(ms);
+    if (unit === "Y") {
+        return date.getUTCFullYear() - 1970;
+    }
+    if (unit === "M") {
+        return (date.getUTCFullYear() - 1970) * 12 + date.getUTCMonth();
+    }
+    return Math.floor(ms / PLOT_TIME_UNITS[unit]);
+}
+
+function timeUnitStart(index, unit) {
+    if (unit === "Y") {
+        return Date.UTC(1970 + index, 0);
+    }
+    if (unit === "M") {
+        return Date.UTC(1970 + Math.floor(index / 12), ((index % 12) + 12) % 12);
+    }
+    return index * PLOT_TIME_UNITS[unit];
+}
+
+function datetimeTicks(low, high) {
+    // low and high are nanoseconds since the epoch, in local time
+    low = Math.ceil(low / 1e6);
+    high = Math.floor(high / 1e6);
+    let count, unit, start, stop;
+    for ([count, unit] of PLOT_TIME_STEPS) {
+        start = Math.floor(timeUnitIndex(low, unit) / count);
+        stop = Math.floor(timeUnitIndex(high, unit) / count);
+        if (stop - start + 1 <= PLOT_MAX_TICKS) {
+            break;
+        }
+    }
+    const ticks = [];
+    for (let i = start; i <= stop; i++) {
+        const tick = timeUnitStart(i * count, unit);
+        if (low <= tick && tick <= high) {
+            ticks.push(tick);
+        }
+    }
+    const length = {Y: 4, M: 7, D: 10, h: 16, m: 16, s: 19}[unit];
+    let labels = ticks.map(tick => new Date(tick).toISOString().slice(0, length)
+        .replace("T", " "));
+    const days = new Set(labels.map(label => label.slice(0, 10)));
+    if (length > 10 && days.size === 1) {
+        labels = labels.map(label => label.slice(11));
+    }
+    return [ticks.map(tick => tick * 1e6), labels];
+}
+
+function plotTicks(low, high, isDatetime) {
+    return isDatetime ? datetimeTicks(low, high) : numericTicks(low, high);
+}
+
+function plotDataRange(values) {
+    const finite = values.filter(v => v !== null);
+    if (!finite.length) {
+        return [0, 1];
+    }
+    const low = Math.min(...finite);
+    const high = Math.max(...finite);
+    return low === high ? [low - 0.5, high + 0.5] : [low, high];
+}
+
+function plotFrame(xRange, yRange, xLabels, yLabels, title = null, xLabel = null) {
+    const frame = {};
+    frame.rotateXLabels = xLabels.some(label => label.length > 5);
+    frame.left = plotTextWidth(yLabels) + 2 * PLOT_TICK_LENGTH + 2;
+    frame.top = 6 + (title !== null ? PLOT_FONT_SIZE + 6 : 0);
+    frame.right = frame.left + PLOT_WIDTH;
+    frame.bottom = frame.top + PLOT_HEIGHT;
+    let xLabelsHeight, rightMargin;
+    if (frame.rotateXLabels) {
+        xLabelsHeight = plotTextWidth(xLabels) * 0.71 + PLOT_FONT_SIZE;
+        rightMargin = 8;
+    } else {
+        xLabelsHeight = PLOT_FONT_SIZE + 2;
+        rightMargin = Math.max(8, plotTextWidth(xLabels.slice(-1)) / 2);
+    }
+    frame.xLabelY = frame.bottom + PLOT_TICK_LENGTH + 2 + xLabelsHeight + 2;
+    frame.width = frame.right + rightMargin;
+    frame.height = frame.xLabelY + (xLabel !== null ? PLOT_FONT_SIZE + 4 : 0);
+    frame.x = value => frame.left + (value - xRange[0]) / (xRange[1] - xRange[0]) *
+        PLOT_WIDTH;
+    frame.y = value => frame.bottom - (value - yRange[0]) / (yRange[1] - yRange[0]) *
+        PLOT_HEIGHT;
+    frame.document = (content, xTicks, yTicks) => {
+        const elements = [content];
+        const ticks = xTicks.map(
+            t => `M${plotNum(frame.x(t))},${frame.bottom}v${PLOT_TICK_LENGTH}`).concat(
+            yTicks.map(t => `M${frame.left},${plotNum(frame.y(t))}h-${PLOT_TICK_LENGTH}`));
+        elements.push(
+            `<path d="M${frame.left},${frame.top}V${frame.bottom}H${frame.right}` +
+            `${ticks.join("")}" ${PLOT_AXIS_STYLE}/>`);
+        const labelY = frame.bottom + PLOT_TICK_LENGTH + 2 + PLOT_FONT_SIZE / 2;
+        xTicks.forEach((tick, i) => {
+            elements.push(frame.rotateXLabels ?
+                plotText(frame.x(tick), labelY, xLabels[i], "end", -45) :
+                plotText(frame.x(tick), labelY, xLabels[i], "middle"));
+        });
+        yTicks.forEach((tick, i) => {
+            elements.push(plotText(frame.left - PLOT_TICK_LENGTH - 2, frame.y(tick),
+                yLabels[i]));
+        });
+        const center = (frame.left + frame.right) / 2;
+        if (title !== null) {
+            elements.push(plotText(center, frame.top - 10, title, "middle"));
+        }
+        if (xLabel !== null) {
+            elements.push(plotText(center, frame.xLabelY + PLOT_FONT_SIZE / 2, xLabel,
+                "middle"));
+        }
+        return plotDocument(frame.width, frame.height, elements);
+    };
+    return frame;
+}
+
+function drawHistogram(data) {
+    const edges = data.edges;
+    const maxCount = Math.max(1, ...data.counts);
+    const [xTicks, xLabels] = plotTicks(edges[0], edges[edges.length - 1],
+        data.is_datetime);
+    const [yTicks, yLabels] = numericTicks(0, maxCount, true);
+    const frame = plotFrame([edges[0], edges[edges.length - 1]], [0, maxCount],
+        xLabels, yLabels, data.title);
+    const bars = data.counts.map((count, i) => count ? plotRect(frame.x(edges[i]),
+        frame.y(count), frame.x(edges[i + 1]) - frame.x(edges[i]),
+        frame.y(0) - frame.y(count)) : "").join("");
+    return frame.document(`<g fill="${data.color}">${bars}</g>`, xTicks, yTicks);
+}
+
+function drawLine(data) {
+    const xRange = plotDataRange(data.x);
+    const yRange = plotDataRange(data.y);
+    const [xTicks, xLabels] = plotTicks(xRange[0], xRange[1], data.x_is_datetime);
+    const [yTicks, yLabels] = numericTicks(yRange[0], yRange[1]);
+    const frame = plotFrame(xRange, yRange, xLabels, yLabels, null, data.x_label);
+    // missing values break the line: the next point starts a new segment
+    let path = "";
+    let command = "M";
+    data.x.forEach((x, i) => {
+        const y = data.y[i];
+        if (x === null || y === null) {
+            command = "M";
+            return;
+        }
+        path += `${command}${plotNum(frame.x(x))},${plotNum(frame.y(y))}`;
+        command = "L";
+    });
+    const line = `<path d="${path}" fill="none" stroke="${data.color}" ` +
+        'stroke-width="1.2" stroke-linejoin="round"/>';
+    return frame.document(line, xTicks, yTicks);
+}
+
+function drawValueCounts(data) {
+    const labelWidth = plotTextWidth(data.labels) + 2 * PLOT_TICK_LENGTH;
+    const top = 4 + (data.title !== null ? PLOT_FONT_SIZE + 8 : 0);
+    const width = labelWidth + PLOT_BAR_MAX_WIDTH + 8 * PLOT_CHAR_WIDTH;
+    const height = top + PLOT_ROW_HEIGHT * data.counts.length + 4;
+    const maxCount = Math.max(1, ...data.counts);
+    const elements = [];
+    if (data.title !== null) {
+        elements.push(plotText(width / 2, top - 6, data.title, "middle"));
+    }
+    const bars = [];
+    const texts = [];
+    data.counts.forEach((count, i) => {
+        const rowCenter = top + (i + 0.5) * PLOT_ROW_HEIGHT;
+        const barWidth = count / maxCount * PLOT_BAR_MAX_WIDTH;
+        bars.push(plotRect(labelWidth, rowCenter - PLOT_BAR_HEIGHT / 2, barWidth,
+            PLOT_BAR_HEIGHT));
+        texts.push(plotText(labelWidth - 2 * PLOT_TICK_LENGTH, rowCenter,
+            data.labels[i]));
+        // the percentage goes inside the bar if it is large enough
+        texts.push(count > maxCount / 2 ?
+            plotText(labelWidth + barWidth - 3, rowCenter, data.percents[i], "end",
+                null, true) :
+            plotText(labelWidth + barWidth + 3, rowCenter, data.percents[i], "start",
+                null, true));
+    });
+    elements.push(`<g fill="${data.color}">${bars.join("")}</g>`);
+    elements.push(
+        `<path d="M${plotNum(labelWidth)},${top}V` +
+        `${top + PLOT_ROW_HEIGHT * data.counts.length}" ${PLOT_AXIS_STYLE}/>`);
+    return plotDocument(width, height, elements.concat(texts));
+}
+
+var PLOT_DRAWERS = {
+    histogram: drawHistogram,
+    line: drawLine,
+    value_counts: drawValueCounts,
+};
+
+function drawPlot(elem, plotData) {
+    const data = plotData[elem.dataset.plotColumn][elem.dataset.plotName];
+    elem.innerHTML = PLOT_DRAWERS[data.kind](data);
+    elem.dataset.isDrawn = "";
+}
+
+var plotDataForReport = window.plotDataForReport || {};
+
+function drawPlotsWhenVisible(reportId) {
+    // called again when wide mode renders new column cards
+    if (!(reportId in plotDataForReport)) {
+        const dataElem = document.getElementById(`${reportId}_plot_data`);
+        if (dataElem === null) {
+            return;
+        }
+        plotDataForReport[reportId] = JSON.parse(dataElem.textContent);
+    }
+    const plotData = plotDataForReport[reportId];
+    const plots = document.getElementById(reportId).querySelectorAll(
+        ".skrubview-plot:not([data-is-drawn])");
+    if (!("IntersectionObserver" in window)) {
+        plots.forEach(elem => drawPlot(elem, plotData));
+        return;
+    }
+    const observer = new IntersectionObserver((entries, observer) => {
+        entries.forEach(entry => {
+            if (entry.isIntersecting) {
+                drawPlot(entry.target, plotData);
+                observer.unobserve(entry.target);
+            }
+        });
+    }, {
+        rootMargin: "200px"
+    });
+    plots.forEach(elem => observer.observe(elem));
+}
@@ -1,25 +1,35 @@
+import functools
+import os
 import pathlib
 import re
 import secrets
 
 import jinja2
-import pandas as pd
 
 try:
-    from skrub import _selectors as s
+    from skrub import selectors as s
 
     _SELECTORS_AVAILABLE = True
 except ImportError:
-    _SELECTORS_AVAILABLE = False
+    try:
+        # skrub < 0.4
+        from skrub import _selectors as s
+
+        _SELECTORS_AVAILABLE = True
+    except ImportError:
+        _SELECTORS_AVAILABLE = False
 
 from skrub import _dataframe as sbd
 
-from . import _utils
+from . import _profile, _utils
 
 _FILTER_NAMES = {
     "all()": "All columns",
     "has_nulls()": "Columns with null values",
     "(~has_nulls())": "Columns without null values",
+    # newer skrub versions show the selector's threshold
+    "has_nulls(0.0)": "Columns with null values",
+    "(~has_nulls(0.0))": "Columns without null values",
     "numeric()": "Numeric columns",
     "(~numeric())": "Non-numeric columns",
     "string()": "String columns",
@@ -30,14 +40,35 @@ _FILTER_NAMES = {
     "(~any_date())": "Non-datetime columns",
 }
 
+# reports with more columns are rendered in wide mode (see to_html)
+WIDE_MODE_THRESHOLD = 200
+WIDE_MODE_PAGE_SIZE = 50
+
 
+@functools.lru_cache(maxsize=None)
 def _get_jinja_env():
+    """The environment shared by all renders in this process.
+
+    It is built on first use and keeps the compiled templates, so only the
+    first report pays for parsing and compiling them. Templates are part of
+    the package and do not change while it runs, so they are not checked
+    for modifications. If the ``SKRUBVIEW_TEMPLATE_CACHE_DIR`` environment
+    variable is set, the compiled templates are also stored in that
+    directory, which saves compiling them again in new processes.
+    """
+    cache_dir = os.environ.get("SKRUBVIEW_TEMPLATE_CACHE_DIR")
+    if cache_dir is not None:
+        os.makedirs(cache_dir, exist_ok=True)
     env = jinja2.Environment(
         loader=jinja2.FileSystemLoader(
             pathlib.Path(__file__).resolve().parent / "_data" / "templates",
             encoding="UTF-8",
         ),
         autoescape=True,
+        auto_reload=False,
+        bytecode_cache=(
+            None if cache_dir is None else jinja2.FileSystemBytecodeCache(cache_dir)
+        ),
     )
     for function_name in [
         "format_number",
@@ -47,6 +78,8 @@ def _get_jinja_env():
         "filter_isin_snippet",
     ]:
         env.filters[function_name] = getattr(_utils, function_name)
+    import pandas as pd
+
     env.filters["is_null"] = pd.isna
     return env
 
@@ -109,20 +142,115 @@ def _get_column_filters_no_selectors(df):
     return filters
 
 
-def to_html(summary, standalone=True, column_filters=None):
+def _get_default_column_filters(summary):
+    # only a sample of a LazyFrame is in memory (and a summary built from a
+    # mergeable state only has its sample as dataframe): the dtype-based
+    # filters can be computed on it but the null counts must come from the
+    # summary.
+    df = summary["dataframe"]
+    filters = _get_column_filters(summary["sample"] if sbd.is_lazyframe(df) else df)
+    has_nulls = [c["name"] for c in summary["columns"] if c["null_count"]]
+    no_nulls = [c["name"] for c in summary["columns"] if not c["null_count"]]
+    for name, columns in [
+        ("has_nulls()", has_nulls),
+        ("(~has_nulls())", no_nulls),
+        ("~has_nulls()", no_nulls),
+        ("has_nulls(0.0)", has_nulls),
+        ("(~has_nulls(0.0))", no_nulls),
+    ]:
+        if name in filters:
+            filters[name]["columns"] = columns
+    return filters
+
+
+def _get_plot_data(summary):
+    # plots of the "json" backend are dicts, embedded once in the report and
+    # drawn by skrubview.js (each column card is shown in 2 tabs).
+    plot_data = {}
+    for column in summary["columns"]:
+        plots = {
+            name: column[name]
+            for name in column.get("plot_names", [])
+            if isinstance(column[name], dict)
+        }
+        if plots:
+            plot_data[str(column["position"])] = plots
+    return plot_data
+
+
+def _get_wide_data(summary, report_id):
+    # in wide mode the column cards and the columns of the sample table are
+    # stored as data, and skrubview.js only turns the page of columns being
+    # shown into DOM elements. Cards are rendered once, for the columns tab;
+    # the script adapts them when one is shown in the sample tab.
+    template = _get_jinja_env().get_template("column-summary.html")
+    cards = [
+        template.render(
+            summary=summary,
+            column=column,
+            report_id=report_id,
+            col_id=f"{report_id}_col_{i}",
+            in_sample_tab=False,
+        )
+        for i, column in enumerate(summary["columns"])
+    ]
+
+    import pandas as pd
+
+    def cells(rows):
+        return [[[str(v), repr(v), bool(pd.isna(v))] for v in row] for row in rows]
+
+    names = [column["name"] for column in summary["columns"]]
+    return {
+        "page_size": WIDE_MODE_PAGE_SIZE,
+        "names": names,
+        "names_repr": [repr(name) for name in names],
+        "dataframe_module": summary["dataframe_module"],
+        "constant_values": [
+            repr(column["constant_value"]) if column["value_is_constant"] else None
+            for column in summary["columns"]
+        ],
+        "cards": cards,
+        "head": cells(summary["head"]["data"]),
+        "tail": cells(summary["tail"]["data"]),
+    }
+
+
+def to_html(summary, standalone=True, column_filters=None, wide_mode=None):
+    """Render the HTML report.
+
+    In wide mode, meant for dataframes with many columns, the column
+    summaries and the table preview show one page of columns at a time,
+    built in the browser from data embedded in the report, so the page stays
+    responsive with thousands of columns. ``wide_mode=None`` enables it for
+    more than ``WIDE_MODE_THRESHOLD`` columns.
+
+    If the summary has a ``profile``, the rendering is added to it as the
+    "html" stage.
+    """
+    with _profile.stage(summary.get("profile"), "html"):
+        return _render(summary, standalone, column_filters, wide_mode)
+
+
+def _render(summary, standalone, column_filters, wide_mode):
     column_filters = column_filters if column_filters is not None else {}
+    if wide_mode is None:
+        wide_mode = summary["n_columns"] > WIDE_MODE_THRESHOLD
     jinja_env = _get_jinja_env()
     if standalone:
         template = jinja_env.get_template("standalone-report.html")
     else:
         template = jinja_env.get_template("inline-report.html")
-    default_filters = _get_column_filters(summary["dataframe"])
+    default_filters = _get_default_column_filters(summary)
+    report_id = f"report_{secrets.token_hex()[:8]}"
     return template.render(
         {
             "summary": summary,
+            "plot_data": _get_plot_data(summary),
+            "wide_data": _get_wide_data(summary, report_id) if wide_mode else None,
             # prioritize user-provided filters and keep them at the beginning
             "column_filters": column_filters
             | {k: v for (k, v) in default_filters.items() if k not in column_filters},
-            "report_id": f"report_{secrets.token_hex()[:8]}",
+            "report_id": report_id,
         }
     )
@@ -1,90 +1,232 @@
-import warnings
+import heapq
+import time
 
 import numpy as np
-from sklearn.preprocessing import OneHotEncoder, KBinsDiscretizer
-
 from skrub import _dataframe as sbd
 
 _N_BINS = 10
 _CATEGORICAL_THRESHOLD = 30
+# maximum number of (pair, row) cells combined in one bincount, and of
+# (pair, bin, bin) cells in the contingency tables of a block
+_BLOCK_SIZE = 2**22
+
+
+def top_associations(df, k=20, threshold=0.0):
+    """Find the ``k`` pairs of columns with the strongest association.
+
+    Returns a list of ``(left_column, right_column, cramer_v)`` tuples with
+    ``cramer_v > threshold``, sorted by decreasing association and then by
+    column position. The full matrix of associations is never built: pairs
+    are processed in blocks and only the best ``k`` are kept in a heap, so the
+    cost in memory scales with ``k`` rather than with the number of pairs.
+    Constant columns, whose association with any column is 0, are skipped.
+    Every other pair is computed: the heap and ``threshold`` only decide
+    which results are kept.
+    """
+    return top_associations_until(df, None, k=k, threshold=threshold)[0]
+
+
+def top_associations_until(df, deadline, k=20, threshold=0.0):
+    """Like ``top_associations``, but stop when ``deadline`` is reached.
+
+    Columns are encoded, and then pairs examined, in column order until
+    ``time.perf_counter()`` passes ``deadline`` (``None`` means never).
+    Returns the best associations among the pairs examined so far and the
+    fraction of all pairs of columns that were examined (1.0 if the search
+    is complete).
+    """
+    if k is not None and k <= 0:
+        return [], 1.0
+    codes, n_bins = _encode(df, _N_BINS, deadline=deadline)
+    column_names = sbd.column_names(df)
+    n_columns = len(column_names)
+    n_encoded, n_rows = codes.shape
+    n_pairs = n_columns * (n_columns - 1) // 2
+    candidates = np.flatnonzero((codes != codes[:, :1]).any(axis=1))
+    # the pairs of encoded columns with a constant one are known to be 0
+    n_constant = n_encoded - len(candidates)
+    n_examined = n_constant * (n_constant - 1) // 2 + n_constant * len(candidates)
+    block_size = max(1, _BLOCK_SIZE // max(n_rows, n_bins**2))
+    # entries are (cramer_v, -left, -right) so that the root of the heap is
+    # the weakest association and, among ties, the last pair in column order.
+    heap = []
+    for left, right in _iter_pair_blocks(candidates, block_size):
+        if deadline is not None and time.perf_counter() > deadline:
+            break
+        n_examined += len(left)
+        # no pair can be skipped before its table is built: V is normalized by
+        # the pair's own numbers of categories, so any pair can reach 1
+        stats = _compute_cramer(
+            _contingency_table(codes, left, right, n_bins), n_rows
+        )
+        # pairs are visited in column order so a pair tied with the root of a
+        # full heap comes after it, and cannot replace it.
+        is_full = k is not None and len(heap) == k
+        cutoff = max(threshold, heap[0][0]) if is_full else threshold
+        for idx in np.flatnonzero(stats > cutoff):
+            entry = (float(stats[idx]), -int(left[idx]), -int(right[idx]))
+            if k is not None and len(heap) == k:
+                heapq.heappushpop(heap, entry)
+            else:
+                heapq.heappush(heap, entry)
+    associations = [
+        (column_names[-left], column_names[-right], v)
+        for (v, left, right) in sorted(heap, reverse=True)
+    ]
+    return associations, n_examined / n_pairs if n_pairs else 1.0
 
 
-def stack_symmetric_associations(associations, column_names):
-    left_indices, right_indices = np.triu_indices_from(associations, 1)
-    associations = associations[(left_indices, right_indices)]
-    order = np.argsort(associations)[::-1]
-    left_indices, right_indices, associations = (
-        left_indices[order],
-        right_indices[order],
-        associations[order],
-    )
-    return [
-        (column_names[left], column_names[right], a)
-        for (left, right, a) in zip(left_indices, right_indices, associations)
-    ]
+def _iter_pair_blocks(columns, block_size):
+    """Yield the pairs ``(i, j)``, ``i < j``, of ``columns`` in blocks.
+
+    Blocks have about ``block_size`` pairs (never more), in column order.
+    """
+    left, right, size = [], [], 0
+    for pos in range(len(columns) - 1):
+        others = columns[pos + 1 :]
+        for start in range(0, len(others), block_size):
+            chunk = others[start : start + block_size]
+            if size + len(chunk) > block_size:
+                yield np.concatenate(left), np.concatenate(right)
+                left, right, size = [], [], 0
+            left.append(np.full(len(chunk), columns[pos]))
+            right.append(chunk)
+            size += len(chunk)
+    if size:
+        yield np.concatenate(left), np.concatenate(right)
 
 
 def cramer_v(df):
-    encoded = _onehot_encode(df, _N_BINS)
-    table = _contingency_table(encoded)
-    stats = _compute_cramer(table, sbd.shape(df)[0])
+    codes, n_bins = _encode(df, _N_BINS)
+    return _cramer_v_from_codes(codes, n_bins)
+
+
+def _cramer_v_from_codes(codes, n_bins):
+    n_cols, n_rows = codes.shape
+    stats = np.empty((n_cols, n_cols))
+    left, right = np.triu_indices(n_cols)
+    block_size = max(1, _BLOCK_SIZE // max(n_rows, n_bins**2))
+    for start in range(0, len(left), block_size):
+        block_left = left[start : start + block_size]
+        block_right = right[start : start + block_size]
+        table = _contingency_table(codes, block_left, block_right, n_bins)
+        stats[block_left, block_right] = _compute_cramer(table, n_rows)
+        # computed separately rather than mirrored so that the floating-point
+        # operations are exactly those of the (left, right) order
+        stats[block_right, block_left] = _compute_cramer(
+            np.ascontiguousarray(table.swapaxes(-1, -2)), n_rows
+        )
     return stats
 
 
-def _onehot_encode(df, n_bins):
+def _encode(df, n_bins, deadline=None):
+    """Encode each column as one small integer (the bin or category) per row.
+
+    Returns an array of shape (n_cols, n_rows) and the number of codes. If
+    ``deadline`` passes, only the columns encoded so far are returned.
+    """
     n_rows, n_cols = sbd.shape(df)
-    output = np.zeros((n_cols, n_bins, n_rows), dtype=bool)
+    output = np.zeros((n_cols, n_rows), dtype=np.uint8)
     for col_idx, col_name in enumerate(sbd.column_names(df)):
+        if deadline is not None and time.perf_counter() > deadline:
+            return output[:col_idx], n_bins
         values = np.asarray(sbd.to_numpy(sbd.col(df, col_name)))
         if values.dtype.kind in "bOSU" or len(set(values)) <= _CATEGORICAL_THRESHOLD:
-            _onehot_encode_categories(values, n_bins, output[col_idx])
+            _encode_categories(values, n_bins, output[col_idx])
         else:
-            _onehot_encode_numbers(values, n_bins, output[col_idx])
-    return output
-
-
-def _onehot_encode_categories(values, n_bins, output):
-    encoded = OneHotEncoder(max_categories=n_bins, sparse_output=False).fit_transform(
-        values[:, None]
-    )
-    effective_n_bins = encoded.shape[1]
-    output[:effective_n_bins] = encoded.T
-
-
-def _onehot_encode_numbers(values, n_bins, output):
+            _encode_numbers(values, n_bins, output[col_idx])
+    return output, n_bins
+
+
+def _encode_categories(values, n_bins, output):
+    # the codes of scikit-learn's OneHotEncoder(max_categories=n_bins): the
+    # categories in sorted order, except that if there are n_bins or more, all
+    # but the n_bins - 1 most frequent ones (among ties, the last ones in
+    # sorted order) share the last code.
+    inverse, counts = _factorize(values)
+    if len(counts) >= n_bins:
+        n_frequent = n_bins - 1
+        is_frequent = np.zeros(len(counts), dtype=bool)
+        is_frequent[np.argsort(counts, kind="stable")[-n_frequent:]] = True
+        codes = np.where(is_frequent, np.cumsum(is_frequent) - 1, n_frequent)
+        inverse = codes[inverse]
+    output[:] = inverse
+
+
+def _factorize(values):
+    """The index of each value among the sorted unique values, and their counts.
+
+    Missing values (None, then NaN or NaT) come after the other values.
+    """
+    if values.dtype.kind == "O":
+        is_none = np.fromiter(
+            (v is None for v in values), dtype=bool, count=len(values)
+        )
+        is_nan = np.fromiter(
+            (isinstance(v, float) and v != v for v in values),
+            dtype=bool,
+            count=len(values),
+        )
+    else:
+        is_none = np.zeros(len(values), dtype=bool)
+        # NaN and NaT; np.unique only groups them from numpy 1.24
+        is_nan = values != values
+    is_present = ~(is_none | is_nan)
+    inverse = np.empty(len(values), dtype=np.intp)
+    if values.dtype.kind == "O":
+        present = values[is_present]
+        index = {v: i for i, v in enumerate(sorted(set(present)))}
+        inverse[is_present] = [index[v] for v in present]
+        n_codes = len(index)
+    else:
+        uniques, inverse[is_present] = np.unique(
+            values[is_present], return_inverse=True
+        )
+        n_codes = len(uniques)
+    for is_missing in (is_none, is_nan):
+        if is_missing.any():
+            inverse[is_missing] = n_codes
+            n_codes += 1
+    return inverse, np.bincount(inverse, minlength=n_codes)
+
+
+def _encode_numbers(values, n_bins, output):
+    # n_bins - 1 bins of equal width (as scikit-learn's KBinsDiscretizer with
+    # the "uniform" strategy), or one bin if all finite values are equal
     values = values.astype(float)
     mask = ~np.isfinite(values)
     filled_na = np.array(values)
     # TODO pick a better value & non-uniform bins?
     filled_na[mask] = 0.0
-    encoder = KBinsDiscretizer(
-        n_bins=n_bins - 1,
-        strategy="uniform",
-        subsample=None,
-        encode="onehot-dense",
-    )
-    with warnings.catch_warnings():
-        warnings.simplefilter("ignore")
-        encoded = encoder.fit_transform(filled_na[:, None])
-    encoded[mask] = 0
-    effective_n_bins = encoded.shape[1]
-    output[:effective_n_bins] = encoded.T
-    output[effective_n_bins] = mask
-
-
-def _contingency_table(encoded):
-    n_cols, n_quantiles, _ = encoded.shape
-    out = np.empty((n_cols, n_cols, n_quantiles, n_quantiles), dtype="int32")
-    return np.einsum("ack,bdk", encoded, encoded, out=out)
+    low, high = (filled_na.min(), filled_na.max()) if len(filled_na) else (0.0, 0.0)
+    if low == high:
+        effective_n_bins = 1
+        output[:] = 0
+    else:
+        effective_n_bins = n_bins - 1
+        edges = np.linspace(low, high, effective_n_bins + 1)
+        output[:] = np.searchsorted(edges[1:-1], filled_na, side="right")
+    # non-finite values go in an extra bin after the last one
+    output[mask] = effective_n_bins
+
+
+def _contingency_table(codes, left, right, n_bins):
+    # each pair of columns gets its own range of n_bins ** 2 cells in a single
+    # bincount; the (n_pairs, n_rows) combined codes are the largest temporary.
+    n_pairs, n_rows = len(left), codes.shape[1]
+    offsets = np.arange(n_pairs, dtype=np.intp)[:, None] * n_bins**2
+    combined = codes[left].astype(np.intp) * n_bins + codes[right] + offsets
+    table = np.bincount(combined.ravel(), minlength=n_pairs * n_bins**2)
+    return table.reshape(n_pairs, n_bins, n_bins)
 
 
 def _compute_cramer(table, n_samples):
     marginal_0 = table.sum(axis=-2)
     marginal_1 = table.sum(axis=-1)
     expected = (
-        marginal_0[:, :, None, :]
-        * marginal_1[:, :, :, None]
-        / marginal_0.sum(axis=-1)[:, :, None, None]
+        marginal_0[..., None, :]
+        * marginal_1[..., :, None]
+        / marginal_0.sum(axis=-1)[..., None, None]
     )
     diff = table - expected
     expected[expected == 0] = 1
@@ -1,9 +1,21 @@
-import io
+"""Plots of the columns' distributions, as SVG strings.
 
-from matplotlib import pyplot as plt
+The data shown in each plot (histogram bins, downsampled line, most frequent
+values) is computed here with numpy, then drawn by a backend: ``"svg"``
+writes the SVG document directly, ``"matplotlib"`` draws a matplotlib
+figure, if matplotlib is installed, and ``"json"`` keeps the data as a dict,
+for the HTML report to draw the chart in the browser.
+
+The ``*_data`` functions return the small inputs of a plot as a ``(kind,
+data)`` pair, and ``draw`` or ``draw_all`` turn them into SVG strings, so
+that plots can be drawn in other processes without sending them the
+columns.
+"""
+
+import numpy as np
 
 from skrub import _dataframe as sbd
-from . import _utils
+from . import _plotting_json, _svg, _utils
 
 # from matplotlib import colormaps, colors
 # _TAB10 = list(map(colors.rgb2hex, colormaps.get_cmap("tab10").colors))
@@ -26,86 +38,168 @@ _SEABORN = [
 COLORS = _SEABORN
 COLOR_0 = COLORS[0]
 
-
-def _despine(ax):
-    ax.spines[["top", "right"]].set_visible(False)
-
-
-def _serialize(fig, close=True):
-    buffer = io.BytesIO()
-    fig.savefig(buffer, format="svg", bbox_inches="tight")
-    out = buffer.getvalue().decode("UTF-8")
-    if close:
-        plt.close(fig)
-    return out
-
-
-def _rotate_ticklabels(ax):
-    if len(ax.get_xticklabels()[0].get_text()) > 5:
-        ax.set_xticks(ax.get_xticks(), ax.get_xticklabels(), rotation=45, ha="right")
-
-
-def _get_adjusted_fig_size(fig, ax, direction, target_size):
-    size_display = getattr(ax.get_window_extent(), direction)
-    size = fig.dpi_scale_trans.inverted().transform((size_display, 0))[0]
-    dim = 0 if direction == "width" else 1
-    fig_size = fig.get_size_inches()[dim]
-    return target_size * (fig_size / size)
-
-
-def _adjust_fig_size(fig, ax, target_w, target_h):
-    w = _get_adjusted_fig_size(fig, ax, "width", target_w)
-    h = _get_adjusted_fig_size(fig, ax, "height", target_h)
-    fig.set_size_inches((w, h))
-
-
-def histogram(col, title=None, color=COLOR_0):
-    values = sbd.to_numpy(col)
-    fig, ax = plt.subplots()
-    _despine(ax)
-    ax.hist(values, color=color)
-    if title is not None:
-        ax.set_title(title)
-    _rotate_ticklabels(ax)
-    _adjust_fig_size(fig, ax, 2.0, 1.0)
-    return _serialize(fig)
-
-
-def line(x_col, y_col):
-    x = sbd.to_numpy(x_col)
-    y = sbd.to_numpy(y_col)
-    fig, ax = plt.subplots()
-    _despine(ax)
-    ax.plot(x, y)
-    ax.set_xlabel(_utils.ellide_string_short(x_col.name))
-    _rotate_ticklabels(ax)
-    _adjust_fig_size(fig, ax, 2.0, 1.0)
-    return _serialize(fig)
-
-
-def value_counts(value_counts, n_unique, n_rows, color=COLOR_0):
-    values = [_utils.ellide_string_short(s) for s in value_counts.keys()][::-1]
-    counts = list(value_counts.values())[::-1]
+PLOT_BACKENDS = ("svg", "matplotlib", "json")
+DEFAULT_PLOT_BACKEND = "svg"
+# same as matplotlib's hist
+_N_BINS = 10
+# lines with more points are reduced to the min and max of as many buckets
+_MAX_LINE_POINTS = 500
+
+
+def _get_backend(backend):
+    if backend == "svg":
+        return _svg
+    if backend == "json":
+        return _plotting_json
+    if backend == "matplotlib":
+        try:
+            from . import _plotting_matplotlib
+        except ImportError as e:
+            raise ImportError(
+                "The 'matplotlib' plot backend requires matplotlib to be installed."
+            ) from e
+        return _plotting_matplotlib
+    raise ValueError(
+        f"'backend' should be one of {PLOT_BACKENDS}, got {backend!r}"
+    )
+
+
+def _plot_values(col):
+    """Column values as floats (nanoseconds for datetimes) and whether they are
+    datetimes. Missing values are NaN."""
+    if sbd.is_any_date(col):
+        values = _utils.to_datetime_numpy(col)
+        is_missing = np.isnat(values)
+        values = values.astype(np.int64).astype(float)
+        values[is_missing] = np.nan
+        return values, True
+    return _utils.to_float_numpy(col), False
+
+
+def draw(kind, data, backend=DEFAULT_PLOT_BACKEND):
+    """Draw a plot from the output of one of the ``*_data`` functions."""
+    return getattr(_get_backend(backend), kind)(**data)
+
+
+def draw_all(plots, backend=DEFAULT_PLOT_BACKEND, n_jobs=None):
+    """Draw a list of ``(kind, data)`` plots; the SVGs are in the same order.
+
+    matplotlib's pyplot cannot draw in several threads at once, so with the
+    matplotlib backend and more than one job the plots are drawn in a pool
+    of worker processes, which only receive the plots' data. The pool is
+    kept and reused by the next reports, and its workers import matplotlib
+    (with the Agg backend) when they start. Other backends draw in a thread
+    pool.
+    """
+    n_jobs = _utils.effective_n_jobs(n_jobs)
+    if backend != "matplotlib" or n_jobs == 1 or len(plots) <= 1:
+        return _utils.parallel_map(
+            lambda plot: draw(*plot, backend=backend), plots, n_jobs=n_jobs
+        )
+    # fail early, in this process, if matplotlib is missing
+    _get_backend(backend)
+    kinds, data = zip(*plots)
+    return list(
+        _get_process_pool(n_jobs).map(
+            _draw_with_matplotlib, kinds, data, chunksize=-(-len(plots) // n_jobs)
+        )
+    )
+
+
+def _get_process_pool(n_workers):
+    # loky's executor is shared and kept alive between calls, and unlike
+    # multiprocessing's "spawn" it does not re-run the user's __main__ module
+    from joblib.externals.loky import get_reusable_executor
+
+    return get_reusable_executor(
+        max_workers=n_workers, initializer=_init_matplotlib_worker
+    )
+
+
+def _init_matplotlib_worker():
+    import matplotlib
+
+    matplotlib.use("Agg")
+    from . import _plotting_matplotlib  # noqa: F401
+
+
+def _draw_with_matplotlib(kind, data):
+    return draw(kind, data, backend="matplotlib")
+
+
+def histogram_data(col, title=None, color=COLOR_0):
+    values, is_datetime = _plot_values(col)
+    counts, edges = np.histogram(values[np.isfinite(values)], bins=_N_BINS)
+    return "histogram", {
+        "counts": counts,
+        "edges": edges,
+        "is_datetime": is_datetime,
+        "title": title,
+        "color": color,
+    }
+
+
+def histogram(col, title=None, color=COLOR_0, backend=DEFAULT_PLOT_BACKEND):
+    return draw(*histogram_data(col, title=title, color=color), backend=backend)
+
+
+def line_data(x_col, y_col):
+    x, x_is_datetime = _plot_values(x_col)
+    y, _ = _plot_values(y_col)
+    x, y = _downsample(x, y, _MAX_LINE_POINTS // 2)
+    return "line", {
+        "x": x,
+        "y": y,
+        "x_label": _utils.ellide_string_short(sbd.name(x_col)),
+        "x_is_datetime": x_is_datetime,
+    }
+
+
+def line(x_col, y_col, backend=DEFAULT_PLOT_BACKEND):
+    return draw(*line_data(x_col, y_col), backend=backend)
+
+
+def _downsample(x, y, n_buckets):
+    # keep the min and max of each bucket of consecutive points, in order, so
+    # that the peaks stay visible.
+    n_points = len(y)
+    if n_points <= 2 * n_buckets:
+        return x, y
+    bucket_size = -(-n_points // n_buckets)
+    padded = np.full(n_buckets * bucket_size, np.nan)
+    padded[:n_points] = y
+    padded = padded.reshape(n_buckets, bucket_size)
+    is_missing = np.isnan(padded)
+    # for an empty bucket both are its first point, which keeps the gap
+    lowest = np.where(is_missing, np.inf, padded).argmin(axis=1)
+    highest = np.where(is_missing, -np.inf, padded).argmax(axis=1)
+    offsets = np.arange(n_buckets) * bucket_size
+    kept = np.unique(np.concatenate([offsets + lowest, offsets + highest]))
+    kept = kept[kept < n_points]
+    return x[kept], y[kept]
+
+
+def value_counts_data(value_counts, n_unique, n_rows, color=COLOR_0):
+    labels = [str(_utils.ellide_string_short(s)) for s in value_counts.keys()]
+    counts = list(value_counts.values())
+    percents = [_utils.format_percent(c / n_rows) for c in counts]
     if n_unique > len(value_counts):
         title = f"{len(value_counts)} most frequent"
     else:
         title = None
-    fig, ax = plt.subplots()
-    _despine(ax)
-    rects = ax.barh(list(map(str, range(len(values)))), counts, color=color)
-    percent = [_utils.format_percent(c / n_rows) for c in counts]
-    large_percent = [
-        f"{p: >6}" if c > counts[-1] / 2 else "" for (p, c) in zip(percent, counts)
-    ]
-    small_percent = [
-        p if c <= counts[-1] / 2 else "" for (p, c) in zip(percent, counts)
-    ]
-    ax.bar_label(rects, large_percent, padding=-30, color="black", fontsize=8)
-    ax.bar_label(rects, small_percent, padding=5, color="black", fontsize=8)
-    ax.set_yticks(ax.get_yticks())
-    ax.set_yticklabels(list(map(str, values)))
-    if title is not None:
-        ax.set_title(title)
-
-    _adjust_fig_size(fig, ax, 1.0, 0.2 * len(values))
-    return _serialize(fig)
+    return "value_counts", {
+        "labels": labels,
+        "counts": counts,
+        "percents": percents,
+        "title": title,
+        "color": color,
+    }
+
+
+def value_counts(
+    value_counts, n_unique, n_rows, color=COLOR_0, backend=DEFAULT_PLOT_BACKEND
+):
+    return draw(
+        *value_counts_data(value_counts, n_unique, n_rows, color=color),
+        backend=backend,
+    )
@@ -0,0 +1,57 @@
+"""Keep the plots' data, to be drawn in the browser by ``skrubview.js``.
+
+Instead of an SVG string, each function returns a small dict that can be
+serialized as JSON. ``to_html`` embeds these dicts once per report and the
+charts are drawn when they scroll into view, which keeps large reports small
+and fast to open. Missing and infinite values become ``None``, as NaN and
+infinity are not valid JSON, and floats are rounded to a precision well below
+a pixel.
+"""
+
+import numpy as np
+
+
+def _floats(values):
+    # 5 significant digits of the values' range, far below a pixel. It is
+    # relative to the range and not to each value so that close, large values
+    # (such as datetimes in nanoseconds) stay distinct.
+    values = np.asarray(values, dtype=float)
+    finite = values[np.isfinite(values)]
+    span = np.ptp(finite) if len(finite) else 0.0
+    if not span:
+        span = np.abs(finite).max() if len(finite) else 0.0
+    decimals = 4 - int(np.floor(np.log10(span))) if span else 0
+    return [round(v, decimals) if np.isfinite(v) else None for v in values.tolist()]
+
+
+def histogram(counts, edges, is_datetime=False, title=None, color="#4878d0"):
+    return {
+        "kind": "histogram",
+        "counts": [int(c) for c in counts],
+        "edges": _floats(edges),
+        "is_datetime": bool(is_datetime),
+        "title": title,
+        "color": color,
+    }
+
+
+def line(x, y, x_label=None, x_is_datetime=False, color="#4878d0"):
+    return {
+        "kind": "line",
+        "x": _floats(x),
+        "y": _floats(y),
+        "x_label": None if x_label is None else str(x_label),
+        "x_is_datetime": bool(x_is_datetime),
+        "color": color,
+    }
+
+
+def value_counts(labels, counts, percents, title=None, color="#ee854a"):
+    return {
+        "kind": "value_counts",
+        "labels": list(labels),
+        "counts": [int(c) for c in counts],
+        "percents": list(percents),
+        "title": title,
+        "color": color,
+    }
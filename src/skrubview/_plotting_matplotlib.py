@@ -0,0 +1,119 @@
+"""Draw the plots with matplotlib.
+
+This backend is optional (matplotlib is not a required dependency). It
+receives the same precomputed data as the default, native SVG backend.
+"""
+
+import functools
+import io
+import threading
+
+import numpy as np
+from matplotlib import dates as mdates
+from matplotlib import pyplot as plt
+
+# pyplot keeps global state (current figure, figure manager) so plots cannot be
+# drawn concurrently when columns are summarized in a thread pool.
+_PYPLOT_LOCK = threading.Lock()
+
+
+def _with_pyplot_lock(plot_func):
+    @functools.wraps(plot_func)
+    def locked_plot_func(*args, **kwargs):
+        with _PYPLOT_LOCK:
+            return plot_func(*args, **kwargs)
+
+    return locked_plot_func
+
+
+def _despine(ax):
+    ax.spines[["top", "right"]].set_visible(False)
+
+
+def _serialize(fig, close=True):
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="svg", bbox_inches="tight")
+    out = buffer.getvalue().decode("UTF-8")
+    if close:
+        plt.close(fig)
+    return out
+
+
+def _rotate_ticklabels(ax):
+    if len(ax.get_xticklabels()[0].get_text()) > 5:
+        ax.set_xticks(ax.get_xticks(), ax.get_xticklabels(), rotation=45, ha="right")
+
+
+def _get_adjusted_fig_size(fig, ax, direction, target_size):
+    size_display = getattr(ax.get_window_extent(), direction)
+    size = fig.dpi_scale_trans.inverted().transform((size_display, 0))[0]
+    dim = 0 if direction == "width" else 1
+    fig_size = fig.get_size_inches()[dim]
+    return target_size * (fig_size / size)
+
+
+def _adjust_fig_size(fig, ax, target_w, target_h):
+    w = _get_adjusted_fig_size(fig, ax, "width", target_w)
+    h = _get_adjusted_fig_size(fig, ax, "height", target_h)
+    fig.set_size_inches((w, h))
+
+
+def _to_dates(values):
+    # nanoseconds since the epoch to matplotlib's date numbers
+    return mdates.date2num(values.astype(np.int64).astype("datetime64[ns]"))
+
+
+@_with_pyplot_lock
+def histogram(counts, edges, is_datetime=False, title=None, color="#4878d0"):
+    fig, ax = plt.subplots()
+    _despine(ax)
+    if is_datetime:
+        edges = _to_dates(edges)
+        ax.xaxis_date()
+    ax.stairs(counts, edges, fill=True, color=color)
+    if title is not None:
+        ax.set_title(title)
+    _rotate_ticklabels(ax)
+    _adjust_fig_size(fig, ax, 2.0, 1.0)
+    return _serialize(fig)
+
+
+@_with_pyplot_lock
+def line(x, y, x_label=None, x_is_datetime=False, color="#4878d0"):
+    x_values = x
+    fig, ax = plt.subplots()
+    _despine(ax)
+    if x_is_datetime:
+        is_missing = np.isnan(x)
+        x = np.full(len(x), np.nan)
+        x[~is_missing] = _to_dates(x_values[~is_missing])
+        ax.xaxis_date()
+    ax.plot(x, y, color=color)
+    if x_label is not None:
+        ax.set_xlabel(x_label)
+    _rotate_ticklabels(ax)
+    _adjust_fig_size(fig, ax, 2.0, 1.0)
+    return _serialize(fig)
+
+
+@_with_pyplot_lock
+def value_counts(labels, counts, percents, title=None, color="#ee854a"):
+    labels, counts, percents = labels[::-1], counts[::-1], percents[::-1]
+    fig, ax = plt.subplots()
+    _despine(ax)
+    rects = ax.barh(list(map(str, range(len(labels)))), counts, color=color)
+    large_percent = [
+        f"{p: >6}" if c > counts[-1] / 2 else "" for (p, c) in zip(percents, counts)
+    ]
+    small_percent = [
+        p if c <= counts[-1] / 2 else "" for (p, c) in zip(percents, counts)
+    ]
+    ax.bar_label(rects, large_percent, padding=-30, color="black", fontsize=8)
+    ax.bar_label(rects, small_percent, padding=5, color="black", fontsize=8)
+    ax.set_yticks(ax.get_yticks())
+    ax.set_yticklabels(labels)
+    if title is not None:
+        ax.set_title(title)
+
+    _adjust_fig_size(fig, ax, 1.0, 0.2 * len(labels))
+    return _serialize(fig)
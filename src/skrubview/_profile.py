@@ -0,0 +1,164 @@
+"""Opt-in measurement of the time and memory spent in each stage of a report.
+
+With ``summarize_dataframe(..., profile=True)`` the summary gets a
+``profile`` dict with two lists of records:
+
+- ``stages``: one record per stage (statistics, sample, interactions,
+  plots, HTML or text rendering...) with its wall time in ``seconds``, the
+  memory it left allocated (``allocated_bytes``) and its peak allocation
+  (``peak_bytes``).
+- ``columns``: one record per column and per stage that runs column by
+  column (``summarize_column``, ``plot_data``), with its wall time only, as
+  columns are processed in parallel threads.
+
+Memory is measured with ``tracemalloc``, which is only enabled during the
+profiled stages (it slows Python down). It sees the allocations of Python
+and numpy, but not those of polars or pyarrow, which have their own
+allocators.
+
+As ``tracemalloc`` is global to the process, one stage is measured at a
+time: a stage started in another thread (by another profiled summary) waits
+until the current one (and the stages nested in it) ends. The work of the
+threads started within a stage, such as those of ``n_jobs``, is part of the
+stage.
+
+Functions registered with ``add_hook`` receive each record as soon as it is
+measured, for example to send it to a metrics service.
+"""
+
+import contextlib
+import threading
+import time
+import tracemalloc
+
+_HOOKS = []
+# peak memory of the enclosing stages, which reset_peak would otherwise lose;
+# only used by the thread holding _STAGE_LOCK
+_STAGE_PEAKS = []
+# held while a stage (and the stages nested in it) is measured
+_STAGE_LOCK = threading.RLock()
+_LOCK = threading.Lock()
+
+
+def add_hook(hook):
+    """Call ``hook(record)`` for each stage or column measured from now on."""
+    _HOOKS.append(hook)
+
+
+def remove_hook(hook):
+    _HOOKS.remove(hook)
+
+
+def new_profile():
+    return {"stages": [], "columns": []}
+
+
+def _publish(records, record):
+    with _LOCK:
+        records.append(record)
+    for hook in list(_HOOKS):
+        hook(record)
+
+
+@contextlib.contextmanager
+def stage(profile, name):
+    """Measure the block as the stage ``name`` of ``profile``, if not None.
+
+    Stages can be nested; stages of other threads wait until the outermost
+    one ends.
+    """
+    if profile is None:
+        yield
+        return
+    with _STAGE_LOCK:
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        start_memory, peak = tracemalloc.get_traced_memory()
+        if _STAGE_PEAKS:
+            _STAGE_PEAKS[-1] = max(_STAGE_PEAKS[-1], peak)
+        _reset_peak()
+        _STAGE_PEAKS.append(start_memory)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            memory, peak = tracemalloc.get_traced_memory()
+            peak = max(_STAGE_PEAKS.pop(), peak)
+            if _STAGE_PEAKS:
+                _STAGE_PEAKS[-1] = max(_STAGE_PEAKS[-1], peak)
+            if started_tracing:
+                tracemalloc.stop()
+            _publish(
+                profile["stages"],
+                {
+                    "stage": name,
+                    "seconds": seconds,
+                    "allocated_bytes": memory - start_memory,
+                    "peak_bytes": peak - start_memory,
+                },
+            )
+
+
+def _reset_peak():
+    # python >= 3.9
+    if hasattr(tracemalloc, "reset_peak"):
+        tracemalloc.reset_peak()
+
+
+@contextlib.contextmanager
+def column_stage(profile, column_name, name):
+    """Time the work of stage ``name`` on one column; thread-safe."""
+    if profile is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _publish(
+            profile["columns"],
+            {
+                "column": column_name,
+                "stage": name,
+                "seconds": time.perf_counter() - start,
+            },
+        )
+
+
+def slowest_columns(profile, n=10):
+    """The ``n`` columns with the largest total time, with their stages."""
+    columns = {}
+    for record in profile["columns"]:
+        column = columns.setdefault(
+            record["column"], {"column": record["column"], "seconds": 0.0}
+        )
+        column["seconds"] += record["seconds"]
+        column[record["stage"]] = column.get(record["stage"], 0.0) + record["seconds"]
+    return sorted(columns.values(), key=lambda c: c["seconds"], reverse=True)[:n]
+
+
+def format_profile(profile, n=10):
+    """The slowest stages and columns, as text."""
+    lines = ["Slowest stages:"]
+    stages = sorted(profile["stages"], key=lambda s: s["seconds"], reverse=True)
+    for record in stages[:n]:
+        lines.append(
+            f"  {record['stage']:<24} {record['seconds'] * 1000:10.1f} ms"
+            f"  peak {record['peak_bytes'] / 2**20:8.1f} MiB"
+        )
+    columns = slowest_columns(profile, n)
+    if columns:
+        lines.append("Slowest columns:")
+    for column in columns:
+        details = ", ".join(
+            f"{k} {v * 1000:.1f} ms"
+            for k, v in column.items()
+            if k not in ("column", "seconds")
+        )
+        lines.append(
+            f"  {str(column['column']):<24} {column['seconds'] * 1000:10.1f} ms"
+            f"  ({details})"
+        )
+    return "\n".join(lines)
@@ -1,11 +1,23 @@
 from pathlib import Path
 import functools
 import json
+import os
 
-from ._summarize import summarize_dataframe
-from ._html import to_html
-from ._text import to_text
+from skrub import _dataframe as sbd
+
+from ._cache import DEFAULT_MAX_BYTES, SummaryCache, file_fingerprint
+from ._summarize import (
+    ASSOCIATION_THRESHOLD,
+    MAX_ASSOCIATIONS,
+    SAMPLE_SIZE,
+    SKETCH_THRESHOLD,
+    add_plots,
+    summarize_batches,
+    summarize_dataframe,
+    summarize_partitions,
+)
 from ._utils import JSONEncoder
+from . import _utils
 from ._serve import open_in_browser, open_file_in_browser
 
 
@@ -18,14 +30,105 @@ class Report:
 
     Parameters
     ----------
-    dataframe : pandas or polars DataFrame
-        The dataframe to summarize.
+    dataframe : pandas or polars DataFrame, polars LazyFrame, str or Path
+        The dataframe to summarize. A LazyFrame is never collected in full:
+        statistics are computed in a single streaming query and only the first
+        and last rows and a small random sample are loaded in memory. If a
+        path to a CSV or Parquet file is given, it is scanned lazily with
+        polars. Arrow IPC (Feather) files (".arrow", ".feather" or ".ipc")
+        are memory-mapped: the columns are not copied, and processes
+        reporting on the same file share it in the page cache. For Parquet
+        files, the row count and the null counts, minimum and maximum stored
+        in the file's metadata are used when present rather than being
+        recomputed. A directory (hive-style partition directories
+        such as ``year=2024/`` become columns) or a glob pattern such as
+        ``"data/**/*.parquet"`` is read as one dataset: each file is
+        summarized separately, in parallel with ``n_jobs`` threads, and the
+        results are merged (see ``summarize_partitions``), with a breakdown
+        of the number of rows and null values per file. Quantiles and
+        columns with many distinct values are then summarized with sketches.
     order_by : str
         Column name to use for sorting. Other numerical columns will be plotted
         as function of the sorting column. Must be of numerical or datetime
         type.
     title : str
         Title for the report.
+    n_jobs : int or None
+        Number of threads used to summarize columns in parallel. ``None``
+        means 1 and ``-1`` means using all processors. With the matplotlib
+        plot backend, plots are drawn in as many worker processes, which
+        are reused by later reports.
+    approximate : bool
+        Estimate the quantiles of numeric columns with sketches computed in a
+        single pass with bounded memory, rather than computing them exactly.
+        The reports show which values are approximate and the bound on their
+        rank error.
+    sketch_threshold : int or None
+        Columns with more distinct values than this get their number of unique
+        values and most frequent values from sketches computed in bounded
+        memory (HyperLogLog and Misra-Gries). The reports show these values
+        are approximate. ``None`` means always exact.
+    max_associations : int or None
+        Number of pairs of columns with the strongest associations (Cramér's
+        V) to show. Only these pairs are kept while searching, so the cost
+        scales with this number rather than with the number of pairs of
+        columns. ``None`` means all pairs.
+    association_threshold : float
+        Pairs of columns with an association below this value are not shown.
+    sample_size : int
+        Number of rows in the random sample used to compute associations
+        between columns (and the plots, for a LazyFrame or a file). The sample
+        is drawn once and shared by all parts of the report.
+    random_state : int, numpy Generator or None
+        Seed used to draw the sample, so that reports of the same data are
+        identical. ``None`` means a different sample each time.
+    stratify_by : str or None
+        If given, the sample is stratified on this column: each of its values
+        keeps its proportion, and rare values get at least one row.
+    plot_backend : str
+        How the plots of the HTML report are drawn: "svg" (the default)
+        writes small SVG documents directly, "matplotlib" uses matplotlib,
+        which must then be installed, and "json" embeds the plots' data in
+        the report, to be drawn in the browser when they scroll into view.
+    cache_dir : str, Path or None
+        If given, and ``dataframe`` is a path, the summary is stored in this
+        directory and reused by later reports of the same, unmodified file
+        with the same options, which then skip computing it. Plots are not
+        stored. A summary with ``random_state=None`` is never reused.
+    cache_max_bytes : int or None
+        Size limit of the cache directory; the least recently used summaries
+        are removed to stay below it. ``None`` means no limit.
+    cache_fingerprint : str
+        How a file is recognized: "mtime" (the default) uses its path, size
+        and modification time, "content" hashes its contents, which also
+        recognizes a file checked out again without changes.
+    columns : str, list of str, skrub selector or None
+        If given, only these columns are summarized, for example
+        ``["price", "date"]`` or ``skrub.selectors.numeric()``. Selectors are
+        evaluated on the column names and dtypes, and when ``dataframe`` is
+        a file or a LazyFrame the other columns are never read. The
+        ``order_by`` and ``stratify_by`` columns are always kept.
+    wide_mode : bool or None
+        Whether the HTML report shows the column summaries and the columns of
+        the table preview one page at a time, built in the browser only when
+        they are shown, which keeps reports of thousands of columns
+        responsive. ``None`` means for dataframes with more than 200
+        columns.
+    profile : bool
+        Record the time and memory spent in each stage of the report
+        (statistics, associations, plots, HTML and text rendering), and the
+        time spent on each column, in the ``profile`` entry of the summary.
+        Functions registered with ``skrubview.add_profile_hook`` receive
+        each measurement, for example to send it to a metrics service.
+    time_budget : float or None
+        Number of seconds that computing the statistics should take, whatever
+        the size of the dataframe, for interactive use. The numbers of rows
+        and null values are always exact; the other statistics, the plots and
+        the search for associations fall back to the random sample when
+        computing them on all rows would not fit in the budget, and the
+        reports mark what was estimated. Drawing the plots and rendering the
+        report are not included. Not used for a CSV file read with
+        ``from_csv`` or a dataset of several files, which are read in full.
 
     Attributes
     ----------
@@ -43,48 +146,246 @@ class Report:
         Dictionary containing information about the dataframe, used to generate
         the reports. Plots such as histograms are stored as SVG strings.
     summary_without_plots : dict
-        Same as ``summary_with_plots`` without the plots.
+        Same as ``summary_with_plots`` without the plots. The statistics are
+        computed once, here, and the plots are added to a copy when the HTML
+        report is first needed; the text and JSON reports never draw plots.
     """
 
-    def __init__(self, dataframe, order_by=None, title=None, column_filters=None):
-        self._summary_kwargs = {"order_by": order_by}
+    def __init__(
+        self,
+        dataframe,
+        order_by=None,
+        title=None,
+        column_filters=None,
+        n_jobs=None,
+        approximate=False,
+        sketch_threshold=SKETCH_THRESHOLD,
+        max_associations=MAX_ASSOCIATIONS,
+        association_threshold=ASSOCIATION_THRESHOLD,
+        sample_size=SAMPLE_SIZE,
+        random_state=0,
+        stratify_by=None,
+        plot_backend="svg",
+        cache_dir=None,
+        cache_max_bytes=DEFAULT_MAX_BYTES,
+        cache_fingerprint="mtime",
+        columns=None,
+        wide_mode=None,
+        profile=False,
+        time_budget=None,
+    ):
+        self._summary_kwargs = {
+            "order_by": order_by,
+            "n_jobs": n_jobs,
+            "approximate": approximate,
+            "sketch_threshold": sketch_threshold,
+            "max_associations": max_associations,
+            "association_threshold": association_threshold,
+            "sample_size": sample_size,
+            "random_state": random_state,
+            "stratify_by": stratify_by,
+            "profile": profile,
+            "time_budget": time_budget,
+        }
+        self.plot_backend = plot_backend
         self.title = title
         self.column_filters = column_filters
-        self.dataframe = dataframe
+        self.wide_mode = wide_mode
+        self.partition_files = None
+        self.csv_block_size = None
+        if isinstance(dataframe, (str, Path)):
+            self.file_path = Path(dataframe).resolve()
+            self.dataframe = _utils.read(self.file_path)
+            if _utils.is_dataset(self.file_path):
+                self.partition_files = _utils.list_files(self.file_path)
+            else:
+                self._summary_kwargs["file_statistics"] = (
+                    _utils.read_file_statistics(self.file_path)
+                )
+        else:
+            self.file_path = None
+            self.dataframe = dataframe
+        self._column_selection = columns
+        self.columns = None
+        if columns is not None:
+            self.columns = self._expand_columns(self.dataframe)
+            self.dataframe = _utils.select(self.dataframe, self.columns)
+        if self._has_partitions and stratify_by is not None:
+            raise ValueError(
+                "'stratify_by' is not supported for a dataset of several files."
+            )
+        self._cache = None
+        if cache_dir is not None and self.file_path is not None:
+            self._cache = SummaryCache(cache_dir, max_bytes=cache_max_bytes)
+            self._cache_fingerprint = [
+                file_fingerprint(f, cache_fingerprint)
+                for f in self.partition_files or [self.file_path]
+            ]
+
+    @classmethod
+    def from_csv(cls, file_path, block_size=_utils.CSV_BLOCK_SIZE, **kwargs):
+        """Summarize a CSV file of any size in a single streaming pass.
+
+        The file is read in blocks of ``block_size`` bytes, which update the
+        statistics, first and last rows and random sample of the report and
+        are then discarded, so memory stays at a few blocks however large
+        the file is. Statistics are computed with sketches, as for
+        ``summarize_dataframe(..., return_state=True)``: ``approximate``,
+        ``sketch_threshold`` and ``stratify_by`` are not used. Dtypes are
+        inferred from the whole file (see ``_utils.csv_schema``).
+
+        The other parameters are those of ``Report``.
+        """
+        if kwargs.get("stratify_by") is not None:
+            raise ValueError("'stratify_by' is not supported when streaming a CSV.")
+        report = cls(file_path, **kwargs)
+        if report.partition_files is not None or report.file_path.suffix != ".csv":
+            raise ValueError(f"Not a CSV file: {str(report.file_path)!r}.")
+        report.csv_block_size = block_size
+        if report.columns is not None:
+            # the scan infers dtypes from the first rows only, which selectors see
+            report.columns = report._expand_columns(_utils.csv_schema(report.file_path))
+        return report
+
+    def _expand_columns(self, df):
+        names = _utils.expand_columns(df, self._column_selection)
+        # the sorting and stratification columns are needed by the summary
+        kept = {self._summary_kwargs["order_by"], self._summary_kwargs["stratify_by"]}
+        kept.update(names)
+        all_names = sbd.column_names(_utils.slice(df, 0, 0))
+        return [name for name in all_names if name in kept]
+
+    @property
+    def _has_partitions(self):
+        return self.partition_files is not None and len(self.partition_files) > 1
 
     @functools.cached_property
-    def summary_with_plots(self):
-        return summarize_dataframe(
-            self.dataframe, with_plots=True, title=self.title, **self._summary_kwargs
+    def summary_without_plots(self):
+        cache_key = self._get_cache_key()
+        if cache_key is not None:
+            summary = self._cache.get(cache_key)
+            if summary is not None:
+                return dict(summary, dataframe=self.dataframe)
+        if self.csv_block_size is not None:
+            summary = summarize_batches(
+                _utils.iter_csv_batches(
+                    self.file_path, self.csv_block_size, columns=self.columns
+                ),
+                title=self.title,
+                **self._state_summary_kwargs(),
+            )
+        elif self._has_partitions:
+            summary = self._summarize_partitions()
+        else:
+            summary = summarize_dataframe(
+                self.dataframe,
+                with_plots=False,
+                title=self.title,
+                **self._summary_kwargs,
+            )
+        if cache_key is not None:
+            # the dataframe is only a scan of the file, cheap to recreate, and
+            # the profile measures this run only (it is not in the cache key)
+            self._cache.put(
+                cache_key,
+                {
+                    k: v
+                    for k, v in summary.items()
+                    if k not in ("dataframe", "profile")
+                },
+            )
+        return summary
+
+    def _summarize_partitions(self):
+        # each file is summarized separately (in parallel) and the results
+        # merged; see summarize_partitions
+        root = Path(os.path.commonpath(self.partition_files))
+        if root in self.partition_files:
+            root = root.parent
+        return summarize_partitions(
+            _utils.read_partitions(
+                self.file_path, self.partition_files, columns=self.columns
+            ),
+            names=[str(f.relative_to(root)) for f in self.partition_files],
+            title=self.title,
+            **self._state_summary_kwargs(),
         )
 
+    def _state_summary_kwargs(self):
+        # the options that apply to summaries built from mergeable states
+        ignored = (
+            "approximate",
+            "sketch_threshold",
+            "stratify_by",
+            "file_statistics",
+            "time_budget",
+        )
+        return {k: v for k, v in self._summary_kwargs.items() if k not in ignored}
+
+    def _get_cache_key(self):
+        if self._cache is None:
+            return None
+        options = {
+            k: v
+            for k, v in self._summary_kwargs.items()
+            if k not in ("n_jobs", "file_statistics", "profile")
+        }
+        if not isinstance(options["random_state"], int):
+            return None
+        options["title"] = self.title
+        options["columns"] = self.columns
+        if self.csv_block_size is not None:
+            options["csv_block_size"] = self.csv_block_size
+        return self._cache.key(self._cache_fingerprint, options)
+
     @functools.cached_property
-    def summary_without_plots(self):
-        return summarize_dataframe(
-            self.dataframe, with_plots=False, title=self.title, **self._summary_kwargs
+    def summary_with_plots(self):
+        # plots are drawn on a copy of the statistics, which are computed once
+        return add_plots(
+            self.summary_without_plots,
+            n_jobs=self._summary_kwargs["n_jobs"],
+            plot_backend=self.plot_backend,
         )
 
     @property
     def _any_summary(self):
-        if "_summary_with_plots" in self.__dict__:
+        # cached_property stores the value under the attribute's own name
+        if "summary_with_plots" in self.__dict__:
             return self.summary_with_plots
         return self.summary_without_plots
 
     @functools.cached_property
     def text(self):
-        return to_text(self._any_summary)
+        # rich is only imported for text reports, and jinja2 for HTML ones
+        from ._text import to_text
+
+        return to_text(self.summary_without_plots)
 
     @functools.cached_property
     def html(self):
-        return to_html(self.summary_with_plots, standalone=True, column_filters=self.column_filters)
+        from ._html import to_html
+
+        return to_html(
+            self.summary_with_plots,
+            standalone=True,
+            column_filters=self.column_filters,
+            wide_mode=self.wide_mode,
+        )
 
     @functools.cached_property
     def html_snippet(self):
-        return to_html(self.summary_with_plots, standalone=False, column_filters=self.column_filters)
+        from ._html import to_html
+
+        return to_html(
+            self.summary_with_plots,
+            standalone=False,
+            column_filters=self.column_filters,
+            wide_mode=self.wide_mode,
+        )
 
     @functools.cached_property
     def json(self):
-        to_remove = ['dataframe', 'head', 'tail', 'first_row_dict']
+        to_remove = ['dataframe', 'sample', 'head', 'tail', 'first_row_dict']
         data = {k: v for k, v in self.summary_without_plots.items() if k not in to_remove}
         return json.dumps(data, cls=JSONEncoder)
 
@@ -0,0 +1,151 @@
+import numpy as np
+from skrub import _dataframe as sbd
+
+from . import _utils
+
+SAMPLE_SIZE = 3000
+BATCH_SIZE = 100_000
+
+
+def draw_sample(
+    df, n_rows=None, size=SAMPLE_SIZE, random_state=0, stratify_by=None
+):
+    """Draw the random sample of rows shared by all stages of the summary.
+
+    The sample is drawn once and reused wherever the full data is not needed
+    or not available: associations between columns, plots and column filters
+    of lazy dataframes. Rows keep their order in ``df``.
+
+    Parameters
+    ----------
+    df : pandas or polars DataFrame, or polars LazyFrame
+        The data to sample.
+    n_rows : int or None
+        Number of rows in ``df``, if known. If ``None`` (and ``df`` is lazy),
+        the sample is drawn with a reservoir in one pass over batches of
+        ``df``.
+    size : int
+        Number of rows in the sample (at most the number of rows in ``df``).
+    random_state : int, numpy Generator or None
+        Seed for the random choice of rows, so that reports on the same data
+        are identical. ``None`` means a different sample each time.
+    stratify_by : str or None
+        Draw the sample so that each value of this column (nulls included)
+        has the same proportion as in ``df``, with at least one row when the
+        sample is large enough.
+
+    Returns
+    -------
+    DataFrame
+        The sample, always in memory (even when ``df`` is lazy).
+    """
+    rng = np.random.default_rng(random_state)
+    if n_rows is None:
+        if not sbd.is_lazyframe(df):
+            n_rows = sbd.shape(df)[0]
+        elif stratify_by is None:
+            sample = reservoir_sample(
+                _utils.iter_batches(df, BATCH_SIZE), size, random_state=rng
+            )
+            return _utils.slice(df, 0, 0) if sample is None else sample
+    if stratify_by is None:
+        indices = rng.choice(n_rows, size=min(size, n_rows), replace=False)
+    else:
+        strata = _utils.collect(_utils.select(df, [stratify_by]))
+        indices = _stratified_indices(
+            _utils.hash_values(sbd.col(strata, stratify_by)), size, rng
+        )
+    return _utils.take(df, np.sort(indices))
+
+
+def _stratified_indices(keys, size, rng):
+    _, strata, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    allocation = _allocate(counts, min(size, len(keys)))
+    # a stable sort groups the row indices of each stratum, in row order
+    grouped = np.argsort(strata, kind="stable")
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    return np.concatenate(
+        [
+            rng.choice(grouped[start : start + count], size=n, replace=False)
+            for start, count, n in zip(starts, counts, allocation)
+        ]
+    )
+
+
+def _allocate(counts, size):
+    # proportional allocation, with at least one row per stratum when there
+    # is room for it, and the remaining rows given to the largest remainders.
+    exact = counts * size / counts.sum()
+    allocation = np.minimum(np.maximum(np.floor(exact), 1), counts).astype(int)
+    if allocation.sum() > size:
+        allocation = np.floor(exact).astype(int)
+    while allocation.sum() < size:
+        remainder = np.where(allocation < counts, exact - allocation, -np.inf)
+        order = np.argsort(-remainder, kind="stable")
+        n_missing = size - allocation.sum()
+        order = order[: n_missing][np.isfinite(remainder[order[:n_missing]])]
+        allocation[order] += 1
+    return allocation
+
+
+class ReservoirSampler:
+    """Uniform sample of fixed size from data seen in batches.
+
+    Each row gets a random key and the ``size`` rows with the smallest keys
+    are kept, so memory is bounded by the sample size however many rows are
+    seen, and every subset of ``size`` rows is equally likely. Two samplers
+    of disjoint parts of the data can be merged into a sampler of the whole.
+
+    Parameters
+    ----------
+    size : int
+        Number of rows in the sample.
+    random_state : int, numpy Generator or None
+        Seed for the keys of the rows.
+    """
+
+    def __init__(self, size=SAMPLE_SIZE, random_state=0):
+        self.size = size
+        self.n = 0
+        self.rows = None
+        self._keys = np.empty(0)
+        self._positions = np.empty(0, dtype=np.int64)
+        self._rng = np.random.default_rng(random_state)
+
+    def update(self, batch):
+        n_batch = sbd.shape(batch)[0]
+        positions = np.arange(self.n, self.n + n_batch)
+        self.n += n_batch
+        return self._add(batch, self._rng.random(n_batch), positions)
+
+    def merge(self, other):
+        """Fold ``other``, a sampler of rows seen after this one's, into it."""
+        if other.rows is not None:
+            self._add(other.rows, other._keys, other._positions + self.n)
+        self.n += other.n
+        return self
+
+    def result(self):
+        """The sampled rows, in the order in which they were seen."""
+        if self.rows is None:
+            return None
+        return _utils.take(self.rows, np.argsort(self._positions))
+
+    def _add(self, rows, keys, positions):
+        if self.rows is not None:
+            rows = sbd.concat(self.rows, rows)
+            keys = np.concatenate([self._keys, keys])
+            positions = np.concatenate([self._positions, positions])
+        if len(keys) > self.size:
+            kept = np.sort(np.argpartition(keys, self.size)[: self.size])
+            rows, keys, positions = _utils.take(rows, kept), keys[kept], positions[kept]
+        self.rows, self._keys, self._positions = rows, keys, positions
+        return self
+
+
+def reservoir_sample(batches, size=SAMPLE_SIZE, random_state=0):
+    """Uniform sample of ``size`` rows from an iterable of dataframes."""
+    sampler = ReservoirSampler(size, random_state=random_state)
+    for batch in batches:
+        sampler.update(batch)
+    return sampler.result()
@@ -0,0 +1,223 @@
+import numpy as np
+
+QUANTILE_SKETCH_CAPACITY = 2048
+HYPERLOGLOG_PRECISION = 14
+HEAVY_HITTERS_CAPACITY = 1024
+
+
+class QuantileSketch:
+    """Mergeable sketch of a distribution, used to approximate quantiles.
+
+    This is a simplified KLL sketch: items are stored in levels, and an item
+    at level ``h`` stands for ``2 ** h`` values of the input. When a level
+    holds more than ``capacity`` items, they are sorted and every other item
+    is promoted to the next level. Memory is thus bounded by ``capacity``
+    times the number of levels, which grows with the log of the number of
+    values.
+
+    Compacting level ``h`` shifts the rank of any value by at most ``2 **
+    h``, so the sum of these shifts is a deterministic bound on the rank
+    error of the quantiles; it is exposed (normalized by the number of
+    values) as ``rank_error``. The minimum and maximum are tracked exactly.
+    NaNs are ignored.
+
+    Parameters
+    ----------
+    capacity : int
+        Maximum number of items in each level.
+    seed : int
+        Seed for choosing which half of a level is promoted.
+    """
+
+    def __init__(self, capacity=QUANTILE_SKETCH_CAPACITY, seed=0):
+        self.capacity = capacity
+        self.levels = [np.empty(0)]
+        self.n = 0
+        self.min = None
+        self.max = None
+        self._error = 0
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return self
+        self.n += len(values)
+        self._update_extrema(values.min(), values.max())
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compact()
+        return self
+
+    def merge(self, other):
+        """Fold ``other`` into this sketch and return it."""
+        if other.n == 0:
+            return self
+        self.n += other.n
+        self._error += other._error
+        self._update_extrema(other.min, other.max)
+        for level, items in enumerate(other.levels):
+            if level == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self._compact()
+        return self
+
+    @property
+    def rank_error(self):
+        if self.n == 0:
+            return 0.0
+        return self._error / self.n
+
+    def quantiles(self, q):
+        """Quantiles (with the 'nearest' interpolation) for each value of q."""
+        if self.n == 0:
+            return [None for _ in q]
+        items = np.concatenate(self.levels)
+        weights = np.concatenate(
+            [np.full(len(items), 2**h) for h, items in enumerate(self.levels)]
+        )
+        order = np.argsort(items, kind="stable")
+        items, cumulative_weights = items[order], np.cumsum(weights[order])
+        result = []
+        for quantile in q:
+            if quantile <= 0.0:
+                result.append(self.min)
+            elif quantile >= 1.0:
+                result.append(self.max)
+            else:
+                rank = quantile * (cumulative_weights[-1] - 1)
+                idx = np.searchsorted(cumulative_weights, np.round(rank) + 1)
+                result.append(float(items[min(idx, len(items) - 1)]))
+        return result
+
+    def _update_extrema(self, min_value, max_value):
+        min_value, max_value = float(min_value), float(max_value)
+        self.min = min_value if self.min is None else min(self.min, min_value)
+        self.max = max_value if self.max is None else max(self.max, max_value)
+
+    def _compact(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self.capacity:
+                items = np.sort(items)
+                kept, items = items[: len(items) % 2], items[len(items) % 2 :]
+                promoted = items[self._rng.integers(2) :: 2]
+                self._error += 2**level
+                self.levels[level] = kept
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[level + 1] = np.concatenate(
+                    [self.levels[level + 1], promoted]
+                )
+            level += 1
+
+
+class HyperLogLog:
+    """Mergeable estimate of the number of distinct values.
+
+    The input is given as 64-bit hashes of the values. Each hash selects one
+    of ``2 ** precision`` registers with its first bits, and the register
+    keeps the maximum position of the first 1 bit in the remaining bits. The
+    relative standard error of the estimate is ``1.04 / sqrt(2 ** precision)``
+    (0.8% for the default precision).
+    """
+
+    def __init__(self, precision=HYPERLOGLOG_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(2**precision, dtype=np.uint8)
+
+    def update(self, hashes):
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if not len(hashes):
+            return self
+        p = np.uint64(self.precision)
+        idx = (hashes >> (np.uint64(64) - p)).astype(np.intp)
+        rank = np.minimum(_leading_zeros(hashes << p), 64 - self.precision) + 1
+        np.maximum.at(self.registers, idx, rank.astype(np.uint8))
+        return self
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    @property
+    def relative_error(self):
+        return 1.04 / np.sqrt(len(self.registers))
+
+    def count(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(2.0 ** -self.registers.astype(float))
+        n_empty = np.count_nonzero(self.registers == 0)
+        if estimate <= 2.5 * m and n_empty:
+            # linear counting is more accurate for small cardinalities
+            estimate = m * np.log(m / n_empty)
+        return int(round(estimate))
+
+
+def _leading_zeros(values):
+    # number of leading 0 bits in each uint64; 63 (not 64) for 0, which is fine
+    # as the caller caps the result to the number of available bits.
+    values = values.copy()
+    count = np.zeros(values.shape, dtype=np.int64)
+    for shift in [32, 16, 8, 4, 2, 1]:
+        is_small = (values >> np.uint64(64 - shift)) == 0
+        count[is_small] += shift
+        values[is_small] <<= np.uint64(shift)
+    return count
+
+
+class HeavyHitters:
+    """Mergeable summary of the most frequent values (Misra-Gries).
+
+    At most ``capacity`` counters are kept. When there are more, the
+    ``capacity + 1``-th largest count is subtracted from every counter and the
+    counters that drop to 0 are discarded. The kept counts thus underestimate
+    the true counts by at most ``error``, which is itself at most ``n /
+    (capacity + 1)``; any value more frequent than that is guaranteed to be
+    kept.
+    """
+
+    def __init__(self, capacity=HEAVY_HITTERS_CAPACITY):
+        self.capacity = capacity
+        self.counts = {}
+        self.n = 0
+        self.error = 0
+
+    @classmethod
+    def from_top_counts(
+        cls, top_counts, n_distinct, n, capacity=HEAVY_HITTERS_CAPACITY
+    ):
+        """Summarize a chunk of data from its exact counts.
+
+        ``top_counts`` maps the (at least) ``capacity + 1`` most frequent
+        values to their counts, in decreasing order; ``n_distinct`` and ``n``
+        are the number of distinct values and of values in the chunk.
+        """
+        sketch = cls(capacity)
+        sketch.n = n
+        counts = list(top_counts.items())
+        if n_distinct > capacity:
+            sketch.error = counts[capacity][1]
+        sketch.counts = {
+            value: count - sketch.error
+            for value, count in counts[:capacity]
+            if count > sketch.error
+        }
+        return sketch
+
+    def merge(self, other):
+        for value, count in other.counts.items():
+            self.counts[value] = self.counts.get(value, 0) + count
+        self.n += other.n
+        self.error += other.error
+        if len(self.counts) > self.capacity:
+            delta = sorted(self.counts.values(), reverse=True)[self.capacity]
+            self.counts = {v: c - delta for v, c in self.counts.items() if c > delta}
+            self.error += delta
+        return self
+
+    def top_k(self, k):
+        return dict(sorted(self.counts.items(), key=lambda item: -item[1])[:k])
@@ -0,0 +1,278 @@
+"""Mergeable summaries, to update a report when rows are appended.
+
+A ``SummaryState`` holds, for each column, statistics that can be combined:
+counts, moments, a quantile sketch, a HyperLogLog and heavy hitters, as well
+as the first and last rows and a reservoir sample of the data. The state of
+new rows (for example a new partition of a table) can be merged into a saved
+state (states can be pickled), and ``_summarize.summarize_state`` builds the
+summary from the merged state without reading the old rows again.
+
+The statistics are those of ``summarize_dataframe(..., approximate=True)``:
+quantiles come from sketches, as do the value counts and number of unique
+values of columns with more than ``HEAVY_HITTERS_CAPACITY`` distinct values.
+Plots are drawn from the sample.
+"""
+
+import math
+
+import numpy as np
+from skrub import _dataframe as sbd
+
+from . import _utils
+from ._sampling import BATCH_SIZE, SAMPLE_SIZE, ReservoirSampler
+from ._sketches import (
+    HEAVY_HITTERS_CAPACITY,
+    HeavyHitters,
+    HyperLogLog,
+    QuantileSketch,
+)
+from ._stats import QUANTILES, VALUE_COUNTS_K, column_kind
+
+_N_HEAD_ROWS = 5
+
+
+def summary_state(
+    df, sample_size=SAMPLE_SIZE, random_state=0, n_jobs=None, batch_size=BATCH_SIZE
+):
+    """Compute the state of a dataframe in one pass over batches of rows.
+
+    ``df`` can be a pandas or polars DataFrame or a polars LazyFrame. When the
+    states of several parts of a table are merged, each part's state should
+    be computed with a different ``random_state``, otherwise the rows at the
+    same positions in each part are sampled together.
+    """
+    state = SummaryState(_utils.slice(df, 0, 0), sample_size, random_state)
+    for batch in _utils.iter_batches(df, batch_size):
+        state.update(batch, n_jobs=n_jobs)
+    return state
+
+
+class SummaryState:
+    """Mergeable statistics of the rows of a dataframe seen so far.
+
+    Parameters
+    ----------
+    schema : DataFrame
+        A dataframe (usually empty) with the columns and dtypes of the data.
+    sample_size : int
+        Number of rows in the reservoir sample.
+    random_state : int, numpy Generator or None
+        Seed of the reservoir sample.
+    """
+
+    def __init__(self, schema, sample_size=SAMPLE_SIZE, random_state=0):
+        self.schema = _utils.slice(schema, 0, 0)
+        self.n_rows = 0
+        self.head = self.schema
+        self.tail = self.schema
+        self.columns = [
+            _column_state(sbd.col(self.schema, name))
+            for name in sbd.column_names(self.schema)
+        ]
+        self.sampler = ReservoirSampler(sample_size, random_state=random_state)
+
+    def update(self, batch, n_jobs=None):
+        """Add the rows of ``batch``, which come after the rows already seen."""
+        self._check_columns(batch)
+        self.n_rows += sbd.shape(batch)[0]
+        self._update_rows(batch, batch)
+        names = sbd.column_names(batch)
+        _utils.parallel_map(
+            lambda i: self.columns[i].update(sbd.col(batch, names[i])),
+            range(len(names)),
+            n_jobs=n_jobs,
+        )
+        self.sampler.update(batch)
+        return self
+
+    def merge(self, other):
+        """Fold ``other``, the state of rows that come after these, into it."""
+        self._check_columns(other.schema)
+        self.n_rows += other.n_rows
+        self._update_rows(other.head, other.tail)
+        for column, other_column in zip(self.columns, other.columns):
+            column.merge(other_column)
+        self.sampler.merge(other.sampler)
+        return self
+
+    @property
+    def sample(self):
+        sample = self.sampler.result()
+        return self.schema if sample is None else sample
+
+    def statistics(self):
+        """The statistics in the format of ``_stats.column_statistics``."""
+        return {
+            "n_rows": self.n_rows,
+            "columns": [column.statistics() for column in self.columns],
+        }
+
+    def _update_rows(self, head, tail):
+        if sbd.shape(self.head)[0] < _N_HEAD_ROWS:
+            self.head = _utils.slice(sbd.concat(self.head, head), _N_HEAD_ROWS)
+        self.tail = _utils.slice(sbd.concat(self.tail, tail), -_N_HEAD_ROWS, None)
+
+    def _check_columns(self, df):
+        names = sbd.column_names(df)
+        expected = sbd.column_names(self.schema)
+        if names != expected:
+            raise ValueError(
+                f"Cannot add data with columns {names} to the summary of a "
+                f"dataframe with columns {expected}."
+            )
+
+
+def _column_state(column):
+    kind = column_kind(column)
+    if kind == "numeric":
+        return NumericState()
+    if kind == "datetime":
+        return DatetimeState()
+    return CategoricalState()
+
+
+def _null_count(column):
+    return sbd.shape(column)[0] - sbd.shape(sbd.drop_nulls(column))[0]
+
+
+class NumericState:
+    """Null count, mean and variance, and a quantile sketch.
+
+    The mean and the sum of squared deviations are merged with the pairwise
+    update of Chan et al., which stays accurate for large counts.
+    """
+
+    def __init__(self):
+        self.null_count = 0
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.sketch = QuantileSketch()
+
+    def update(self, column):
+        self.null_count += _null_count(column)
+        values = _utils.to_float_numpy(column)
+        values = values[~np.isnan(values)]
+        other = NumericState()
+        other.count = len(values)
+        if other.count:
+            other.mean = float(values.mean())
+            other.m2 = float(((values - other.mean) ** 2).sum())
+        self._merge_moments(other)
+        self.sketch.update(values)
+        return self
+
+    def merge(self, other):
+        self.null_count += other.null_count
+        self._merge_moments(other)
+        self.sketch.merge(other.sketch)
+        return self
+
+    def _merge_moments(self, other):
+        count = self.count + other.count
+        if not other.count:
+            return
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta**2 * self.count * other.count / count
+        self.count = count
+
+    def statistics(self):
+        if not self.count:
+            # no values (yet): as for all-null columns in
+            # ``_stats.column_statistics``, there is no mean, std or quantile
+            return {
+                "null_count": self.null_count,
+                "mean": None,
+                "std": None,
+                "quantiles": dict.fromkeys(QUANTILES),
+            }
+        stats = {
+            "null_count": self.null_count,
+            "mean": self.mean,
+            "std": math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else None,
+            "quantiles": dict(zip(QUANTILES, self.sketch.quantiles(QUANTILES))),
+        }
+        # the quantiles are exact as long as the sketch was never compacted
+        if self.sketch.rank_error:
+            stats["quantiles_rank_error"] = self.sketch.rank_error
+        return stats
+
+
+class DatetimeState:
+    """Null count, minimum and maximum."""
+
+    def __init__(self):
+        self.null_count = 0
+        self.min = None
+        self.max = None
+
+    def update(self, column):
+        self.null_count += _null_count(column)
+        column = sbd.drop_nulls(column)
+        if sbd.shape(column)[0]:
+            self._merge_extrema(sbd.min(column), sbd.max(column))
+        return self
+
+    def merge(self, other):
+        self.null_count += other.null_count
+        if other.min is not None:
+            self._merge_extrema(other.min, other.max)
+        return self
+
+    def _merge_extrema(self, min_value, max_value):
+        self.min = min_value if self.min is None else min(self.min, min_value)
+        self.max = max_value if self.max is None else max(self.max, max_value)
+
+    def statistics(self):
+        if self.min is None:
+            # no values (yet): there is no minimum or maximum
+            return {"null_count": self.null_count}
+        return {"null_count": self.null_count, "min": self.min, "max": self.max}
+
+
+class CategoricalState:
+    """Null count, HyperLogLog and heavy hitters of the non-null values.
+
+    While there are at most ``HEAVY_HITTERS_CAPACITY`` distinct values the
+    heavy hitters hold the exact counts of all of them, and the statistics
+    are exact.
+    """
+
+    def __init__(self):
+        self.null_count = 0
+        self.distinct = HyperLogLog()
+        self.heavy_hitters = HeavyHitters()
+
+    def update(self, column):
+        self.null_count += _null_count(column)
+        column = sbd.drop_nulls(column)
+        self.distinct.update(_utils.hash_values(column))
+        n_distinct, top_counts = _utils.top_k_value_counts(
+            column, HEAVY_HITTERS_CAPACITY + 1
+        )
+        self.heavy_hitters.merge(
+            HeavyHitters.from_top_counts(
+                top_counts, n_distinct, n=sbd.shape(column)[0]
+            )
+        )
+        return self
+
+    def merge(self, other):
+        self.null_count += other.null_count
+        self.distinct.merge(other.distinct)
+        self.heavy_hitters.merge(other.heavy_hitters)
+        return self
+
+    def statistics(self):
+        stats = {
+            "null_count": self.null_count,
+            "value_counts": self.heavy_hitters.top_k(VALUE_COUNTS_K),
+        }
+        if not self.heavy_hitters.error:
+            stats["n_unique"] = len(self.heavy_hitters.counts)
+            return stats
+        stats["n_unique"] = self.distinct.count()
+        stats["n_unique_relative_error"] = self.distinct.relative_error
+        stats["value_counts_max_error"] = self.heavy_hitters.error
+        return stats
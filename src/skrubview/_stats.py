@@ -0,0 +1,432 @@
+from skrub import _dataframe as sbd
+from skrub._dispatch import dispatch
+
+from . import _utils
+from ._sketches import (
+    HEAVY_HITTERS_CAPACITY,
+    HeavyHitters,
+    HyperLogLog,
+    QuantileSketch,
+)
+
+QUANTILES = [0.0, 0.25, 0.5, 0.75, 1.0]
+VALUE_COUNTS_K = 10
+BATCH_SIZE = 100_000
+
+
+def column_kind(column):
+    if sbd.is_numeric(column):
+        return "numeric"
+    if sbd.is_any_date(column):
+        return "datetime"
+    return "categorical"
+
+
+@dispatch
+def column_statistics(
+    df,
+    k=VALUE_COUNTS_K,
+    n_jobs=None,
+    known_statistics=None,
+    approximate=False,
+    sketched_columns=(),
+):
+    """Compute the statistics of all columns in one batched aggregation.
+
+    Returns a dict with the number of rows ``n_rows`` and a list ``columns``
+    with one dict per column, in column order. All columns have a
+    ``null_count``; numeric columns also have ``mean``, ``std`` and
+    ``quantiles``, datetime columns have ``min`` and ``max`` and other columns
+    have ``n_unique`` and the top-``k`` ``value_counts``. ``n_jobs`` is only
+    used by backends that cannot parallelize the aggregation themselves.
+
+    ``known_statistics`` has the format returned by
+    ``_utils.read_file_statistics``; the values it contains (such as the
+    Parquet footer's null counts) are used as they are instead of being
+    computed from the data.
+
+    If ``approximate`` is true, the quantiles of numeric columns are left out
+    (``None``); they can then be estimated with ``add_approximate_quantiles``.
+    The value counts of columns listed in ``sketched_columns`` are not
+    computed: they come from ``sketch_value_counts``.
+    """
+    raise NotImplementedError()
+
+
+@column_statistics.specialize("polars")
+def _column_statistics_polars(
+    df,
+    k=VALUE_COUNTS_K,
+    n_jobs=None,
+    known_statistics=None,
+    approximate=False,
+    sketched_columns=(),
+):
+    # polars already runs the select over its own thread pool
+    del n_jobs
+    import polars as pl
+
+    known = _known_values(known_statistics)
+    # for a LazyFrame this is the only query that scans the data, and it runs
+    # in the streaming engine.
+    schema_df = _utils.slice(df, 0, 0)
+    exprs = []
+    if "n_rows" not in known:
+        exprs.append(pl.len().alias("n_rows"))
+    for idx, col_name in enumerate(sbd.column_names(schema_df)):
+        col = pl.col(col_name)
+        col_known = known["columns"].get(col_name, {})
+        if "null_count" not in col_known:
+            exprs.append(col.null_count().alias(f"{idx}_null_count"))
+        kind = column_kind(sbd.col(schema_df, col_name))
+        if kind == "numeric":
+            exprs.append(col.mean().alias(f"{idx}_mean"))
+            exprs.append(col.std().alias(f"{idx}_std"))
+            for q in QUANTILES:
+                if approximate or (q in (0.0, 1.0) and "min" in col_known):
+                    continue
+                exprs.append(col.quantile(q, "nearest").alias(f"{idx}_quantile_{q}"))
+        elif kind == "datetime":
+            if "min" not in col_known:
+                exprs.append(col.min().alias(f"{idx}_min"))
+                exprs.append(col.max().alias(f"{idx}_max"))
+        elif col_name not in sketched_columns:
+            non_null = col.drop_nulls()
+            exprs.append(non_null.n_unique().alias(f"{idx}_n_unique"))
+            exprs.append(
+                non_null.value_counts(sort=True)
+                .head(k)
+                .implode()
+                .alias(f"{idx}_value_counts")
+            )
+    row = _utils.collect(df.select(exprs)).row(0, named=True) if exprs else {}
+    stats = []
+    for idx, col_name in enumerate(sbd.column_names(schema_df)):
+        col_known = known["columns"].get(col_name, {})
+        col_stats = {
+            "null_count": col_known.get("null_count", row.get(f"{idx}_null_count"))
+        }
+        kind = column_kind(sbd.col(schema_df, col_name))
+        if kind == "numeric":
+            col_stats["mean"] = row[f"{idx}_mean"]
+            col_stats["std"] = row[f"{idx}_std"]
+            col_stats["quantiles"] = {
+                q: row.get(f"{idx}_quantile_{q}") for q in QUANTILES
+            }
+            if approximate:
+                col_stats["quantiles"] = None
+            elif "min" in col_known:
+                # polars returns float quantiles, even for integer columns
+                col_stats["quantiles"][0.0] = float(col_known["min"])
+                col_stats["quantiles"][1.0] = float(col_known["max"])
+        elif kind == "datetime":
+            col_stats["min"] = col_known.get("min", row.get(f"{idx}_min"))
+            col_stats["max"] = col_known.get("max", row.get(f"{idx}_max"))
+        elif col_name not in sketched_columns:
+            col_stats["n_unique"] = row[f"{idx}_n_unique"]
+            col_stats["value_counts"] = dict(
+                tuple(s.values()) for s in row[f"{idx}_value_counts"]
+            )
+        stats.append(col_stats)
+    return {"n_rows": known.get("n_rows", row.get("n_rows")), "columns": stats}
+
+
+@column_statistics.specialize("pandas")
+def _column_statistics_pandas(
+    df,
+    k=VALUE_COUNTS_K,
+    n_jobs=None,
+    known_statistics=None,
+    approximate=False,
+    sketched_columns=(),
+):
+    known = _known_values(known_statistics)["columns"]
+    kinds = {c: column_kind(sbd.col(df, c)) for c in sbd.column_names(df)}
+    numeric = [c for c, kind in kinds.items() if kind == "numeric"]
+    datetime = [
+        c
+        for c, kind in kinds.items()
+        if kind == "datetime" and "min" not in known.get(c, {})
+    ]
+    categorical = [
+        c
+        for c, kind in kinds.items()
+        if kind == "categorical" and c not in sketched_columns
+    ]
+    null_counts = df[
+        [c for c in kinds if "null_count" not in known.get(c, {})]
+    ].isna().sum()
+    if numeric:
+        moments = df[numeric].agg(["mean", "std"])
+        if not approximate:
+            quantiles = df[numeric].quantile(QUANTILES, interpolation="nearest")
+    if datetime:
+        extrema = df[datetime].agg(["min", "max"])
+    # pandas has no batched value_counts: this stays a per-column pass
+    value_counts = dict(
+        zip(
+            categorical,
+            _utils.parallel_map(
+                lambda c: sbd.col(df, c).dropna().rename("value").value_counts(),
+                categorical,
+                n_jobs=n_jobs,
+            ),
+        )
+    )
+    stats = []
+    for col_name, kind in kinds.items():
+        col_known = known.get(col_name, {})
+        col_stats = {"null_count": col_known.get("null_count")}
+        if col_stats["null_count"] is None:
+            col_stats["null_count"] = null_counts[col_name]
+        if kind == "numeric":
+            col_stats["mean"] = moments.loc["mean", col_name]
+            col_stats["std"] = moments.loc["std", col_name]
+            col_stats["quantiles"] = (
+                None
+                if approximate
+                else {q: quantiles.loc[q, col_name] for q in QUANTILES}
+            )
+        elif kind == "datetime" and "min" in col_known:
+            col_stats["min"], col_stats["max"] = col_known["min"], col_known["max"]
+        elif kind == "datetime":
+            col_stats["min"] = extrema.loc["min", col_name]
+            col_stats["max"] = extrema.loc["max", col_name]
+        elif col_name not in sketched_columns:
+            counts = value_counts[col_name]
+            col_stats["n_unique"] = len(counts)
+            col_stats["value_counts"] = counts.iloc[:k].to_dict()
+        stats.append(col_stats)
+    return {"n_rows": sbd.shape(df)[0], "columns": stats}
+
+
+@dispatch
+def null_counts(df, known_statistics=None):
+    """Count the rows and the null values of each column.
+
+    These are the cheapest statistics: polars stores the null count of each
+    column (a LazyFrame needs one streaming query) and a Parquet footer may
+    already hold them. The result has the format of ``known_statistics``
+    (see ``column_statistics``), whose values are kept and completed, so it
+    can be passed back to ``column_statistics`` to avoid counting again.
+    """
+    raise NotImplementedError()
+
+
+@null_counts.specialize("polars")
+def _null_counts_polars(df, known_statistics=None):
+    import polars as pl
+
+    known = _known_values(known_statistics)
+    names = sbd.column_names(_utils.slice(df, 0, 0))
+    exprs = [
+        pl.col(col_name).null_count().alias(f"{idx}_null_count")
+        for idx, col_name in enumerate(names)
+        if "null_count" not in known["columns"].get(col_name, {})
+    ]
+    if "n_rows" not in known:
+        exprs.append(pl.len().alias("n_rows"))
+    row = _utils.collect(df.select(exprs)).row(0, named=True) if exprs else {}
+    return _with_null_counts(known, names, row)
+
+
+@null_counts.specialize("pandas")
+def _null_counts_pandas(df, known_statistics=None):
+    known = _known_values(known_statistics)
+    names = list(df.columns)
+    row = {
+        f"{idx}_null_count": sbd.col(df, col_name).isna().sum()
+        for idx, col_name in enumerate(names)
+        if "null_count" not in known["columns"].get(col_name, {})
+    }
+    row["n_rows"] = sbd.shape(df)[0]
+    return _with_null_counts(known, names, row)
+
+
+def _with_null_counts(known, names, row):
+    columns = {}
+    for idx, col_name in enumerate(names):
+        columns[col_name] = dict(known["columns"].get(col_name, {}))
+        if f"{idx}_null_count" in row:
+            columns[col_name]["null_count"] = int(row[f"{idx}_null_count"])
+    return {"n_rows": int(known.get("n_rows", row.get("n_rows"))), "columns": columns}
+
+
+def add_approximate_quantiles(df, stats, n_jobs=None, batch_size=BATCH_SIZE):
+    """Estimate the quantiles of numeric columns with mergeable sketches.
+
+    All numeric columns are sketched in a single pass over batches of ``df``,
+    so memory does not grow with the number of rows. The quantiles and the
+    sketch's bound on their rank error (as a fraction of the number of
+    values) are stored in ``stats``. The sketches are returned.
+    """
+    schema_df = _utils.slice(df, 0, 0)
+    numeric = [
+        (idx, col_name)
+        for idx, col_name in enumerate(sbd.column_names(schema_df))
+        if column_kind(sbd.col(schema_df, col_name)) == "numeric"
+    ]
+    sketches = [QuantileSketch() for _ in numeric]
+    if not numeric:
+        return sketches
+    batches = _utils.iter_batches(
+        _utils.select(df, [col_name for _, col_name in numeric]), batch_size
+    )
+    for batch in batches:
+        _utils.parallel_map(
+            lambda i: sketches[i].update(
+                _utils.to_float_numpy(sbd.col(batch, numeric[i][1]))
+            ),
+            range(len(numeric)),
+            n_jobs=n_jobs,
+        )
+    for (idx, _), sketch in zip(numeric, sketches):
+        stats["columns"][idx]["quantiles"] = dict(
+            zip(QUANTILES, sketch.quantiles(QUANTILES))
+        )
+        stats["columns"][idx]["quantiles_rank_error"] = sketch.rank_error
+    return sketches
+
+
+def sketch_value_counts(
+    df, threshold, k=VALUE_COUNTS_K, n_jobs=None, batch_size=BATCH_SIZE
+):
+    """Approximate the value counts of high-cardinality columns.
+
+    Non-numeric, non-datetime columns are read in batches, in a single pass.
+    For each batch the exact value counts are computed, so memory is bounded
+    by the batch size rather than the column's cardinality, and folded into a
+    HyperLogLog (number of distinct values) and a heavy hitters summary (top
+    ``k`` counts). Returns a dict mapping the names of the columns with more
+    than ``threshold`` distinct values (according to the HyperLogLog) to
+    their approximate ``n_unique`` and ``value_counts``, with their error
+    bounds. Other columns are not included and need exact value counts.
+    With ``threshold=None`` all the categorical columns are included.
+    """
+    schema_df = _utils.slice(df, 0, 0)
+    categorical = [
+        col_name
+        for col_name in sbd.column_names(schema_df)
+        if column_kind(sbd.col(schema_df, col_name)) == "categorical"
+    ]
+    if not categorical:
+        return {}
+    distinct = [HyperLogLog() for _ in categorical]
+    heavy_hitters = [HeavyHitters() for _ in categorical]
+    for batch in _utils.iter_batches(_utils.select(df, categorical), batch_size):
+
+        def update(i):
+            column = sbd.drop_nulls(sbd.col(batch, categorical[i]))
+            distinct[i].update(_utils.hash_values(column))
+            n_distinct, top_counts = _utils.top_k_value_counts(
+                column, HEAVY_HITTERS_CAPACITY + 1
+            )
+            heavy_hitters[i].merge(
+                HeavyHitters.from_top_counts(
+                    top_counts, n_distinct, n=sbd.shape(column)[0]
+                )
+            )
+
+        _utils.parallel_map(update, range(len(categorical)), n_jobs=n_jobs)
+    sketched = {}
+    for col_name, hll, top in zip(categorical, distinct, heavy_hitters):
+        n_unique = hll.count()
+        if threshold is not None and n_unique <= threshold:
+            continue
+        sketched[col_name] = {
+            "n_unique": n_unique,
+            "n_unique_relative_error": hll.relative_error,
+            "value_counts": top.top_k(k),
+            "value_counts_max_error": top.error,
+        }
+    return sketched
+
+
+@dispatch
+def approximate_n_unique(df):
+    """A cheap estimate of the number of distinct values of categorical columns.
+
+    It is used to choose the columns to sketch before computing the
+    statistics: polars estimates it with its own HyperLogLog, in one query
+    that stores neither the values nor their counts. Returns a dict mapping
+    column names to their estimated number of distinct (non-null) values.
+    """
+    raise NotImplementedError()
+
+
+@approximate_n_unique.specialize("polars")
+def _approximate_n_unique_polars(df):
+    import polars as pl
+
+    schema_df = _utils.slice(df, 0, 0)
+    categorical = [
+        col_name
+        for col_name in sbd.column_names(schema_df)
+        if column_kind(sbd.col(schema_df, col_name)) == "categorical"
+    ]
+    if not categorical:
+        return {}
+    exprs = [
+        pl.col(col_name).drop_nulls().approx_n_unique().alias(str(idx))
+        for idx, col_name in enumerate(categorical)
+    ]
+    row = _utils.collect(df.select(exprs)).row(0)
+    return dict(zip(categorical, row))
+
+
+@approximate_n_unique.specialize("pandas")
+def _approximate_n_unique_pandas(df):
+    import polars as pl
+
+    n_unique = {}
+    for col_name in sbd.column_names(df):
+        column = sbd.col(df, col_name)
+        if column_kind(column) != "categorical":
+            continue
+        try:
+            # converting to polars is much faster than hashing the objects
+            n_unique[col_name] = pl.from_pandas(column).drop_nulls().approx_n_unique()
+        except (TypeError, ValueError, pl.exceptions.PolarsError):
+            # mixed types, or values polars cannot count
+            hashes = _utils.hash_values(sbd.drop_nulls(column))
+            n_unique[col_name] = HyperLogLog().update(hashes).count()
+    return n_unique
+
+
+def estimate_n_unique(df, n_jobs=None, batch_size=BATCH_SIZE):
+    """Estimate the number of distinct values of the categorical columns.
+
+    The columns are hashed into HyperLogLogs in a single pass over batches of
+    ``df``, without counting the values. Returns a dict mapping column names
+    to their approximate ``n_unique`` and its ``n_unique_relative_error``.
+    """
+    schema_df = _utils.slice(df, 0, 0)
+    categorical = [
+        col_name
+        for col_name in sbd.column_names(schema_df)
+        if column_kind(sbd.col(schema_df, col_name)) == "categorical"
+    ]
+    if not categorical:
+        return {}
+    distinct = [HyperLogLog() for _ in categorical]
+    for batch in _utils.iter_batches(_utils.select(df, categorical), batch_size):
+        _utils.parallel_map(
+            lambda i: distinct[i].update(
+                _utils.hash_values(sbd.drop_nulls(sbd.col(batch, categorical[i])))
+            ),
+            range(len(categorical)),
+            n_jobs=n_jobs,
+        )
+    return {
+        col_name: {
+            "n_unique": hll.count(),
+            "n_unique_relative_error": hll.relative_error,
+        }
+        for col_name, hll in zip(categorical, distinct)
+    }
+
+
+def _known_values(known_statistics):
+    if known_statistics is None:
+        return {"columns": {}}
+    return known_statistics
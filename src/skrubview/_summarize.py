@@ -1,88 +1,696 @@
+import time
+
+import numpy as np
 from skrub import _dataframe as sbd
 
-from . import _plotting, _utils, _interactions
+from . import (
+    _budget,
+    _plotting,
+    _profile,
+    _utils,
+    _interactions,
+    _sampling,
+    _state,
+    _stats,
+)
+from ._sampling import SAMPLE_SIZE
 
 _HIGH_CARDINALITY_THRESHOLD = 10
-_SUBSAMPLE_SIZE = 3000
-_ASSOCIATION_THRESHOLD = 0.2
+# defaults of the options of summarize_dataframe, also used by Report and the
+# command line
+SKETCH_THRESHOLD = 100_000
+ASSOCIATION_THRESHOLD = 0.2
+MAX_ASSOCIATIONS = 20
 
 
 def summarize_dataframe(
-    df, *, order_by=None, with_plots=False, title=None
+    df,
+    *,
+    order_by=None,
+    with_plots=False,
+    title=None,
+    n_jobs=None,
+    file_statistics=None,
+    approximate=False,
+    sketch_threshold=SKETCH_THRESHOLD,
+    max_associations=MAX_ASSOCIATIONS,
+    association_threshold=ASSOCIATION_THRESHOLD,
+    sample_size=SAMPLE_SIZE,
+    random_state=0,
+    stratify_by=None,
+    plot_backend=_plotting.DEFAULT_PLOT_BACKEND,
+    return_state=False,
+    profile=False,
+    time_budget=None,
+):
+    """Compute the summary statistics (and plots) used to build reports.
+
+    Parameters
+    ----------
+    df : pandas or polars DataFrame, or polars LazyFrame
+        For a LazyFrame the statistics are computed in one streaming query and
+        only the head, tail and sample are collected.
+    order_by : str or None
+        Numeric columns are plotted as a function of this column.
+    with_plots : bool
+        Whether to add plots (as SVG strings) to the column summaries.
+    title : str or None
+        Title of the report.
+    n_jobs : int or None
+        Number of threads used to summarize columns.
+    file_statistics : dict or None
+        Statistics read from a Parquet footer by
+        ``_utils.read_file_statistics``, which are not recomputed.
+    approximate : bool
+        Estimate quantiles with sketches, in bounded memory.
+    sketch_threshold : int or None
+        Columns with more distinct values than this get approximate value
+        counts and number of unique values. They are found by a cheap
+        estimate of the number of distinct values, skipped when the dataframe
+        has fewer rows, and left out of the exact value counts. ``None`` means
+        always exact.
+    max_associations : int or None
+        Number of pairs of columns with the strongest associations to keep.
+        ``None`` means all of them.
+    association_threshold : float
+        Only pairs with a Cramér's V above this value are kept.
+    sample_size : int
+        Number of rows in the random sample used to compute associations (and
+        plots, for a LazyFrame). It is drawn once and shared by all stages.
+    random_state : int, numpy Generator or None
+        Seed for drawing the sample.
+    stratify_by : str or None
+        Column on which the sample is stratified.
+    plot_backend : str
+        How plots are drawn: "svg" (native SVG), "matplotlib" or "json" (the
+        data, drawn in the browser).
+    return_state : bool
+        Compute the statistics in a single pass as a mergeable
+        ``_state.SummaryState`` and return it with the summary. The state of
+        rows appended later can be merged into it, and ``summarize_state``
+        then gives the summary of all rows without reading the old ones.
+        Statistics are then approximate as with ``approximate=True`` (plus
+        sketched value counts for columns with many distinct values), and
+        ``sketch_threshold``, ``file_statistics`` and ``stratify_by`` are not
+        used.
+    profile : bool
+        Measure the time and memory spent in each stage, and the time spent
+        on each column, in the summary's ``profile`` (see ``_profile``).
+        ``to_html`` and ``to_text`` add their own stage to it.
+    time_budget : float or None
+        Number of seconds the summary should take, whatever the size of the
+        dataframe (see ``_budget``). The number of rows and the null counts
+        are always exact. The other statistics are computed first on the
+        sample, and those of the whole dataframe only if the time this took,
+        extrapolated to all rows, fits in the budget; otherwise the statistics
+        of the sample are kept, with value counts scaled to the number of rows
+        and numbers of distinct values estimated with HyperLogLogs over all
+        rows (``n_unique_is_approximate``), and the columns and summary are
+        marked ``statistics_are_sampled``. Plots are then drawn from the
+        sample (``plots_are_sampled``), and the search for associations stops
+        when its share of the budget is spent (``associations_are_partial``,
+        with the ``associations_searched_fraction`` of pairs of columns).
+        Drawing the plots is not included in the budget.
+
+    Returns
+    -------
+    dict
+        The summary, or a ``(summary, state)`` tuple if ``return_state`` is
+        true.
+    """
+    profile = _profile.new_profile() if profile else None
+    if return_state:
+        if stratify_by is not None:
+            raise ValueError(
+                "'stratify_by' is not supported with 'return_state=True': the "
+                "sample of a state is a uniform reservoir sample."
+            )
+        if time_budget is not None:
+            raise ValueError(
+                "'time_budget' is not supported with 'return_state=True': the "
+                "state is computed in a pass over all rows."
+            )
+        with _profile.stage(profile, "state"):
+            state = _state.summary_state(
+                df, sample_size=sample_size, random_state=random_state, n_jobs=n_jobs
+            )
+        summary = _summarize_state(
+            state,
+            order_by=order_by,
+            with_plots=with_plots,
+            title=title,
+            n_jobs=n_jobs,
+            max_associations=max_associations,
+            association_threshold=association_threshold,
+            plot_backend=plot_backend,
+            profile=profile,
+        )
+        return summary, state
+    budget = None if time_budget is None else _budget.TimeBudget(time_budget)
+    sketch = sketch_threshold is not None and _may_exceed(
+        df, file_statistics, sketch_threshold
+    )
+    stats, sample = None, None
+    if budget is not None:
+        with _profile.stage(profile, "null_counts"):
+            file_statistics = _stats.null_counts(df, known_statistics=file_statistics)
+        n_rows = file_statistics["n_rows"]
+        # when the sample is the whole dataframe, so are its statistics
+        if n_rows > sample_size:
+            with _profile.stage(profile, "sample"):
+                sample = _sampling.draw_sample(
+                    df,
+                    n_rows=n_rows,
+                    size=sample_size,
+                    random_state=random_state,
+                    stratify_by=stratify_by,
+                )
+            with _profile.stage(profile, "sample_statistics"):
+                stats, statistics_seconds = _sample_statistics(
+                    sample,
+                    file_statistics,
+                    budget,
+                    n_passes=1 + sketch + approximate,
+                    n_jobs=n_jobs,
+                )
+            if stats is not None:
+                # the distinct values of a sample say little about those of
+                # all rows: they are estimated in a pass over the data
+                with _profile.stage(profile, "estimate_n_unique"):
+                    n_unique = _stats.estimate_n_unique(df, n_jobs=n_jobs)
+                for col_stats, col_name in zip(
+                    stats["columns"], file_statistics["columns"]
+                ):
+                    col_stats.update(n_unique.get(col_name, {}))
+    statistics_are_sampled = stats is not None
+    if not statistics_are_sampled:
+        start = time.perf_counter()
+        stats = _exact_statistics(
+            df,
+            sketch=sketch,
+            sketch_threshold=sketch_threshold,
+            file_statistics=file_statistics,
+            approximate=approximate,
+            n_jobs=n_jobs,
+            profile=profile,
+        )
+        statistics_seconds = time.perf_counter() - start
+    with _profile.stage(profile, "head_tail"):
+        head = _utils.slice(df, 5)
+        tail = _utils.slice(df, -5, None)
+    n_rows = int(stats["n_rows"])
+    if sample is None:
+        with _profile.stage(profile, "sample"):
+            sample = _sampling.draw_sample(
+                df,
+                n_rows=n_rows,
+                size=sample_size,
+                random_state=random_state,
+                stratify_by=stratify_by,
+            )
+    summary = _make_summary(
+        df,
+        stats,
+        head=head,
+        tail=tail,
+        sample=sample,
+        order_by=order_by,
+        title=title,
+        n_jobs=n_jobs,
+        max_associations=max_associations,
+        association_threshold=association_threshold,
+        profile=profile,
+        associations_deadline=(
+            None if budget is None else budget.deadline(_budget.ASSOCIATIONS_SHARE)
+        ),
+    )
+    if budget is not None:
+        summary["time_budget"] = budget.seconds
+        if statistics_are_sampled:
+            summary["statistics_are_sampled"] = True
+            summary["n_sampled_rows"] = sbd.shape(sample)[0]
+        # plotting all rows is a pass over the columns, like the statistics
+        if statistics_are_sampled or not budget.fits(statistics_seconds):
+            summary["plots_are_sampled"] = True
+    if with_plots:
+        return add_plots(summary, n_jobs=n_jobs, plot_backend=plot_backend)
+    return summary
+
+
+def _exact_statistics(
+    df, *, sketch, sketch_threshold, file_statistics, approximate, n_jobs, profile
+):
+    # the statistics of all rows, possibly with sketches, in the format of
+    # _stats.column_statistics
+    sketched = {}
+    if sketch:
+        # a cheap estimate chooses the columns to sketch, which are left out
+        # of the exact value counts
+        with _profile.stage(profile, "approximate_n_unique"):
+            n_unique = _stats.approximate_n_unique(df)
+        high_cardinality = [
+            col_name for col_name, n in n_unique.items() if n > sketch_threshold
+        ]
+        if high_cardinality:
+            with _profile.stage(profile, "sketch_value_counts"):
+                sketched = _stats.sketch_value_counts(
+                    _utils.select(df, high_cardinality), None, n_jobs=n_jobs
+                )
+    with _profile.stage(profile, "statistics"):
+        stats = _stats.column_statistics(
+            df,
+            n_jobs=n_jobs,
+            known_statistics=file_statistics,
+            approximate=approximate,
+            sketched_columns=list(sketched),
+        )
+    if approximate:
+        with _profile.stage(profile, "approximate_quantiles"):
+            _stats.add_approximate_quantiles(df, stats, n_jobs=n_jobs)
+    column_names = sbd.column_names(_utils.slice(df, 0, 0))
+    for col_stats, col_name in zip(stats["columns"], column_names):
+        col_stats.update(sketched.get(col_name, {}))
+    return stats
+
+
+def _sample_statistics(sample, counts, budget, n_passes, n_jobs):
+    """The statistics of the sample, if those of all rows would take too long.
+
+    Computing them on the sample gives an estimate of the time needed for
+    all rows, assuming it grows linearly with the number of rows (which
+    overestimates it for small samples, where fixed costs dominate) and the
+    number of passes over the data. If that fits in the budget for the
+    statistics, returns ``None``. Otherwise the exact row and null counts of
+    ``counts`` (as returned by ``_stats.null_counts``) replace those of the
+    sample, and value counts are scaled to all rows. Also returns the
+    estimated time.
+    """
+    start = time.perf_counter()
+    stats = _stats.column_statistics(sample, n_jobs=n_jobs)
+    n_sampled_rows = max(stats["n_rows"], 1)
+    estimate = (
+        (time.perf_counter() - start) * n_passes * counts["n_rows"] / n_sampled_rows
+    )
+    if budget.fits(estimate, _budget.STATISTICS_SHARE):
+        return None, estimate
+    scale = counts["n_rows"] / n_sampled_rows
+    for col_stats, col_counts in zip(stats["columns"], counts["columns"].values()):
+        col_stats["null_count"] = col_counts["null_count"]
+        col_stats["sampled"] = True
+        if "value_counts" in col_stats:
+            col_stats["value_counts"] = {
+                value: round(count * scale)
+                for value, count in col_stats["value_counts"].items()
+            }
+    stats["n_rows"] = counts["n_rows"]
+    return stats, estimate
+
+
+def summarize_state(
+    state,
+    *,
+    order_by=None,
+    with_plots=False,
+    title=None,
+    n_jobs=None,
+    max_associations=MAX_ASSOCIATIONS,
+    association_threshold=ASSOCIATION_THRESHOLD,
+    plot_backend=_plotting.DEFAULT_PLOT_BACKEND,
+    profile=False,
+):
+    """Build the summary of the data described by a ``_state.SummaryState``.
+
+    Only the state is used: the statistics come from its sketches, and the
+    associations between columns and the plots from its sample, which also
+    stands for the dataframe in the summary. The parameters are those of
+    ``summarize_dataframe``.
+    """
+    return _summarize_state(
+        state,
+        order_by=order_by,
+        with_plots=with_plots,
+        title=title,
+        n_jobs=n_jobs,
+        max_associations=max_associations,
+        association_threshold=association_threshold,
+        plot_backend=plot_backend,
+        profile=_profile.new_profile() if profile else None,
+    )
+
+
+def _summarize_state(
+    state,
+    *,
+    order_by,
+    with_plots,
+    title,
+    n_jobs,
+    max_associations,
+    association_threshold,
+    plot_backend,
+    profile,
 ):
-    shape = sbd.shape(df)
+    # profile is the profile dict, or None
+    sample = state.sample
+    summary = _make_summary(
+        sample,
+        state.statistics(),
+        head=state.head,
+        tail=state.tail,
+        sample=sample,
+        order_by=order_by,
+        title=title,
+        n_jobs=n_jobs,
+        max_associations=max_associations,
+        association_threshold=association_threshold,
+        profile=profile,
+    )
+    if with_plots:
+        return add_plots(summary, n_jobs=n_jobs, plot_backend=plot_backend)
+    return summary
+
+
+def summarize_batches(
+    batches,
+    *,
+    order_by=None,
+    with_plots=False,
+    title=None,
+    n_jobs=None,
+    max_associations=MAX_ASSOCIATIONS,
+    association_threshold=ASSOCIATION_THRESHOLD,
+    sample_size=SAMPLE_SIZE,
+    random_state=0,
+    plot_backend=_plotting.DEFAULT_PLOT_BACKEND,
+    profile=False,
+):
+    """Summarize data given as an iterable of dataframes, in a single pass.
+
+    Each batch updates a ``_state.SummaryState`` (statistics, head, tail and
+    reservoir sample) and is then dropped, so memory is bounded by the size
+    of a batch, whatever the number of batches. ``batches`` must yield at
+    least one, possibly empty, dataframe; they all have the same columns.
+    The other parameters are those of ``summarize_dataframe``.
+    """
+    profile = _profile.new_profile() if profile else None
+    state = None
+    # reading the batches is part of this stage
+    with _profile.stage(profile, "state"):
+        for batch in batches:
+            if state is None:
+                state = _state.SummaryState(batch, sample_size, random_state)
+            state.update(batch, n_jobs=n_jobs)
+    return _summarize_state(
+        state,
+        order_by=order_by,
+        with_plots=with_plots,
+        title=title,
+        n_jobs=n_jobs,
+        max_associations=max_associations,
+        association_threshold=association_threshold,
+        plot_backend=plot_backend,
+        profile=profile,
+    )
+
+
+def summarize_partitions(
+    partitions,
+    names=None,
+    *,
+    order_by=None,
+    with_plots=False,
+    title=None,
+    n_jobs=None,
+    max_associations=MAX_ASSOCIATIONS,
+    association_threshold=ASSOCIATION_THRESHOLD,
+    sample_size=SAMPLE_SIZE,
+    random_state=0,
+    plot_backend=_plotting.DEFAULT_PLOT_BACKEND,
+    profile=False,
+):
+    """Summarize a dataset made of several dataframes with the same columns.
+
+    The ``_state.SummaryState`` of each partition (for example each file of a
+    partitioned dataset) is computed in parallel, with ``n_jobs`` threads,
+    and the states are merged, in order, into the summary of the whole
+    dataset. The summary also has a ``partitions`` list with the ``name``,
+    number of rows and null counts (per column and in total) of each
+    partition. The other parameters are those of ``summarize_dataframe``.
+    """
+    if names is None:
+        names = [str(i) for i in range(len(partitions))]
+    profile = _profile.new_profile() if profile else None
+    # each partition's reservoir needs its own seed, see _state.summary_state
+    seeds = np.random.default_rng(random_state).integers(
+        2**32, size=len(partitions)
+    )
+    with _profile.stage(profile, "state"):
+        states = _utils.parallel_map(
+            lambda i: _state.summary_state(
+                partitions[i], sample_size=sample_size, random_state=seeds[i]
+            ),
+            range(len(partitions)),
+            n_jobs=n_jobs,
+        )
+    breakdown = [
+        {
+            "name": name,
+            "n_rows": state.n_rows,
+            "null_counts": [int(c.null_count) for c in state.columns],
+            "null_count": int(sum(c.null_count for c in state.columns)),
+        }
+        for name, state in zip(names, states)
+    ]
+    with _profile.stage(profile, "merge_states"):
+        merged = states[0]
+        for state in states[1:]:
+            merged.merge(state)
+    summary = _summarize_state(
+        merged,
+        order_by=order_by,
+        with_plots=False,
+        title=title,
+        n_jobs=n_jobs,
+        max_associations=max_associations,
+        association_threshold=association_threshold,
+        plot_backend=plot_backend,
+        profile=profile,
+    )
+    summary["partitions"] = breakdown
+    if with_plots:
+        return add_plots(summary, n_jobs=n_jobs, plot_backend=plot_backend)
+    return summary
+
+
+def _make_summary(
+    df,
+    stats,
+    *,
+    head,
+    tail,
+    sample,
+    order_by,
+    title,
+    n_jobs,
+    max_associations,
+    association_threshold,
+    profile,
+    associations_deadline=None,
+):
+    # the statistics of all columns are known: this adds the derived values
+    # (proportions, constant columns...) and the associations between columns
     summary = {
         "dataframe": df,
         "dataframe_module": sbd.dataframe_module_name(df),
-        "n_rows": int(shape[0]),
-        "n_columns": int(shape[1]),
+        "n_rows": int(stats["n_rows"]),
+        "n_columns": int(sbd.shape(head)[1]),
         "columns": [],
-        "head": _utils.to_row_list(_utils.slice(df, 5)),
-        "tail": _utils.to_row_list(_utils.slice(df, -5, None)),
-        "first_row_dict": _utils.first_row_dict(df),
+        "head": _utils.to_row_list(head),
+        "tail": _utils.to_row_list(tail),
+        "first_row_dict": _utils.first_row_dict(head),
     }
     if title is not None:
         summary["title"] = title
+    if profile is not None:
+        summary["profile"] = profile
+    summary["sample"] = sample
+    # plots need the column values, which we only have for the sample when
+    # the dataframe is lazy.
     if order_by is not None:
-        df = _utils.sort(df, by=order_by)
         summary["order_by"] = order_by
-    for position, column_name in enumerate(sbd.column_names(df)):
-        summary["columns"].append(
-            _summarize_column(
-                sbd.col(df, column_name),
+    schema_df = _utils.slice(head, 0, 0)
+    column_names = sbd.column_names(schema_df)
+
+    def summarize_column(position):
+        name = column_names[position]
+        with _profile.column_stage(profile, name, "summarize_column"):
+            return _summarize_column(
+                sbd.col(schema_df, name),
                 position,
+                stats["columns"][position],
                 dataframe_summary=summary,
-                with_plots=with_plots,
-                order_by_column=None if order_by is None else sbd.col(df, order_by),
             )
+
+    with _profile.stage(profile, "columns"):
+        summary["columns"] = _utils.parallel_map(
+            summarize_column, range(summary["n_columns"]), n_jobs=n_jobs
         )
     summary["n_constant_columns"] = sum(
         c["value_is_constant"] for c in summary["columns"]
     )
-    _add_interactions(df, summary)
+    with _profile.stage(profile, "interactions"):
+        _add_interactions(
+            sample,
+            summary,
+            k=max_associations,
+            threshold=association_threshold,
+            deadline=associations_deadline,
+        )
     return summary
 
 
-def _add_interactions(df, dataframe_summary):
-    df = sbd.sample(df, n=min(sbd.shape(df)[0], _SUBSAMPLE_SIZE))
-    associations = _interactions.stack_symmetric_associations(
-        _interactions.cramer_v(df),
-        df.columns,
-    )[:20]
+def add_plots(summary, n_jobs=None, plot_backend=_plotting.DEFAULT_PLOT_BACKEND):
+    """Add the plots to a copy of a summary computed without plots.
+
+    The statistics are not recomputed: only the column values needed to draw
+    the plots are read, from the dataframe or (if it is lazy) the sample.
+    Plots are stored in the column summaries as SVG strings and listed in
+    their ``plot_names``; ``summary`` itself is left unchanged. ``plot_backend``
+    is "svg" (native SVG) or "matplotlib". Summaries with
+    ``plots_are_sampled`` (see ``summarize_dataframe``'s ``time_budget``)
+    are also plotted from the sample.
+
+    The data of all plots (bins, counts, downsampled lines) is computed
+    first, and only this data is passed to the backend, possibly in other
+    processes (see ``_plotting.draw_all``). If the summary has a
+    ``profile``, both stages are added to it.
+    """
+    profile = summary.get("profile")
+    df = summary["dataframe"]
+    if sbd.is_lazyframe(df) or summary.get("plots_are_sampled", False):
+        plotted_df = summary["sample"]
+    else:
+        plotted_df = df
+    order_by = summary.get("order_by")
+    order_by_column = None
+    if order_by is not None:
+        plotted_df = _utils.sort(plotted_df, by=order_by)
+        order_by_column = sbd.col(plotted_df, order_by)
+    column_names = sbd.column_names(plotted_df)
+
+    def plot_data(column_summary):
+        name = column_names[column_summary["position"]]
+        with _profile.column_stage(profile, name, "plot_data"):
+            return _plot_data(
+                column_summary,
+                sbd.col(plotted_df, name),
+                n_rows=summary["n_rows"],
+                order_by_column=order_by_column,
+            )
+
+    with _profile.stage(profile, "plot_data"):
+        plots = [
+            (position, plot_name, plot)
+            for position, column_plots in enumerate(
+                _utils.parallel_map(plot_data, summary["columns"], n_jobs=n_jobs)
+            )
+            for plot_name, plot in column_plots.items()
+        ]
+    with _profile.stage(profile, f"draw_plots ({plot_backend})"):
+        svgs = _plotting.draw_all(
+            [plot for _, _, plot in plots], backend=plot_backend, n_jobs=n_jobs
+        )
+    columns = [dict(c, plot_names=[]) for c in summary["columns"]]
+    for (position, plot_name, _), svg in zip(plots, svgs):
+        columns[position][plot_name] = svg
+        columns[position]["plot_names"].append(plot_name)
+    return dict(summary, columns=columns)
+
+
+def _plot_data(summary, column, n_rows, order_by_column):
+    # the plots depend on what the statistics stage found: numeric columns
+    # have quantiles, datetime columns a min and max and others value counts
+    if summary["value_is_constant"]:
+        return {}
+    if "quantiles" in summary:
+        if order_by_column is None:
+            return {
+                "histogram_plot": _plotting.histogram_data(
+                    column, title=None, color=_plotting.COLORS[0]
+                )
+            }
+        return {"line_plot": _plotting.line_data(order_by_column, column)}
+    if "min" in summary:
+        return {
+            "histogram_plot": _plotting.histogram_data(
+                column, None, color=_plotting.COLORS[0]
+            )
+        }
+    # approximate value counts are empty if no value stands out
+    if summary.get("value_counts"):
+        return {
+            "value_counts_plot": _plotting.value_counts_data(
+                summary["value_counts"],
+                summary["n_unique"],
+                n_rows,
+                color=_plotting.COLORS[1],
+            )
+        }
+    return {}
+
+
+def _may_exceed(df, file_statistics, n_unique):
+    if sbd.is_lazyframe(df):
+        if file_statistics is None:
+            return True
+        n_rows = file_statistics["n_rows"]
+    else:
+        n_rows = sbd.shape(df)[0]
+    return n_rows > n_unique
+
+
+def _add_interactions(sample, dataframe_summary, k, threshold, deadline=None):
+    associations, searched = _interactions.top_associations_until(
+        sample, deadline, k=k, threshold=threshold
+    )
     dataframe_summary["top_associations"] = [
         dict(zip(("left_column", "right_column", "cramer_v"), a))
         for a in associations
-        if a[2] > _ASSOCIATION_THRESHOLD
     ]
+    if searched < 1.0:
+        dataframe_summary["associations_are_partial"] = True
+        dataframe_summary["associations_searched_fraction"] = searched
 
 
-def _summarize_column(
-    column, position, dataframe_summary, *, with_plots, order_by_column
-):
+def _summarize_column(column, position, stats, dataframe_summary):
     summary = {
         "position": position,
         "name": sbd.name(column),
         "dtype": _utils.get_dtype_name(column),
         "value_is_constant": False,
     }
-    _add_nulls_summary(summary, column, dataframe_summary=dataframe_summary)
+    if stats.get("sampled", False):
+        summary["statistics_are_sampled"] = True
+    _add_nulls_summary(summary, stats, dataframe_summary=dataframe_summary)
     _add_value_counts(
-        summary, column, dataframe_summary=dataframe_summary, with_plots=with_plots
+        summary,
+        column,
+        stats,
+        dataframe_summary=dataframe_summary,
     )
     _add_numeric_summary(
         summary,
         column,
+        stats,
         dataframe_summary=dataframe_summary,
-        with_plots=with_plots,
-        order_by_column=order_by_column,
     )
-    _add_datetime_summary(summary, column, with_plots=with_plots)
-    summary["plot_names"] = [k for k in summary.keys() if k.endswith("_plot")]
+    _add_datetime_summary(summary, column, stats)
+    summary["plot_names"] = []
     return summary
 
 
-def _add_nulls_summary(summary, column, dataframe_summary):
-    null_count = _utils.sum(sbd.is_null(column))
+def _add_nulls_summary(summary, stats, dataframe_summary):
+    null_count = stats["null_count"]
     summary["null_count"] = null_count
     null_proportion = null_count / dataframe_summary["n_rows"]
     summary["null_proportion"] = null_proportion
@@ -94,18 +702,21 @@ def _add_nulls_summary(summary, column, dataframe_summary):
         summary["nulls_level"] = "warning"
 
 
-def _add_value_counts(summary, column, *, dataframe_summary, with_plots):
+def _add_value_counts(summary, column, stats, *, dataframe_summary):
     if sbd.is_numeric(column) or sbd.is_any_date(column):
         summary["high_cardinality"] = True
         return
-    n_unique, value_counts = _utils.top_k_value_counts(
-        sbd.filter(column, ~sbd.is_null(column)),
-        k=10
-    )
+    n_unique, value_counts = stats["n_unique"], stats["value_counts"]
     summary["n_unique"] = n_unique
     summary["unique_proportion"] = n_unique / dataframe_summary["n_rows"]
     summary["high_cardinality"] = n_unique >= _HIGH_CARDINALITY_THRESHOLD
     summary["value_counts"] = value_counts
+    if "n_unique_relative_error" in stats:
+        summary["n_unique_is_approximate"] = True
+        summary["n_unique_relative_error"] = stats["n_unique_relative_error"]
+    if "value_counts_max_error" in stats:
+        summary["value_counts_are_approximate"] = True
+        summary["value_counts_max_error"] = stats["value_counts_max_error"]
     if n_unique == 0:
         return
     if n_unique == 1:
@@ -113,17 +724,17 @@ def _add_value_counts(summary, column, *, dataframe_summary, with_plots):
         summary["constant_value"] = next(iter(value_counts.keys()))
     else:
         summary["value_is_constant"] = False
-        if with_plots:
-            summary["value_counts_plot"] = _plotting.value_counts(
-                value_counts, n_unique, dataframe_summary["n_rows"], color=_plotting.COLORS[1]
-            )
 
 
-def _add_datetime_summary(summary, column, with_plots):
+def _add_datetime_summary(summary, column, stats):
     if not sbd.is_any_date(column):
         return
-    min_date = _utils.min(column)
-    max_date = _utils.max(column)
+    min_date = stats.get("min")
+    max_date = stats.get("max")
+    # all values are null: no minimum (or NaT, which is not equal to itself)
+    if min_date is None or min_date != min_date:
+        summary["value_is_constant"] = False
+        return
     if min_date == max_date:
         summary["value_is_constant"] = True
         summary["constant_value"] = min_date.isoformat()
@@ -131,24 +742,26 @@ def _add_datetime_summary(summary, column, with_plots):
     summary["value_is_constant"] = False
     summary["min"] = min_date.isoformat()
     summary["max"] = max_date.isoformat()
-    if with_plots:
-        summary["histogram_plot"] = _plotting.histogram(
-            column, None, color=_plotting.COLORS[0]
-        )
 
 
-def _add_numeric_summary(
-    summary, column, dataframe_summary, with_plots, order_by_column
-):
+def _add_numeric_summary(summary, column, stats, dataframe_summary):
     del dataframe_summary
     if not sbd.is_numeric(column):
         return
     if not summary["high_cardinality"]:
         return
-    std = _utils.std(column)
+    std, mean = stats["std"], stats["mean"]
     summary["standard_deviation"] = float("nan") if std is None else float(std)
-    summary["mean"] = float(_utils.mean(column))
-    quantiles = _utils.quantiles(column)
+    summary["mean"] = float("nan") if mean is None else float(mean)
+    # all values are null (in the sample, for sampled statistics): as for
+    # pandas' all-NaN columns, the mean and standard deviation are NaN and
+    # there are no quantiles
+    if mean is None:
+        return
+    quantiles = stats["quantiles"]
+    # the sketch of an all-NaN column is empty: it has no quantiles
+    if quantiles[0.5] is None:
+        return
     summary["inter_quartile_range"] = quantiles[0.75] - quantiles[0.25]
     if quantiles[0.0] == quantiles[1.0]:
         summary["value_is_constant"] = True
@@ -156,11 +769,6 @@ def _add_numeric_summary(
         return
     summary["value_is_constant"] = False
     summary["quantiles"] = quantiles
-    if not with_plots:
-        return
-    if order_by_column is None:
-        summary["histogram_plot"] = _plotting.histogram(
-            column, title=None, color=_plotting.COLORS[0]
-        )
-    else:
-        summary["line_plot"] = _plotting.line(order_by_column, column)
+    if "quantiles_rank_error" in stats:
+        summary["quantiles_are_approximate"] = True
+        summary["quantiles_rank_error"] = stats["quantiles_rank_error"]
@@ -0,0 +1,296 @@
+"""Draw the plots directly as small SVG documents.
+
+This is the default plot backend. It only needs the data computed by
+``_plotting`` (histogram bins and counts, line points, most frequent values)
+and writes the shapes and ``<text>`` labels itself, which is much faster and
+gives much smaller documents than drawing a matplotlib figure. Sizes are in
+px; the text width is estimated from the number of characters.
+"""
+
+import html
+
+import numpy as np
+
+_FONT_SIZE = 9
+_SMALL_FONT_SIZE = 8
+# approximate width of a character at _FONT_SIZE
+_CHAR_WIDTH = 5.5
+_TICK_LENGTH = 3
+_MAX_TICKS = 5
+# size of the plotting area, the equivalent of the 2 x 1 inches axes of the
+# matplotlib backend
+_PLOT_WIDTH = 150
+_PLOT_HEIGHT = 75
+_BAR_HEIGHT = 12
+_ROW_HEIGHT = 16
+_BAR_MAX_WIDTH = 120
+_AXIS_STYLE = 'fill="none" stroke="#000" stroke-width=".8"'
+
+
+def histogram(counts, edges, is_datetime=False, title=None, color="#4878d0"):
+    x_ticks, x_labels = _ticks(edges[0], edges[-1], is_datetime)
+    y_ticks, y_labels = _numeric_ticks(0, max(counts.max(), 1), integer=True)
+    frame = _Frame(
+        (edges[0], edges[-1]), (0, max(counts.max(), 1)), x_labels, y_labels, title
+    )
+    bars = "".join(
+        _rect(
+            frame.x(left),
+            frame.y(count),
+            frame.x(right) - frame.x(left),
+            frame.y(0) - frame.y(count),
+        )
+        for left, right, count in zip(edges[:-1], edges[1:], counts)
+        if count
+    )
+    return frame.document(
+        f'<g fill="{color}">{bars}</g>', x_ticks, x_labels, y_ticks, y_labels
+    )
+
+
+def line(x, y, x_label=None, x_is_datetime=False, color="#4878d0"):
+    x_range, y_range = _data_range(x), _data_range(y)
+    x_ticks, x_labels = _ticks(*x_range, x_is_datetime)
+    y_ticks, y_labels = _numeric_ticks(*y_range)
+    frame = _Frame(x_range, y_range, x_labels, y_labels, x_label=x_label)
+    # missing and infinite values break the line: the next point starts a
+    # new segment (the axes' ranges ignore them too)
+    is_present = np.isfinite(x) & np.isfinite(y)
+    starts_segment = is_present & ~np.concatenate([[False], is_present[:-1]])
+    commands = np.where(starts_segment, "M", "L")[is_present]
+    px = np.round(frame.x(x[is_present]), 1)
+    py = np.round(frame.y(y[is_present]), 1)
+    path = "".join(
+        f"{c}{a:g},{b:g}" for c, a, b in zip(commands, px.tolist(), py.tolist())
+    )
+    line_path = (
+        f'<path d="{path}" fill="none" stroke="{color}" '
+        'stroke-width="1.2" stroke-linejoin="round"/>'
+    )
+    return frame.document(line_path, x_ticks, x_labels, y_ticks, y_labels)
+
+
+def value_counts(labels, counts, percents, title=None, color="#ee854a"):
+    """Horizontal bars, the most frequent value (the first one) at the top."""
+    label_width = _text_width(labels) + 2 * _TICK_LENGTH
+    top = 4 + (_FONT_SIZE + 8 if title is not None else 0)
+    width = label_width + _BAR_MAX_WIDTH + 8 * _CHAR_WIDTH
+    height = top + _ROW_HEIGHT * len(counts) + 4
+    max_count = max(max(counts), 1)
+    elements = []
+    if title is not None:
+        elements.append(_text(width / 2, top - 6, title, anchor="middle"))
+    bars, texts = [], []
+    for i, (label, count, percent) in enumerate(zip(labels, counts, percents)):
+        row_center = top + (i + 0.5) * _ROW_HEIGHT
+        bar_width = count / max_count * _BAR_MAX_WIDTH
+        bars.append(
+            _rect(label_width, row_center - _BAR_HEIGHT / 2, bar_width, _BAR_HEIGHT)
+        )
+        texts.append(_text(label_width - 2 * _TICK_LENGTH, row_center, label))
+        # the percentage goes inside the bar if it is large enough
+        if count > max_count / 2:
+            texts.append(
+                _text(label_width + bar_width - 3, row_center, percent, small=True)
+            )
+        else:
+            texts.append(
+                _text(
+                    label_width + bar_width + 3,
+                    row_center,
+                    percent,
+                    anchor="start",
+                    small=True,
+                )
+            )
+    elements.append(f'<g fill="{color}">{"".join(bars)}</g>')
+    elements.append(
+        f'<path d="M{_num(label_width)},{top}V{top + _ROW_HEIGHT * len(counts)}" '
+        f"{_AXIS_STYLE}/>"
+    )
+    elements.extend(texts)
+    return _document(width, height, elements)
+
+
+class _Frame:
+    """Margins and coordinates of a plot with x and y axes."""
+
+    def __init__(
+        self, x_range, y_range, x_labels, y_labels, title=None, x_label=None
+    ):
+        self.x_range, self.y_range = x_range, y_range
+        self.title, self.x_label = title, x_label
+        # like matplotlib's backend, rotate the x labels if they are long
+        self.rotate_x_labels = any(len(label) > 5 for label in x_labels)
+        self.left = _text_width(y_labels) + 2 * _TICK_LENGTH + 2
+        self.top = 6 + (_FONT_SIZE + 6 if title is not None else 0)
+        self.right = self.left + _PLOT_WIDTH
+        self.bottom = self.top + _PLOT_HEIGHT
+        if self.rotate_x_labels:
+            x_labels_height = _text_width(x_labels) * 0.71 + _FONT_SIZE
+            right_margin = 8
+        else:
+            x_labels_height = _FONT_SIZE + 2
+            right_margin = max(8, _text_width(x_labels[-1:]) / 2)
+        self.x_label_y = self.bottom + _TICK_LENGTH + 2 + x_labels_height + 2
+        self.width = self.right + right_margin
+        self.height = self.x_label_y + (_FONT_SIZE + 4 if x_label is not None else 0)
+
+    def x(self, value):
+        low, high = self.x_range
+        return self.left + (value - low) / (high - low) * _PLOT_WIDTH
+
+    def y(self, value):
+        low, high = self.y_range
+        return self.bottom - (value - low) / (high - low) * _PLOT_HEIGHT
+
+    def document(self, content, x_ticks, x_labels, y_ticks, y_labels):
+        elements = [content]
+        ticks = [f"M{_num(self.x(t))},{self.bottom}v{_TICK_LENGTH}" for t in x_ticks]
+        ticks += [
+            f"M{self.left},{_num(self.y(t))}h-{_TICK_LENGTH}" for t in y_ticks
+        ]
+        elements.append(
+            f'<path d="M{self.left},{self.top}V{self.bottom}H{self.right}'
+            f'{"".join(ticks)}" {_AXIS_STYLE}/>'
+        )
+        label_y = self.bottom + _TICK_LENGTH + 2 + _FONT_SIZE / 2
+        for tick, label in zip(x_ticks, x_labels):
+            if self.rotate_x_labels:
+                elements.append(_text(self.x(tick), label_y, label, rotate=-45))
+            else:
+                elements.append(_text(self.x(tick), label_y, label, anchor="middle"))
+        for tick, label in zip(y_ticks, y_labels):
+            elements.append(_text(self.left - _TICK_LENGTH - 2, self.y(tick), label))
+        if self.title is not None:
+            elements.append(
+                _text(
+                    (self.left + self.right) / 2,
+                    self.top - 10,
+                    self.title,
+                    anchor="middle",
+                )
+            )
+        if self.x_label is not None:
+            elements.append(
+                _text(
+                    (self.left + self.right) / 2,
+                    self.x_label_y + _FONT_SIZE / 2,
+                    self.x_label,
+                    anchor="middle",
+                )
+            )
+        return _document(self.width, self.height, elements)
+
+
+def _document(width, height, elements):
+    width, height = _num(np.ceil(width)), _num(np.ceil(height))
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}" font-family="sans-serif" '
+        f'font-size="{_FONT_SIZE}">{"".join(elements)}</svg>'
+    )
+
+
+def _num(value):
+    # compact coordinates: 0.1 px precision, without trailing zeros
+    return f"{value:.1f}".rstrip("0").rstrip(".")
+
+
+def _rect(x, y, width, height):
+    return (
+        f'<rect x="{_num(x)}" y="{_num(y)}" width="{_num(width)}" '
+        f'height="{_num(height)}"/>'
+    )
+
+
+def _text(x, y, content, anchor="end", rotate=None, small=False):
+    attributes = f'x="{_num(x)}" y="{_num(y)}" dy=".35em"'
+    if anchor != "start":
+        attributes += f' text-anchor="{anchor}"'
+    if rotate is not None:
+        attributes += f' transform="rotate({rotate} {_num(x)} {_num(y)})"'
+    if small:
+        attributes += f' font-size="{_SMALL_FONT_SIZE}"'
+    return f"<text {attributes}>{html.escape(str(content))}</text>"
+
+
+def _text_width(labels):
+    return max((len(label) for label in labels), default=0) * _CHAR_WIDTH
+
+
+def _data_range(values):
+    finite = values[np.isfinite(values)]
+    if not len(finite):
+        return 0.0, 1.0
+    low, high = finite.min(), finite.max()
+    if low == high:
+        return low - 0.5, high + 0.5
+    return low, high
+
+
+def _ticks(low, high, is_datetime):
+    if is_datetime:
+        return _datetime_ticks(low, high)
+    return _numeric_ticks(low, high)
+
+
+def _numeric_ticks(low, high, max_ticks=_MAX_TICKS, integer=False):
+    # multiples of 1, 2, 2.5 or 5 times a power of 10, as matplotlib does
+    span = high - low
+    magnitude = 10 ** np.floor(np.log10(span / max_ticks))
+    for multiple in (1, 2, 2.5, 5, 10):
+        step = multiple * magnitude
+        if integer and step % 1:
+            continue
+        if span / step <= max_ticks:
+            break
+    ticks = np.arange(np.ceil(low / step - 1e-9), np.floor(high / step + 1e-9) + 1)
+    ticks = ticks * step
+    decimals = len(f"{step:.10f}".rstrip("0").split(".")[1])
+    return ticks, [_format_tick(t, step, decimals) for t in ticks]
+
+
+def _format_tick(value, step, decimals):
+    if abs(value) < step * 1e-9:
+        return "0"
+    if abs(value) >= 1e6 or decimals > 4:
+        return f"{value:.3g}"
+    return f"{value:.{decimals}f}"
+
+
+# steps between datetime ticks, as (count, numpy datetime unit)
+_TIME_STEPS = [
+    (1, "s"), (10, "s"), (30, "s"),
+    (1, "m"), (10, "m"), (30, "m"),
+    (1, "h"), (3, "h"), (6, "h"), (12, "h"),
+    (1, "D"), (2, "D"), (7, "D"), (14, "D"),
+    (1, "M"), (2, "M"), (3, "M"), (6, "M"),
+    (1, "Y"), (2, "Y"), (5, "Y"), (10, "Y"), (20, "Y"), (50, "Y"), (100, "Y"),
+]
+_LABEL_UNITS = {"s": "s", "m": "m", "h": "m", "D": "D", "M": "M", "Y": "Y"}
+
+
+def _datetime_ticks(low, high, max_ticks=_MAX_TICKS):
+    # low and high are nanoseconds since the epoch. Ticks fall on round
+    # dates: multiples of the step in its unit (so months and years start on
+    # the 1st of the month or of January).
+    low = np.datetime64(int(np.ceil(low)), "ns")
+    high = np.datetime64(int(np.floor(high)), "ns")
+    for count, unit in _TIME_STEPS:
+        start = low.astype(f"datetime64[{unit}]").astype(np.int64) // count
+        stop = high.astype(f"datetime64[{unit}]").astype(np.int64) // count
+        if stop - start + 1 <= max_ticks:
+            break
+    ticks = (np.arange(start, stop + 1) * count).astype(f"datetime64[{unit}]")
+    ticks = ticks.astype("datetime64[ns]")
+    ticks = ticks[(ticks >= low) & (ticks <= high)]
+    labels = np.datetime_as_string(ticks, unit=_LABEL_UNITS[unit])
+    if _LABEL_UNITS[unit] in ("m", "s") and len(
+        set(ticks.astype("datetime64[D]").tolist())
+    ) == 1:
+        # all on the same day: show only the time
+        labels = [label.split("T")[1] for label in labels]
+    else:
+        labels = [label.replace("T", " ") for label in labels]
+    return ticks.astype(np.int64).astype(float), list(labels)
@@ -2,7 +2,7 @@ from rich.console import Group, Console
 from rich.panel import Panel
 from rich.table import Table
 
-from . import _utils
+from . import _profile, _utils
 
 
 _COLORS = {"ok": "green", "warning": "yellow", "critical": "red"}
@@ -19,8 +19,9 @@ def to_text(summary):
     #
     # also capture lets rich decide whether to include codes or not
     console = Console()
-    with console.capture() as capture:
-        _print_summary(summary, console)
+    with _profile.stage(summary.get("profile"), "text"):
+        with console.capture() as capture:
+            _print_summary(summary, console)
     return capture.get()
 
 
@@ -33,7 +34,12 @@ def _print_summary(summary, console):
     )
     if "file_path" in summary:
         overview += f"\nFile: {summary['file_path']}"
+    if "partitions" in summary:
+        overview += f"\nDataset of [blue]{len(summary['partitions'])} files[/blue]."
     console.print(overview)
+    if "partitions" in summary:
+        console.print(_prepare_partitions_table(summary["partitions"]))
+    _print_time_budget(summary, console)
     _print_first_row(summary, console)
     _print_constant_columns(summary, console)
     for column in summary["columns"]:
@@ -41,6 +47,31 @@ def _print_summary(summary, console):
     console.print(overview)
 
 
+def _print_time_budget(summary, console):
+    notes = []
+    if summary.get("statistics_are_sampled", False):
+        notes.append(
+            "statistics other than the numbers of rows and null values were "
+            f"estimated from a random sample of {summary['n_sampled_rows']} rows "
+            "(marked with ≈)"
+        )
+    if summary.get("plots_are_sampled", False):
+        notes.append("plots were drawn from the random sample")
+    if summary.get("associations_are_partial", False):
+        notes.append(
+            "the search for associations between columns covered "
+            f"{summary['associations_searched_fraction']:0.0%} of the pairs of columns"
+        )
+    if not notes:
+        return
+    console.print(
+        f"[yellow]To fit in a time budget of {summary['time_budget']} s, parts of "
+        "this report were not computed on all rows:[/yellow]"
+    )
+    for note in notes:
+        console.print(f"  - {note}")
+
+
 def _print_first_row(summary, console):
     console.print("First row:")
     console.print(
@@ -78,22 +109,37 @@ def _print_column_summary(summary, console):
         f"[{color}]{summary['null_count']} "
         f"({summary['null_proportion']:0.2%})[/{color}]\n"
     )
-    if "n_unique" in summary:
-        text.append(f"Unique values: {summary['n_unique']}\n")
+    # statistics estimated from a sample have no error bound
+    sampled = "≈ " if summary.get("statistics_are_sampled", False) else ""
+    if summary.get("n_unique_is_approximate", False):
+        text.append(
+            f"Unique values: ≈ {summary['n_unique']} "
+            f"(relative error {summary['n_unique_relative_error']:0.1%})\n"
+        )
+    elif "n_unique" in summary:
+        text.append(f"Unique values: {sampled}{summary['n_unique']}\n")
     if "value_counts" in summary:
-        text.append(f"Most frequent value counts:\n")
+        if summary.get("value_counts_are_approximate", False):
+            text.append(
+                "Most frequent value counts (≈, may be underestimated by up to "
+                f"{summary['value_counts_max_error']}):\n"
+            )
+        elif sampled:
+            text.append("Most frequent value counts (≈):\n")
+        else:
+            text.append("Most frequent value counts:\n")
         width = console.size[0] - 12
         for k, v in summary["value_counts"].items():
             text.append(f"    {_utils.ellide_string(k, width)!r}: {v}\n")
     if "mean" in summary:
         text.append(
-            f"Mean: {summary['mean']:#0.3g} "
-            f"Standard deviation: {summary['standard_deviation']:#0.3g}\n"
+            f"Mean: {sampled}{summary['mean']:#0.3g} "
+            f"Standard deviation: {sampled}{summary['standard_deviation']:#0.3g}\n"
         )
     if "min" in summary:
         text.append(
-            f"Min: {_utils.format_number(summary['min'])} "
-            f"Max: {_utils.format_number(summary['max'])}\n"
+            f"Min: {sampled}{_utils.format_number(summary['min'])} "
+            f"Max: {sampled}{_utils.format_number(summary['max'])}\n"
         )
     if summary.get("string_length_is_constant", False):
         text.append(
@@ -106,11 +152,14 @@ def _print_column_summary(summary, console):
         quantiles_to_display.append("string_length_quantiles")
     for quantiles_name in quantiles_to_display:
         if quantiles_name in summary:
+            table_name = quantiles_name.capitalize().replace("_", " ")
+            if summary.get(f"{quantiles_name}_are_approximate", False):
+                error = summary[f"{quantiles_name}_rank_error"]
+                table_name = f"≈ {table_name} (rank error ≤ {error:0.2%})"
+            elif sampled:
+                table_name = f"≈ {table_name}"
             content.append(
-                _prepare_quantiles_table(
-                    summary[quantiles_name],
-                    quantiles_name.capitalize().replace("_", " "),
-                )
+                _prepare_quantiles_table(summary[quantiles_name], table_name)
             )
 
     panel = Panel(
@@ -122,6 +171,18 @@ def _print_column_summary(summary, console):
     console.print(panel)
 
 
+def _prepare_partitions_table(partitions):
+    table = Table(title="Files", title_style="bold")
+    table.add_column("File")
+    table.add_column("Rows", justify="right")
+    table.add_column("Null values", justify="right")
+    for partition in partitions:
+        table.add_row(
+            partition["name"], str(partition["n_rows"]), str(partition["null_count"])
+        )
+    return table
+
+
 def _prepare_quantiles_table(quantiles, name):
     table = Table(title=name, title_style="bold")
     for q in quantiles:
@@ -1,5 +1,8 @@
 import base64
 import builtins
+import glob
+from concurrent.futures import ThreadPoolExecutor
+import os
 from pathlib import Path
 import json
 
@@ -10,21 +13,293 @@ from skrub import _dataframe as sbd
 from skrub._dispatch import dispatch
 
 
+_DATA_SUFFIXES = (".parquet", ".csv")
+_IPC_SUFFIXES = (".arrow", ".feather", ".ipc")
+CSV_BLOCK_SIZE = 8 * 2**20
+
+
 def read(file_path):
+    # with polars the file is scanned lazily: only the aggregates and the few
+    # rows shown in the report are ever collected.
     try:
-        from polars import read_csv, read_parquet
+        from polars import scan_csv as read_csv, scan_parquet as read_parquet
     except ImportError:
         from pandas import read_csv, read_parquet
     if file_path is not None:
         file_path = Path(file_path)
+    if is_dataset(file_path):
+        files = list_files(file_path)
+        if files[0].suffix == ".parquet":
+            # for a directory, hive-style partitions ("year=2024/") become
+            # columns
+            return read_parquet(file_path if file_path.is_dir() else str(file_path))
+        return read_csv(files)
     suffix = file_path.suffix
     if suffix == ".parquet":
         return read_parquet(file_path)
     if suffix == ".csv":
         return read_csv(file_path)
+    if suffix in _IPC_SUFFIXES:
+        return read_ipc(file_path)
     raise ValueError(f"Cannot process file extension: {suffix}")
 
 
+def read_ipc(file_path):
+    """Memory-map an Arrow IPC file (also known as Feather v2).
+
+    The columns of the returned DataFrame point into the mapped file rather
+    than being copied, so the data is read from the page cache, which is
+    shared by all processes that open the same file. This only holds for
+    uncompressed files: compressed record batches are decompressed in
+    memory. Files in the IPC streaming format are accepted too.
+    """
+    import pyarrow as pa
+
+    source = pa.memory_map(str(file_path))
+    try:
+        table = pa.ipc.open_file(source).read_all()
+    except pa.ArrowInvalid:
+        source.seek(0)
+        table = pa.ipc.open_stream(source).read_all()
+    try:
+        import polars as pl
+    except ImportError:
+        return table.to_pandas()
+    return pl.from_arrow(table, rechunk=False)
+
+
+def is_dataset(path):
+    """Whether ``path`` is a directory or a glob pattern rather than a file."""
+    return Path(path).is_dir() or any(c in str(path) for c in "*?[")
+
+
+def list_files(path):
+    """The data files of a dataset, sorted by path.
+
+    ``path`` is a directory, searched recursively, or a glob pattern (``**``
+    matches any number of directories). Files whose name starts with "." or
+    "_" (such as Spark's ``_SUCCESS``) are ignored, and all files must have
+    the same format.
+    """
+    path = Path(path)
+    if path.is_dir():
+        candidates = path.rglob("*")
+    else:
+        candidates = map(Path, glob.glob(str(path), recursive=True))
+    files = sorted(
+        p.resolve()
+        for p in candidates
+        if p.is_file()
+        and p.suffix in _DATA_SUFFIXES
+        and not p.name.startswith((".", "_"))
+    )
+    if not files:
+        raise ValueError(f"No CSV or Parquet file found in {str(path)!r}.")
+    suffixes = sorted({p.suffix for p in files})
+    if len(suffixes) > 1:
+        raise ValueError(
+            f"All files of a dataset must have the same format, found {suffixes} "
+            f"in {str(path)!r}."
+        )
+    return files
+
+
+def read_partitions(path, files=None, columns=None):
+    """Scan each file of a dataset separately.
+
+    The scans have the columns and dtypes of ``read(path)`` (including hive
+    partition columns), or only the ``columns`` listed, so that their
+    summaries can be merged. Requires polars.
+    """
+    import polars as pl
+
+    path = Path(path)
+    if files is None:
+        files = list_files(path)
+    schema = read(path).collect_schema()
+    if columns is not None:
+        schema = {name: schema[name] for name in columns}
+
+    def read_file(file_path):
+        if file_path.suffix == ".parquet":
+            df = pl.scan_parquet(file_path, hive_partitioning=path.is_dir())
+        else:
+            df = pl.scan_csv(file_path)
+        return df.select([pl.col(name).cast(dtype) for name, dtype in schema.items()])
+
+    return [read_file(f) for f in files]
+
+
+def iter_csv_batches(file_path, block_size=CSV_BLOCK_SIZE, columns=None):
+    """Read a CSV file as a stream of polars DataFrames.
+
+    Each batch holds about ``block_size`` bytes of the file, so memory does
+    not depend on the size of the file. The dtypes are those of
+    ``csv_schema``, inferred from the whole file: a column that is null in
+    the first block gets the dtype of its later values. At least one
+    (possibly empty) batch is yielded. If ``columns`` (a list of names) is
+    given, other columns are skipped by the parser.
+    """
+    import polars as pl
+    from pyarrow import csv
+
+    schema = csv_schema(file_path).to_arrow().schema
+    reader = csv.open_csv(
+        file_path,
+        read_options=csv.ReadOptions(block_size=block_size),
+        convert_options=csv.ConvertOptions(
+            column_types=dict(zip(schema.names, schema.types)),
+            include_columns=columns,
+        ),
+    )
+    is_empty = True
+    for batch in reader:
+        is_empty = False
+        yield pl.from_arrow(batch)
+    if is_empty:
+        yield pl.from_arrow(reader.schema.empty_table())
+
+
+def expand_columns(df, columns):
+    """Names of the columns of ``df`` selected by ``columns``.
+
+    ``columns`` is a column name, a list of names or a skrub selector (such
+    as ``skrub.selectors.numeric() | skrub.selectors.glob("price_*")``). The
+    selector is evaluated on the column names and dtypes only (an empty
+    dataframe) so that the data is never read, and selectors that look at
+    the values, such as ``has_nulls()``, select nothing.
+    """
+    from skrub import selectors as s
+
+    if isinstance(columns, str):
+        columns = [columns]
+    return s.make_selector(columns).expand(slice(df, 0, 0))
+
+
+def csv_schema(file_path):
+    """An empty polars DataFrame with the columns of a CSV file, as
+    ``iter_csv_batches`` reads them.
+
+    The dtypes are inferred by polars from all rows, as by ``scan_csv``
+    (dates are left as strings). This reads the whole file, but only keeps
+    the dtypes in memory.
+    """
+    import polars as pl
+
+    schema = pl.scan_csv(file_path, infer_schema_length=None).collect_schema()
+    return pl.DataFrame(schema=schema)
+
+
+def read_file_statistics(file_path):
+    """Read the statistics stored in a Parquet file's footer.
+
+    Returns ``None`` for other file formats. Otherwise returns a dict with the
+    number of rows ``n_rows`` and, in ``columns``, a dict mapping column names
+    to the statistics that are present in every row group: ``null_count`` and,
+    for integer and temporal columns, ``min`` and ``max``. Min and max of
+    floating-point columns are never used because Parquet statistics ignore
+    NaNs.
+    """
+    file_path = Path(file_path)
+    if file_path.suffix != ".parquet":
+        return None
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(file_path)
+    metadata = parquet_file.metadata
+    schema = parquet_file.schema_arrow
+    row_groups = [metadata.row_group(i) for i in range(metadata.num_row_groups)]
+    columns = {}
+    for leaf_idx in range(metadata.num_columns):
+        name = metadata.schema.column(leaf_idx).path
+        if name not in schema.names or pa.types.is_nested(schema.field(name).type):
+            continue
+        arrow_type = schema.field(name).type
+        all_stats = [rg.column(leaf_idx).statistics for rg in row_groups]
+        if not all_stats or any(st is None for st in all_stats):
+            continue
+        col_stats = {}
+        if all(st.has_null_count for st in all_stats):
+            col_stats["null_count"] = builtins.sum(st.null_count for st in all_stats)
+        if (
+            pa.types.is_integer(arrow_type) or pa.types.is_temporal(arrow_type)
+        ) and not pa.types.is_duration(arrow_type):
+            extrema = _exact_extrema(all_stats, arrow_type)
+            if extrema is not None:
+                col_stats["min"], col_stats["max"] = extrema
+        columns[name] = col_stats
+    return {"n_rows": metadata.num_rows, "columns": columns}
+
+
+def _exact_extrema(all_stats, arrow_type):
+    import pyarrow as pa
+
+    mins, maxs = [], []
+    for st in all_stats:
+        if not st.has_min_max:
+            if st.has_null_count and st.num_values == 0:
+                # only nulls in this row group
+                continue
+            return None
+        if not getattr(st, "is_min_value_exact", True) or not getattr(
+            st, "is_max_value_exact", True
+        ):
+            return None
+        mins.append(st.min)
+        maxs.append(st.max)
+    if not mins:
+        return None
+    # timestamps are stored in UTC, the scalar conversion restores the timezone
+    return (
+        pa.scalar(builtins.min(mins), type=arrow_type).as_py(),
+        pa.scalar(builtins.max(maxs), type=arrow_type).as_py(),
+    )
+
+
+@dispatch
+def collect(df):
+    raise NotImplementedError()
+
+@collect.specialize("pandas")
+def _collect_pandas(df):
+    return df
+
+@collect.specialize("polars")
+def _collect_polars(df):
+    return df
+
+@collect.specialize("polars", argument_type="LazyFrame")
+def _collect_polars_lazyframe(df):
+    try:
+        return df.collect(engine="streaming")
+    except TypeError:
+        # polars < 1.23
+        return df.collect(streaming=True)
+
+
+def effective_n_jobs(n_jobs):
+    if n_jobs is None:
+        return 1
+    if n_jobs < 0:
+        return builtins.max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+    if n_jobs == 0:
+        raise ValueError("n_jobs == 0 has no meaning, use None for sequential.")
+    return n_jobs
+
+
+def parallel_map(func, iterable, n_jobs=None):
+    """Apply ``func`` to each item, in a thread pool if ``n_jobs`` allows it.
+
+    Results are returned in the same order as the input.
+    """
+    n_jobs = effective_n_jobs(n_jobs)
+    if n_jobs == 1:
+        return list(map(func, iterable))
+    with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+        return list(executor.map(func, iterable))
+
+
 def get_dtype_name(column):
     return sbd.dtype(column).__class__.__name__
 
@@ -42,6 +317,23 @@ def _slice_polars(obj, *start_stop):
     start, stop, _  = builtins.slice(*start_stop).indices(sbd.shape(obj)[0])
     return obj.slice(start, stop - start)
 
+@slice.specialize("polars", argument_type="LazyFrame")
+def _slice_polars_lazyframe(obj, *start_stop):
+    # the number of rows is unknown so we rely on polars' negative offsets,
+    # which covers the head and tail slices needed for the report.
+    start_stop = builtins.slice(*start_stop)
+    start = start_stop.start or 0
+    stop = start_stop.stop
+    if stop is None:
+        length = None
+    elif (start < 0) == (stop < 0):
+        length = builtins.max(stop - start, 0)
+    else:
+        raise NotImplementedError(
+            "Cannot slice a LazyFrame with a mix of negative and positive bounds."
+        )
+    return collect(obj.slice(start, length))
+
 @dispatch
 def sum(col):
     raise NotImplementedError()
@@ -144,6 +436,125 @@ def _value_counts_polars(column):
     return column.rename('value').value_counts()
 
 
+@dispatch
+def select(df, column_names):
+    raise NotImplementedError()
+
+@select.specialize("pandas")
+def _select_pandas(df, column_names):
+    return df[column_names]
+
+@select.specialize("polars")
+def _select_polars(df, column_names):
+    return df.select(column_names)
+
+
+@dispatch
+def iter_batches(df, batch_size):
+    raise NotImplementedError()
+
+@iter_batches.specialize("pandas")
+def _iter_batches_pandas(df, batch_size):
+    for start in range(0, sbd.shape(df)[0], batch_size):
+        yield df.iloc[start : start + batch_size]
+
+@iter_batches.specialize("polars")
+def _iter_batches_polars(df, batch_size):
+    yield from df.iter_slices(batch_size)
+
+@iter_batches.specialize("polars", argument_type="LazyFrame")
+def _iter_batches_polars_lazyframe(df, batch_size):
+    if hasattr(df, "collect_batches"):
+        yield from df.collect_batches(chunk_size=batch_size)
+    else:
+        # polars < 1.33
+        yield from collect(df).iter_slices(batch_size)
+
+
+@dispatch
+def to_float_numpy(col):
+    raise NotImplementedError()
+
+@to_float_numpy.specialize("pandas", argument_type="Column")
+def _to_float_numpy_pandas(col):
+    return col.to_numpy(dtype=float, na_value=np.nan)
+
+@to_float_numpy.specialize("polars", argument_type="Column")
+def _to_float_numpy_polars(col):
+    import polars as pl
+
+    return col.cast(pl.Float64).to_numpy()
+
+
+@dispatch
+def to_datetime_numpy(col):
+    """Values of a date or datetime column as datetime64[ns], in local time."""
+    raise NotImplementedError()
+
+@to_datetime_numpy.specialize("pandas", argument_type="Column")
+def _to_datetime_numpy_pandas(col):
+    import pandas as pd
+
+    col = pd.to_datetime(col)
+    if col.dt.tz is not None:
+        col = col.dt.tz_localize(None)
+    return col.to_numpy().astype("datetime64[ns]")
+
+@to_datetime_numpy.specialize("polars", argument_type="Column")
+def _to_datetime_numpy_polars(col):
+    import polars as pl
+
+    if col.dtype == pl.Datetime and col.dtype.time_zone is not None:
+        col = col.dt.replace_time_zone(None)
+    return col.to_numpy().astype("datetime64[ns]")
+
+
+@dispatch
+def take(df, indices):
+    raise NotImplementedError()
+
+@take.specialize("pandas")
+def _take_pandas(df, indices):
+    return df.iloc[indices]
+
+@take.specialize("polars")
+def _take_polars(df, indices):
+    import polars as pl
+
+    return df.select(pl.all().gather(indices))
+
+@take.specialize("polars", argument_type="LazyFrame")
+def _take_polars_lazyframe(df, indices):
+    import polars as pl
+
+    # the rows come in their order in df, the indices must be sorted
+    return collect(
+        df.with_row_index("__skrubview_row_index")
+        .filter(pl.col("__skrubview_row_index").is_in(indices))
+        .drop("__skrubview_row_index")
+    )
+
+
+@dispatch
+def hash_values(column):
+    raise NotImplementedError()
+
+@hash_values.specialize("pandas", argument_type="Column")
+def _hash_values_pandas(column):
+    import pandas as pd
+
+    return pd.util.hash_pandas_object(column, index=False).to_numpy()
+
+@hash_values.specialize("polars", argument_type="Column")
+def _hash_values_polars(column):
+    import polars as pl
+
+    # categories' physical codes are not stable across chunks, hash the strings
+    if column.dtype in (pl.Categorical, pl.Enum):
+        column = column.cast(pl.String)
+    return column.hash(seed=0).to_numpy()
+
+
 @dispatch
 def sort(df, by, descending=False):
     raise NotImplementedError()
@@ -0,0 +1,74 @@
+import json
+import os
+import pathlib
+import shutil
+
+import pytest
+
+from skrubview import Report, _report
+from skrubview._cache import SummaryCache, file_fingerprint
+
+DATA_FILE = pathlib.Path(__file__).parent / "data" / "air_quality_no2_long.parquet"
+
+
+def test_put_get(tmp_path):
+    cache = SummaryCache(tmp_path / "cache")
+    key = cache.key(file_fingerprint(DATA_FILE), {"order_by": None})
+    assert cache.get(key) is None
+    cache.put(key, {"n_rows": 3})
+    assert cache.get(key) == {"n_rows": 3}
+    assert key != cache.key(file_fingerprint(DATA_FILE), {"order_by": "a"})
+    # no temporary files are left behind
+    assert [p.suffix for p in (tmp_path / "cache").iterdir()] == [".pickle"]
+
+
+def test_evict_least_recently_used(tmp_path):
+    cache = SummaryCache(tmp_path, max_bytes=None)
+    for i, key in enumerate("abc"):
+        cache.put(key, b"x" * 1000)
+        os.utime(cache._path(key), ns=(i * 10**9, i * 10**9))
+    # reading "a" makes it the most recently used
+    cache.get("a")
+    cache.max_bytes = 2500
+    cache.evict()
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+
+
+def test_fingerprint(tmp_path):
+    copy = tmp_path / DATA_FILE.name
+    shutil.copy(DATA_FILE, copy)
+    assert file_fingerprint(copy) != file_fingerprint(DATA_FILE)
+    assert file_fingerprint(copy, "content") == file_fingerprint(DATA_FILE, "content")
+    with pytest.raises(ValueError, match="'fingerprint' should be one of"):
+        file_fingerprint(copy, "name")
+
+
+def test_report_uses_cache(tmp_path, monkeypatch):
+    calls = []
+    summarize_dataframe = _report.summarize_dataframe
+
+    def summarize(*args, **kwargs):
+        calls.append(kwargs)
+        return summarize_dataframe(*args, **kwargs)
+
+    monkeypatch.setattr(_report, "summarize_dataframe", summarize)
+    first = Report(DATA_FILE, cache_dir=tmp_path).summary_without_plots
+    report = Report(DATA_FILE, cache_dir=tmp_path)
+    second = report.summary_without_plots
+    assert len(calls) == 1
+    assert second["dataframe"] is report.dataframe
+    assert second["columns"] == first["columns"]
+    report.html
+    Report(DATA_FILE, cache_dir=tmp_path, order_by="date.utc").json
+    Report(DATA_FILE, cache_dir=tmp_path, random_state=None).json
+    Report(DATA_FILE, cache_dir=tmp_path, random_state=None).json
+    assert len(calls) == 4
+
+
+def test_cached_summary_has_no_profile(tmp_path):
+    report = Report(DATA_FILE, cache_dir=tmp_path, profile=True)
+    assert "profile" in report.summary_without_plots
+    assert "profile" not in Report(DATA_FILE, cache_dir=tmp_path).summary_without_plots
+    assert "profile" not in json.loads(Report(DATA_FILE, cache_dir=tmp_path).json)
@@ -1,6 +1,10 @@
+import json
+
+import polars as pl
 from bs4 import BeautifulSoup
 
-from skrubview._summarize import summarize_dataframe
+from skrubview._summarize import add_plots, summarize_dataframe
+from skrubview import _html
 from skrubview._html import to_html
 
 
@@ -11,3 +15,59 @@ def test_to_html(make_dataframe):
     doc = BeautifulSoup(html, "html.parser")
     # * 2 bc they appear in the 'sample' and in the 'columns' sections
     assert len(doc.select(".skrubview-column-summary")) == df.shape[1] * 2
+
+
+def test_to_html_json_plots(make_dataframe):
+    df = make_dataframe()
+    summary = add_plots(summarize_dataframe(df), plot_backend="json")
+    doc = BeautifulSoup(to_html(summary), "html.parser")
+    assert not doc.select("img.pure-img")
+    (data_script,) = doc.select('script[type="application/json"]')
+    plot_data = json.loads(data_script.string)
+    placeholders = doc.select(".skrubview-plot")
+    # each column card appears twice but the data is embedded once
+    n_plots = sum(len(c["plot_names"]) for c in summary["columns"])
+    assert len(placeholders) == 2 * n_plots
+    assert sum(len(plots) for plots in plot_data.values()) == n_plots
+    for elem in placeholders:
+        plot = plot_data[elem["data-plot-column"]][elem["data-plot-name"]]
+        assert plot["kind"] in ("histogram", "line", "value_counts")
+
+
+def test_jinja_env_is_shared(make_dataframe, tmp_path, monkeypatch):
+    summary = summarize_dataframe(make_dataframe())
+    monkeypatch.setenv("SKRUBVIEW_TEMPLATE_CACHE_DIR", str(tmp_path / "cache"))
+    _html._get_jinja_env.cache_clear()
+    try:
+        assert _html._get_jinja_env() is _html._get_jinja_env()
+        to_html(summary)
+        assert list((tmp_path / "cache").iterdir())
+    finally:
+        _html._get_jinja_env.cache_clear()
+
+
+def test_to_html_wide_mode():
+    columns = {f"c{i}": [i, None, i + 1] for i in range(300)}
+    df = pl.DataFrame(columns | {"k": [0, 0, 0]})
+    summary = add_plots(summarize_dataframe(df), plot_backend="json")
+    doc = BeautifulSoup(to_html(summary), "html.parser")
+    # no column card or table cell is in the page, only their data
+    assert not doc.select(".skrubview-column-summary")
+    assert not doc.select(".skrubview-table-cell")
+    report_id = doc.select_one(".skrubview-report")["id"]
+    wide_data = json.loads(doc.select_one(f"#{report_id}_wide_data").string)
+    assert wide_data["names"] == df.columns
+    assert len(wide_data["cards"]) == df.shape[1]
+    card = BeautifulSoup(wide_data["cards"][3], "html.parser")
+    assert card.select_one(".skrubview-column-summary")["data-column-name"] == "c3"
+    assert card.select_one(".skrubview-plot")["data-plot-column"] == "3"
+    assert wide_data["head"][1][3] == ["None", "None", True]
+    constant_value = summary["columns"][-1]["constant_value"]
+    assert wide_data["constant_values"][-1] == repr(constant_value)
+    assert wide_data["constant_values"][0] is None
+    assert len(doc.select(".skrubview-wide-pager")) == 2
+    summary = summarize_dataframe(df.select(df.columns[:5]))
+    doc = BeautifulSoup(to_html(summary, wide_mode=True), "html.parser")
+    assert not doc.select(".skrubview-column-summary")
+    doc = BeautifulSoup(to_html(summary), "html.parser")
+    assert not doc.select(".skrubview-wide-pager")
@@ -0,0 +1,53 @@
+import subprocess
+import sys
+
+import pytest
+
+# slow to import; skrub imports all of them, and is itself only needed once a
+# dataframe is summarized
+HEAVY_MODULES = [
+    "skrub",
+    "sklearn",
+    "matplotlib",
+    "polars",
+    "pandas",
+    "pyarrow",
+    "rich",
+    "jinja2",
+]
+
+
+def _loaded_modules(code):
+    script = (
+        "import sys\n"
+        f"{code}\n"
+        f"print([m for m in {HEAVY_MODULES!r} if m in sys.modules])"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    )
+    return result.stdout.splitlines()[-1]
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "import skrubview",
+        "from skrubview import run, add_profile_hook",
+        # the CLI's help and argument errors do not load any of them
+        "sys.argv = ['skrubview', '--help']\n"
+        "from skrubview import run\n"
+        "try:\n    run()\nexcept SystemExit:\n    pass",
+    ],
+)
+def test_import_is_fast(code):
+    assert _loaded_modules(code) == "[]"
+
+
+def test_lazy_attributes():
+    import skrubview
+
+    assert "Report" in dir(skrubview)
+    assert skrubview.Report is skrubview._report.Report
+    with pytest.raises(AttributeError, match="has no attribute 'report'"):
+        skrubview.report
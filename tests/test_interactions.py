@@ -0,0 +1,97 @@
+import numpy as np
+import polars as pl
+import pytest
+
+from skrubview import _interactions
+
+
+def _dense_cramer_v(df):
+    # reference: contingency tables of all pairs at once from one-hot tensors
+    codes, n_bins = _interactions._encode(df, _interactions._N_BINS)
+    onehot = (codes[:, None, :] == np.arange(n_bins)[None, :, None]).astype("int32")
+    table = np.einsum("ack,bdk->abcd", onehot, onehot)
+    return _interactions._compute_cramer(table, codes.shape[1])
+
+
+@pytest.mark.parametrize("block_size", [None, 1, 1000])
+def test_cramer_v_matches_dense(make_dataframe, monkeypatch, block_size):
+    if block_size is not None:
+        monkeypatch.setattr(_interactions, "_BLOCK_SIZE", block_size)
+    df = make_dataframe(
+        {
+            "n_rows": 500,
+            "columns": [
+                {"dtype": dtype, "max_n_unique": n_unique}
+                for dtype in ["float", "int", "str", "datetime"]
+                for n_unique in [1, 5, 100]
+            ],
+        }
+    )
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=500)
+    values[rng.random(500) < 0.2] = np.nan
+    df = df.with_columns(pl.Series("with_nan", values))
+    associations = _interactions.cramer_v(df)
+    assert associations.shape == (13, 13)
+    assert np.array_equal(associations, _dense_cramer_v(df))
+    assert np.array_equal(associations, _interactions.cramer_v(df.to_pandas()))
+
+
+def test_cramer_v_codes_are_small(make_dataframe):
+    codes, n_bins = _interactions._encode(make_dataframe(), _interactions._N_BINS)
+    assert codes.dtype == np.uint8
+    assert codes.shape == (5, 40)
+    assert codes.max() < n_bins
+
+
+def _brute_force_top_associations(df, k, threshold):
+    associations = _interactions.cramer_v(df)
+    names = df.columns
+    pairs = [
+        (names[i], names[j], associations[i, j])
+        for i in range(len(names))
+        for j in range(i + 1, len(names))
+        if associations[i, j] > threshold
+    ]
+    # sorted is stable: ties stay in column order
+    return sorted(pairs, key=lambda pair: -pair[2])[:k]
+
+
+@pytest.mark.parametrize("block_size", [None, 1, 2000])
+@pytest.mark.parametrize("k, threshold", [(20, 0.2), (3, 0.0), (100, 0.0), (0, 0.0)])
+def test_top_associations(make_dataframe, monkeypatch, block_size, k, threshold):
+    if block_size is not None:
+        monkeypatch.setattr(_interactions, "_BLOCK_SIZE", block_size)
+    df = make_dataframe(
+        {
+            "n_rows": 200,
+            "columns": [
+                {"dtype": dtype, "max_n_unique": n_unique}
+                for dtype in ["float", "int", "str"]
+                for n_unique in [1, 3, 50]
+            ],
+        }
+    )
+    # duplicated columns give ties, with an association of 1
+    df = df.with_columns(df[:, 1].alias("copy_0"), df[:, 4].alias("copy_1"))
+    result = _interactions.top_associations(df, k=k, threshold=threshold)
+    assert result == _brute_force_top_associations(df, k, threshold)
+
+
+def test_top_associations_until(make_dataframe):
+    df = make_dataframe()
+    expected = _interactions.top_associations(df, k=5)
+    assert _interactions.top_associations_until(df, None, k=5) == (expected, 1.0)
+    assert _interactions.top_associations_until(df, 0.0, k=5) == ([], 0.0)
+
+
+def test_no_associations_requested(make_dataframe, monkeypatch):
+    # with k=0 there is nothing to search: the columns are not even encoded
+    def fail(*args, **kwargs):
+        raise AssertionError("_encode called")
+
+    monkeypatch.setattr(_interactions, "_encode", fail)
+    assert _interactions.top_associations_until(make_dataframe(), None, k=0) == (
+        [],
+        1.0,
+    )
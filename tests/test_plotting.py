@@ -0,0 +1,143 @@
+import datetime
+import json
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import polars as pl
+import pytest
+
+from skrubview import _plotting, _svg
+
+_SVG = "{http://www.w3.org/2000/svg}"
+
+
+def _parse(svg):
+    return ET.fromstring(svg)
+
+
+def _texts(svg):
+    return [t.text for t in _parse(svg).iter(f"{_SVG}text")]
+
+
+def test_histogram():
+    col = pl.Series("a", [0.0, 1.0, 1.5, None, 2.0, 2.0, 10.0])
+    svg = _plotting.histogram(col)
+    root = _parse(svg)
+    # 4 non-empty bins out of 10
+    assert len(list(root.iter(f"{_SVG}rect"))) == 4
+    assert _texts(svg) == ["0", "2", "4", "6", "8", "10", "0", "1", "2"]
+
+
+def test_histogram_datetime():
+    col = pl.Series(
+        "d",
+        [datetime.datetime(2020, 1, 1) + datetime.timedelta(days=i) for i in range(90)],
+    )
+    svg = _plotting.histogram(col.dt.replace_time_zone("Europe/Paris"))
+    assert _texts(svg)[:3] == ["2020-01", "2020-02", "2020-03"]
+    assert _texts(svg) == _texts(_plotting.histogram(col.to_pandas()))
+
+
+def test_line():
+    x = pl.Series("the x", np.arange(10_000.0))
+    values = np.zeros(10_000)
+    values[1234], values[5678] = 7.0, -3.0
+    values[100:200] = np.nan
+    svg = _plotting.line(x, pl.Series("y", values))
+    path = _parse(svg).find(f"{_SVG}path").get("d")
+    # the gap starts a new segment; extremes are kept by the downsampling
+    assert path.count("M") == 2
+    assert path.count("L") < 600
+    assert "the x" in _texts(svg)
+    # infinite values are left out, like missing ones, and not drawn
+    values[300], values[400] = np.inf, -np.inf
+    svg = _plotting.line(x, pl.Series("y", values))
+    path = _parse(svg).find(f"{_SVG}path").get("d")
+    assert "inf" not in path and path.count("M") == 4
+    # the axes only span the finite values
+    values[300] = values[400] = np.nan
+    assert _texts(svg) == _texts(_plotting.line(x, pl.Series("y", values)))
+
+
+def test_downsample_keeps_extremes():
+    y = np.random.default_rng(0).normal(size=10_001)
+    x, kept = _plotting._downsample(np.arange(len(y)), y, 100)
+    assert len(kept) <= 200
+    assert kept.min() == y.min() and kept.max() == y.max()
+    assert (np.diff(x) > 0).all()
+
+
+def test_value_counts():
+    svg = _plotting.value_counts({"<a & b>": 6, "$x$": 3}, 4, 10)
+    assert _texts(svg) == ["2 most frequent", "<a & b>", "60.0%", "$x$", "30.0%"]
+    assert len(list(_parse(svg).iter(f"{_SVG}rect"))) == 2
+
+
+@pytest.mark.parametrize(
+    "low, high, expected",
+    [
+        (0, 97, ["0", "20", "40", "60", "80"]),
+        (-3.2, 4.1, ["-2", "0", "2", "4"]),
+        (0, 1, ["0", "0.2", "0.4", "0.6", "0.8", "1.0"]),
+        (0.001, 0.0123, ["0.0025", "0.0050", "0.0075", "0.0100"]),
+    ],
+)
+def test_numeric_ticks(low, high, expected):
+    ticks, labels = _svg._numeric_ticks(low, high)
+    assert labels == expected
+    assert ((low <= ticks) & (ticks <= high)).all()
+
+
+@pytest.mark.parametrize(
+    "start, end, expected",
+    [
+        ("1990-01-01", "2024-01-01", ["1990", "2000", "2010", "2020"]),
+        ("2019-05-07T01:00", "2019-05-07T09:00", ["03:00", "06:00", "09:00"]),
+    ],
+)
+def test_datetime_ticks(start, end, expected):
+    low = np.datetime64(start, "ns").astype(np.int64)
+    high = np.datetime64(end, "ns").astype(np.int64)
+    assert _svg._datetime_ticks(low, high)[1] == expected
+
+
+def test_matplotlib_backend():
+    pytest.importorskip("matplotlib")
+    col = pl.Series("a", [0.0, 1.0, 1.5, None, 2.0])
+    assert _plotting.histogram(col, backend="matplotlib").startswith("<?xml")
+    assert "<svg" in _plotting.value_counts({"a": 2, "b": 1}, 2, 3, backend="matplotlib")
+
+
+def test_json_backend():
+    start = datetime.datetime(2020, 1, 1)
+    x = pl.Series("d", [start + datetime.timedelta(seconds=i) for i in range(10)])
+    y = pl.Series("y", [0.1, None, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0])
+    plot = _plotting.line(x, y, backend="json")
+    assert plot["kind"] == "line"
+    assert plot["y"][:3] == [0.1, None, 0.3]
+    # close datetimes (in nanoseconds) are not rounded to the same value
+    assert len(set(plot["x"])) == 10
+    json.dumps(plot, allow_nan=False)
+    # infinity is not valid JSON either: JSON.parse would reject the report
+    y = pl.Series("y", [0.1, float("inf"), 0.3, float("-inf")] + [0.5] * 6)
+    plot = _plotting.line(x, y, backend="json")
+    assert plot["y"][:4] == [0.1, None, 0.3, None]
+    json.dumps(plot, allow_nan=False)
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError, match="'backend' should be one of"):
+        _plotting.histogram(pl.Series([1.0]), backend="png")
+
+
+def test_draw_all_matplotlib_process_pool():
+    pytest.importorskip("matplotlib")
+    plots = [
+        _plotting.value_counts_data({f"value {i}": 2, "other": 1}, 2, 3)
+        for i in range(5)
+    ]
+    svgs = _plotting.draw_all(plots, backend="matplotlib", n_jobs=2)
+    assert len(svgs) == 5
+    for i, svg in enumerate(svgs):
+        # matplotlib writes the text of labels in comments
+        assert f"<!-- value {i} -->" in svg
@@ -0,0 +1,86 @@
+import json
+import threading
+
+import pytest
+
+import skrubview
+from skrubview import Report, _profile
+from skrubview._html import to_html
+from skrubview._summarize import summarize_dataframe
+from skrubview._text import to_text
+
+
+def test_profile(make_dataframe):
+    df = make_dataframe()
+    records = []
+    skrubview.add_profile_hook(records.append)
+    try:
+        summary = summarize_dataframe(df, with_plots=True, profile=True)
+        to_html(summary)
+        to_text(summary)
+    finally:
+        skrubview.remove_profile_hook(records.append)
+    profile = summary["profile"]
+    stages = [r["stage"] for r in profile["stages"]]
+    for stage in ["statistics", "sample", "interactions", "plot_data", "html", "text"]:
+        assert stage in stages
+    for record in profile["stages"]:
+        assert record["seconds"] >= 0
+        assert record["peak_bytes"] >= 0
+    columns = {r["column"] for r in profile["columns"]}
+    assert columns == set(df.columns)
+    # the hook receives every record, in the order they are measured
+    assert len(records) == len(profile["stages"]) + len(profile["columns"])
+    assert all(r in profile["stages"] or r in profile["columns"] for r in records)
+    assert df.columns[0] in _profile.format_profile(profile)
+    assert "profile" not in summarize_dataframe(df)
+
+
+def test_nested_stages_memory():
+    profile = _profile.new_profile()
+    with _profile.stage(profile, "outer"):
+        with _profile.stage(profile, "inner"):
+            data = bytearray(10 * 2**20)
+            del data
+        kept = bytearray(2**20)
+    inner, outer = profile["stages"]
+    assert inner["peak_bytes"] >= 10 * 2**20 > inner["allocated_bytes"]
+    # the peak of the inner stage is also the peak of the outer stage
+    assert outer["peak_bytes"] >= inner["peak_bytes"]
+    assert outer["allocated_bytes"] == pytest.approx(2**20, rel=0.1)
+    del kept
+
+
+def test_concurrent_stages_memory():
+    # a stage of another thread waits, instead of measuring our allocations
+    profiles = [_profile.new_profile() for _ in range(2)]
+    inside, allocated = threading.Event(), threading.Event()
+
+    def measure():
+        with _profile.stage(profiles[1], "small"):
+            inside.set()
+            allocated.wait(1.0)
+            data = bytearray(2**20)
+            del data
+
+    thread = threading.Thread(target=measure)
+    with _profile.stage(profiles[0], "large"):
+        thread.start()
+        inside.wait(0.2)
+        data = bytearray(20 * 2**20)
+        del data
+        allocated.set()
+    thread.join()
+    (large,), (small,) = profiles[0]["stages"], profiles[1]["stages"]
+    assert large["peak_bytes"] >= 20 * 2**20
+    assert 2**20 <= small["peak_bytes"] < 2 * 2**20
+
+
+def test_report_profile(make_dataframe, tmp_path):
+    df = make_dataframe()
+    report = Report(df, profile=True)
+    assert "profile" in json.loads(report.json)
+    report.html
+    stages = [r["stage"] for r in report.summary_with_plots["profile"]["stages"]]
+    assert stages[-1] == "html"
+    assert "profile" not in Report(df).summary_without_plots
@@ -1,8 +1,9 @@
 import pathlib
 
 import polars as pl
+import pytest
 
-from skrubview import Report
+from skrubview import Report, _utils
 
 def test_report():
     data_dir = pathlib.Path(__file__).parent / 'data'
@@ -16,3 +17,114 @@ def test_report():
     report.text
     report._any_summary
     report._repr_mimebundle_()
+
+
+def test_report_summarizes_once(monkeypatch):
+    from skrubview import _report
+
+    calls = []
+    summarize_dataframe = _report.summarize_dataframe
+
+    def summarize(*args, **kwargs):
+        calls.append(kwargs)
+        return summarize_dataframe(*args, **kwargs)
+
+    df = pl.DataFrame({"a": [1.0, 2.0, 3.5], "b": ["x", "y", "x"]})
+    report = Report(df)
+    monkeypatch.setattr(_report, "summarize_dataframe", summarize)
+    report.text
+    report.json
+    assert report._any_summary is report.summary_without_plots
+    assert "summary_with_plots" not in report.__dict__
+    report._repr_mimebundle_()
+    assert report._any_summary is report.summary_with_plots
+    assert len(calls) == 1
+    assert report.summary_without_plots["columns"][0]["plot_names"] == []
+    assert report.summary_with_plots["columns"][0]["plot_names"] == ["histogram_plot"]
+
+
+def test_report_from_csv(tmp_path):
+    df = pl.read_parquet(
+        pathlib.Path(__file__).parent / "data" / "air_quality_no2_long.parquet"
+    )
+    df = df.with_columns(
+        value=pl.when(pl.col("value") > 40).then(None).otherwise(pl.col("value"))
+    )
+    csv_file = tmp_path / "data.csv"
+    df.write_csv(csv_file)
+    report = Report.from_csv(csv_file, block_size=10_000)
+    summary = report.summary_without_plots
+    expected = Report(csv_file).summary_without_plots
+    assert summary["n_rows"] == expected["n_rows"] == df.shape[0]
+    for rows in ["head", "tail"]:
+        assert summary[rows] == expected[rows]
+    for col, col_expected in zip(summary["columns"], expected["columns"]):
+        assert col["null_count"] == col_expected["null_count"]
+    report.html
+    with pytest.raises(ValueError, match="Not a CSV file"):
+        Report.from_csv(tmp_path)
+
+
+def test_report_from_csv_null_first_block(tmp_path):
+    # the first blocks have no value in "x", which is typed from later rows
+    df = pl.DataFrame(
+        {
+            "i": range(5000),
+            "x": pl.Series([None] * 4000 + [1.5] * 1000, dtype=pl.Float64),
+        }
+    )
+    csv_file = tmp_path / "data.csv"
+    df.write_csv(csv_file)
+    batches = list(_utils.iter_csv_batches(csv_file, block_size=1000))
+    assert len(batches) > 1
+    assert all(batch.schema == df.schema for batch in batches)
+    summary = Report.from_csv(csv_file, block_size=1000).summary_without_plots
+    assert summary["columns"][1]["null_count"] == 4000
+    assert summary["columns"][1]["mean"] == 1.5
+
+
+@pytest.mark.parametrize("suffix", [".arrow", ".feather", ".ipc"])
+def test_report_from_ipc_file(tmp_path, suffix):
+    df = pl.read_parquet(
+        pathlib.Path(__file__).parent / "data" / "air_quality_no2_long.parquet"
+    )
+    ipc_file = tmp_path / f"data{suffix}"
+    if suffix == ".ipc":
+        df.write_ipc_stream(ipc_file)
+    else:
+        df.write_ipc(ipc_file, compression="uncompressed")
+    report = Report(ipc_file)
+    assert report.dataframe.equals(df)
+    expected = Report(df).summary_without_plots
+    assert report.summary_without_plots["columns"] == expected["columns"]
+
+
+def test_report_columns(tmp_path):
+    from skrub import selectors as s
+
+    data_file = pathlib.Path(__file__).parent / "data" / "air_quality_no2_long.parquet"
+    report = Report(data_file, columns=["value", "city"], order_by="date.utc")
+    assert report.columns == ["city", "date.utc", "value"]
+    # the projection is part of the scan, the other columns are never read
+    assert report.dataframe.collect_schema().names() == report.columns
+    summary = report.summary_without_plots
+    assert [c["name"] for c in summary["columns"]] == report.columns
+    report.html
+    report = Report(data_file, columns=s.numeric() | s.glob("c*"))
+    assert report.columns == ["city", "country", "value"]
+    with pytest.raises(ValueError):
+        Report(data_file, columns=["missing"])
+
+    df = pl.read_parquet(data_file)
+    csv_file = tmp_path / "data.csv"
+    df.write_csv(csv_file)
+    report = Report.from_csv(csv_file, columns="value")
+    assert [c["name"] for c in report.summary_without_plots["columns"]] == ["value"]
+    dataset = tmp_path / "dataset"
+    dataset.mkdir()
+    df[:1000].write_parquet(dataset / "a.parquet")
+    df[1000:].write_parquet(dataset / "b.parquet")
+    report = Report(dataset, columns=["unit"])
+    summary = report.summary_without_plots
+    assert [c["name"] for c in summary["columns"]] == ["unit"]
+    assert summary["n_rows"] == df.shape[0]
@@ -0,0 +1,105 @@
+import numpy as np
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from skrubview import _sampling, _utils
+from skrubview._summarize import summarize_dataframe
+
+
+def _df(n_rows=1000):
+    return pl.DataFrame(
+        {
+            "idx": np.arange(n_rows),
+            "label": ["rare" if i % 100 == 0 else "common" for i in range(n_rows)],
+        }
+    )
+
+
+def test_draw_sample_is_deterministic():
+    df = _df()
+    sample = _sampling.draw_sample(df, size=50)
+    assert sample.shape == (50, 2)
+    assert_frame_equal(sample, _sampling.draw_sample(df, size=50))
+    assert_frame_equal(sample, _sampling.draw_sample(df.lazy(), n_rows=1000, size=50))
+    assert (
+        _sampling.draw_sample(df.to_pandas(), size=50)["idx"].tolist()
+        == sample["idx"].to_list()
+    )
+    assert not sample.equals(_sampling.draw_sample(df, size=50, random_state=1))
+    # rows keep their order
+    assert sample["idx"].is_sorted()
+    assert _sampling.draw_sample(df, size=5000).shape == (1000, 2)
+
+
+def test_draw_sample_stratified():
+    df = _df()
+    sample = _sampling.draw_sample(df, size=50, stratify_by="label")
+    assert sample.shape == (50, 2)
+    counts = dict(sample["label"].value_counts().iter_rows())
+    # 10 rare rows for 1000: 0.5 in proportion, rounded up to 1
+    assert counts == {"rare": 1, "common": 49}
+    sample = _sampling.draw_sample(df, size=500, stratify_by="label")
+    assert dict(sample["label"].value_counts().iter_rows()) == {
+        "rare": 5,
+        "common": 495,
+    }
+    assert sample["idx"].is_sorted()
+
+
+@pytest.mark.parametrize("counts, size", [([5, 3, 1], 4), ([1, 1, 1], 2), ([7], 7)])
+def test_allocate(counts, size):
+    allocation = _sampling._allocate(np.asarray(counts), size)
+    assert allocation.sum() == size
+    assert (allocation <= counts).all()
+
+
+@pytest.mark.parametrize("batch_size", [7, 100, 5000])
+def test_reservoir_sample(batch_size):
+    df = _df()
+    sample = _sampling.reservoir_sample(
+        _utils.iter_batches(df, batch_size), size=100
+    )
+    assert sample.shape == (100, 2)
+    assert sample["idx"].is_sorted()
+    assert sample["idx"].n_unique() == 100
+    # the same batches give the same sample; smaller data is kept in full
+    assert_frame_equal(
+        sample,
+        _sampling.reservoir_sample(_utils.iter_batches(df, batch_size), size=100),
+    )
+    whole = _sampling.reservoir_sample(_utils.iter_batches(df[:50], batch_size))
+    assert_frame_equal(whole, df[:50])
+
+
+def test_reservoir_sampler_merge():
+    df = _df()
+    left = _sampling.ReservoirSampler(100, random_state=0).update(df[:600])
+    right = _sampling.ReservoirSampler(100, random_state=1).update(df[600:])
+    sample = left.merge(right).result()
+    assert left.n == 1000
+    assert sample.shape == (100, 2)
+    assert sample["idx"].is_sorted()
+    # both parts are represented in proportion (with a large margin)
+    assert 40 < (sample["idx"] < 600).sum() < 80
+
+
+def test_reservoir_sample_is_uniform():
+    df = _df(20)
+    counts = np.zeros(20)
+    for seed in range(1000):
+        sample = _sampling.reservoir_sample(
+            _utils.iter_batches(df, 3), size=5, random_state=seed
+        )
+        counts[sample["idx"].to_numpy()] += 1
+    # each row is kept with probability 1/4
+    assert np.abs(counts / 1000 - 0.25).max() < 0.07
+
+
+def test_summary_sample_is_deterministic():
+    df = _df()
+    summary = summarize_dataframe(df, sample_size=200, stratify_by="label")
+    assert summary["sample"].shape == (200, 2)
+    again = summarize_dataframe(df, sample_size=200, stratify_by="label")
+    assert_frame_equal(summary["sample"], again["sample"])
+    assert summary["top_associations"] == again["top_associations"]
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from skrubview._sketches import HeavyHitters, HyperLogLog, QuantileSketch
+
+
+def _rank(sorted_values, value):
+    return np.searchsorted(sorted_values, value) / len(sorted_values)
+
+
+@pytest.mark.parametrize("n_chunks", [1, 7])
+def test_quantile_sketch_rank_error(n_chunks):
+    values = np.random.default_rng(0).lognormal(size=200_000)
+    sketch = QuantileSketch(capacity=256)
+    for chunk in np.array_split(values, n_chunks):
+        sketch.update(chunk)
+    assert sketch.n == len(values)
+    assert 0.0 < sketch.rank_error < 0.1
+    sorted_values = np.sort(values)
+    q = [0.0, 0.1, 0.25, 0.5, 0.75, 0.9, 1.0]
+    estimates = sketch.quantiles(q)
+    assert estimates[0] == values.min()
+    assert estimates[-1] == values.max()
+    for quantile, estimate in zip(q, estimates):
+        assert abs(_rank(sorted_values, estimate) - quantile) <= sketch.rank_error
+
+
+def test_quantile_sketch_merge():
+    values = np.random.default_rng(0).normal(size=50_000)
+    left = QuantileSketch(capacity=128).update(values[:20_000])
+    right = QuantileSketch(capacity=128).update(values[20_000:])
+    merged = left.merge(right)
+    assert merged.n == len(values)
+    assert sum(len(level) for level in merged.levels) < 128 * len(merged.levels)
+    median = merged.quantiles([0.5])[0]
+    assert abs(_rank(np.sort(values), median) - 0.5) <= merged.rank_error
+
+
+def test_quantile_sketch_exact_when_small():
+    sketch = QuantileSketch().update([3.0, np.nan, 1.0, 2.0, 5.0, 4.0])
+    assert sketch.rank_error == 0.0
+    assert sketch.quantiles([0.0, 0.5, 1.0]) == [1.0, 3.0, 5.0]
+
+
+def test_hyperloglog():
+    rng = np.random.default_rng(0)
+    for n_distinct in [10, 5000, 200_000]:
+        values = rng.integers(0, 2**64, size=n_distinct, dtype="uint64")
+        hll = HyperLogLog().update(values).update(values[: n_distinct // 2])
+        assert abs(hll.count() - n_distinct) <= 4 * hll.relative_error * n_distinct
+    left = HyperLogLog().update(values[:1000])
+    right = HyperLogLog().update(values[500:2000])
+    assert abs(left.merge(right).count() - 2000) < 100
+
+
+def test_heavy_hitters():
+    rng = np.random.default_rng(0)
+    values = np.where(rng.random(100_000) < 0.1, -1, rng.integers(0, 50_000, 100_000))
+    merged = HeavyHitters(capacity=100)
+    for chunk in np.array_split(values, 10):
+        chunk_values, chunk_counts = np.unique(chunk, return_counts=True)
+        order = np.argsort(-chunk_counts)
+        top = dict(zip(chunk_values[order][:101], chunk_counts[order][:101]))
+        merged.merge(
+            HeavyHitters.from_top_counts(top, len(chunk_values), len(chunk), 100)
+        )
+    assert merged.n == len(values)
+    assert merged.error <= len(values) / 101
+    true_count = (values == -1).sum()
+    assert list(merged.top_k(1)) == [-1]
+    assert true_count - merged.error <= merged.top_k(1)[-1] <= true_count
@@ -0,0 +1,137 @@
+import datetime
+import pickle
+
+import numpy as np
+import pandas as pd
+import polars as pl
+import pytest
+
+from skrubview import _state
+from skrubview._html import to_html
+from skrubview._summarize import summarize_dataframe, summarize_state
+
+
+def _make_df(n_rows=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    start = datetime.datetime(2020, 1, 1)
+    values = rng.normal(100.0, 5.0, n_rows)
+    values[::7] = np.nan
+    return pl.DataFrame(
+        {
+            "x": pl.Series(values, nan_to_null=True),
+            "c": rng.choice(["a", "b", "c", None], n_rows).tolist(),
+            "d": [start + datetime.timedelta(hours=i) for i in range(n_rows)],
+        }
+    )
+
+
+@pytest.mark.parametrize("to_pandas", [False, True])
+def test_merged_state_matches_whole(to_pandas):
+    df = _make_df()
+    if to_pandas:
+        df = df.to_pandas()
+    whole = _state.summary_state(df, batch_size=1000).statistics()
+    first = _state.summary_state(df[:1700], batch_size=500)
+    second = _state.summary_state(df[1700:], random_state=1)
+    merged = pickle.loads(pickle.dumps(first)).merge(second)
+    stats = merged.statistics()
+    assert merged.n_rows == stats["n_rows"] == whole["n_rows"] == 3000
+    for col, col_whole in zip(stats["columns"], whole["columns"]):
+        assert col["null_count"] == col_whole["null_count"]
+    x, c, d = stats["columns"]
+    values = df["x"].to_numpy().astype(float)
+    assert x["mean"] == pytest.approx(np.nanmean(values))
+    assert x["std"] == pytest.approx(np.nanstd(values, ddof=1))
+    assert x["quantiles"][0.0] == np.nanmin(values)
+    assert "value_counts_max_error" not in c
+    assert c["n_unique"] == 3
+    assert c["value_counts"] == whole["columns"][1]["value_counts"]
+    assert d["min"] == datetime.datetime(2020, 1, 1)
+    assert d["max"] == datetime.datetime(2020, 1, 1) + datetime.timedelta(hours=2999)
+    assert merged.head.shape[0] == merged.tail.shape[0] == 5
+    assert list(merged.tail["d"])[-1] == d["max"]
+    assert merged.sample.shape[0] == 3000
+
+
+def test_summarize_state():
+    df = _make_df()
+    summary, state = summarize_dataframe(df[:2000], return_state=True)
+    assert summary["n_rows"] == 2000
+    state.merge(_state.summary_state(df[2000:], random_state=1))
+    summary = summarize_state(state, with_plots=True, order_by="d")
+    expected = summarize_dataframe(df)
+    assert summary["n_rows"] == expected["n_rows"]
+    assert summary["head"] == expected["head"]
+    assert summary["tail"] == expected["tail"]
+    for col, col_expected in zip(summary["columns"], expected["columns"]):
+        assert col["null_count"] == col_expected["null_count"]
+    assert summary["columns"][0]["mean"] == pytest.approx(
+        expected["columns"][0]["mean"]
+    )
+    assert summary["columns"][0]["plot_names"] == ["line_plot"]
+    to_html(summary)
+
+
+def test_empty_numeric_state():
+    df = pd.DataFrame({"x": [np.nan] * 10, "y": np.arange(10.0)})
+    empty = _state.summary_state(df)
+    x = empty.statistics()["columns"][0]
+    assert x["null_count"] == 10
+    assert x["mean"] is x["std"] is None
+    assert x["quantiles"] == dict.fromkeys(x["quantiles"])
+    summary = summarize_state(empty, with_plots=True)
+    assert summary["columns"][0]["null_proportion"] == 1.0
+    assert "quantiles" not in summary["columns"][0]
+    to_html(summary)
+
+    values = pd.DataFrame({"x": np.arange(10.0), "y": np.arange(10.0)})
+    for merged in [
+        _state.summary_state(df).merge(_state.summary_state(values)),
+        _state.summary_state(values).merge(_state.summary_state(df)),
+    ]:
+        x = merged.statistics()["columns"][0]
+        assert x["null_count"] == 10
+        assert x["mean"] == 4.5
+        assert x["std"] == pytest.approx(np.arange(10.0).std(ddof=1))
+        assert x["quantiles"][0.0] == 0.0
+        assert x["quantiles"][1.0] == 9.0
+
+
+def test_empty_datetime_state():
+    dates = pd.Series([pd.NaT] * 10, dtype="datetime64[ns]")
+    df = pd.DataFrame({"d": dates, "y": np.arange(10.0)})
+    empty = _state.summary_state(df)
+    assert empty.statistics()["columns"][0] == {"null_count": 10}
+    summary = summarize_state(empty, with_plots=True)
+    assert "min" not in summary["columns"][0]
+    to_html(summary)
+    # the exact statistics of the same column agree
+    for exact_df in [df, pl.from_pandas(df)]:
+        assert "min" not in summarize_dataframe(exact_df)["columns"][0]
+
+    start = datetime.datetime(2020, 1, 1)
+    values = pd.DataFrame(
+        {"d": pd.Series([start] * 10, dtype="datetime64[ns]"), "y": np.arange(10.0)}
+    )
+    for merged in [
+        _state.summary_state(df).merge(_state.summary_state(values)),
+        _state.summary_state(values).merge(_state.summary_state(df)),
+    ]:
+        d = merged.statistics()["columns"][0]
+        assert d["null_count"] == 10
+        assert d["min"] == d["max"] == start
+
+
+def test_high_cardinality_is_sketched():
+    df = pl.DataFrame({"c": [str(i % 2000) for i in range(6000)]})
+    stats = _state.summary_state(df, batch_size=1000).statistics()["columns"][0]
+    assert stats["n_unique"] == pytest.approx(2000, rel=0.05)
+    assert stats["value_counts_max_error"] > 0
+
+
+def test_mismatched_columns():
+    state = _state.summary_state(_make_df(10))
+    with pytest.raises(ValueError, match="Cannot add data with columns"):
+        state.merge(_state.summary_state(_make_df(10).drop("c")))
+    with pytest.raises(ValueError, match="'stratify_by' is not supported"):
+        summarize_dataframe(_make_df(10), return_state=True, stratify_by="c")
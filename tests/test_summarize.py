@@ -1,10 +1,14 @@
+import datetime
 import pathlib
 import json
 
 import polars as pl
+import pytest
 
+from skrubview._html import to_html
 from skrubview._summarize import summarize_dataframe
 from skrubview._report import Report
+from skrubview import _stats, _utils
 
 
 def test_summarize():
@@ -20,3 +24,196 @@ def test_summarize():
     summary = summarize_dataframe(df, with_plots=True, order_by='date.utc')
     for c in summary['columns']:
         assert c['value_is_constant'] or len(c['plot_names']) == 1
+
+
+def test_summarize_n_jobs(make_dataframe):
+    df = make_dataframe()
+    for input_df in [df, df.to_pandas()]:
+        expected = summarize_dataframe(input_df, with_plots=True)
+        summary = summarize_dataframe(input_df, with_plots=True, n_jobs=2)
+        assert [c["name"] for c in summary["columns"]] == list(input_df.columns)
+        for c, expected_c in zip(summary["columns"], expected["columns"]):
+            assert c.keys() == expected_c.keys()
+            assert c.get("value_counts") == expected_c.get("value_counts")
+
+
+def test_summarize_lazyframe():
+    data_file = pathlib.Path(__file__).parent / 'data' / 'air_quality_no2_long.parquet'
+    df = pl.read_parquet(data_file)
+    expected = json.loads(Report(df).json)
+    lazy_report = Report(pl.scan_parquet(data_file))
+    summary = json.loads(lazy_report.json)
+    assert summary['columns'] == expected['columns']
+    assert summary['n_rows'] == expected['n_rows']
+    assert lazy_report.summary_without_plots['head'] == Report(df).summary_without_plots['head']
+    lazy_report.html
+    summary = summarize_dataframe(pl.scan_parquet(data_file), with_plots=True, order_by='date.utc')
+    for c in summary['columns']:
+        assert c['value_is_constant'] or len(c['plot_names']) == 1
+
+
+def test_parquet_file_statistics(tmp_path):
+    df = pl.DataFrame(
+        {
+            "int": [1, None, 3, 10, None],
+            "float": [1.5, float("nan"), None, 2.0, 0.5],
+            "date": pl.datetime_range(
+                datetime.datetime(2020, 1, 1),
+                datetime.datetime(2020, 1, 5),
+                eager=True,
+                time_zone="Europe/Paris",
+            ),
+            "str": ["a", None, "b", "a", "a"],
+        }
+    )
+    data_file = tmp_path / "data.parquet"
+    df.write_parquet(data_file, statistics=True, row_group_size=2)
+    stats = _utils.read_file_statistics(data_file)
+    assert stats["n_rows"] == 5
+    assert stats["columns"]["int"] == {"null_count": 2, "min": 1, "max": 10}
+    assert "min" not in stats["columns"]["float"]
+    assert stats["columns"]["date"]["min"] == df["date"].min()
+    expected = json.loads(Report(df).json)
+    summary = json.loads(Report(data_file).json)
+    assert summary["columns"] == expected["columns"]
+
+
+def test_summarize_approximate(make_dataframe):
+    df = make_dataframe({"n_rows": 5000, "columns": [{"dtype": "float"}, {"dtype": "int"}]})
+    for input_df in [df, df.to_pandas(), df.lazy()]:
+        summary = summarize_dataframe(input_df, approximate=True)
+        for c in summary['columns']:
+            assert c['quantiles_are_approximate']
+            assert c['quantiles_rank_error'] < 0.01
+            assert c['quantiles'][0.0] == df[c['name']].min()
+    assert "≈ Quantiles" in Report(df, approximate=True).text
+    all_nan = df.to_pandas().assign(all_nan=float("nan"))
+    summary = summarize_dataframe(all_nan, approximate=True)
+    assert "quantiles" not in summary["columns"][-1]
+
+
+def test_summarize_sketched_value_counts(make_dataframe, monkeypatch):
+    df = make_dataframe({"n_rows": 3000, "columns": [{"dtype": "str", "max_n_unique": 2000}, {"dtype": "category"}]})
+    for input_df in [df, df.to_pandas(), df.lazy()]:
+        summary = summarize_dataframe(input_df, sketch_threshold=500)
+        high, low = summary['columns']
+        assert high['n_unique_is_approximate'] and high['value_counts_are_approximate']
+        assert abs(high['n_unique'] - df[:, 0].n_unique()) < 100
+        assert 'n_unique_is_approximate' not in low
+        assert low['n_unique'] == df[:, 1].n_unique()
+    assert "Unique values: ≈" in Report(df, sketch_threshold=500).text
+    # the columns are chosen before the statistics, and only those above the
+    # threshold are sketched, instead of getting exact value counts
+    calls = []
+    column_statistics = _stats.column_statistics
+
+    def record(*args, **kwargs):
+        calls.append(kwargs["sketched_columns"])
+        return column_statistics(*args, **kwargs)
+
+    monkeypatch.setattr(_stats, "column_statistics", record)
+    for threshold, sketched in [(500, [df.columns[0]]), (5000, [])]:
+        summary = summarize_dataframe(
+            df.lazy(), sketch_threshold=threshold, profile=True
+        )
+        assert calls.pop() == sketched
+        names = [r["stage"] for r in summary["profile"]["stages"]]
+        assert names.index("approximate_n_unique") < names.index("statistics")
+        assert ("sketch_value_counts" in names) == bool(sketched)
+
+
+def test_summarize_time_budget(make_dataframe):
+    df = make_dataframe({"n_rows": 2000, "columns": [{"dtype": dtype} for dtype in ["float", "int", "str", "datetime"]]})
+    # the sample of a sparse column can have no values
+    df = df.with_columns(sparse=pl.Series([None] * 1999 + [1.5], dtype=pl.Float64))
+    for input_df in [df, df.to_pandas(), df.lazy()]:
+        exact = summarize_dataframe(input_df)
+        # a generous budget changes nothing
+        summary = summarize_dataframe(input_df, time_budget=1000, sample_size=500)
+        # the standard deviation of the sparse column is NaN, != itself
+        assert summary["columns"][:4] == exact["columns"][:4]
+        assert summary["columns"][4]["constant_value"] == 1.5
+        assert summary["time_budget"] == 1000
+        assert "statistics_are_sampled" not in summary
+        summary = summarize_dataframe(
+            input_df, time_budget=1e-9, sample_size=500, with_plots=True
+        )
+        assert summary["statistics_are_sampled"] and summary["plots_are_sampled"]
+        assert summary["n_sampled_rows"] == 500
+        assert summary["associations_are_partial"]
+        assert summary["n_rows"] == 2000
+        for column, exact_column in zip(summary["columns"], exact["columns"]):
+            assert column["statistics_are_sampled"]
+            assert column["null_count"] == exact_column["null_count"]
+        string_column = summary["columns"][2]
+        n_non_null = 2000 - string_column["null_count"]
+        assert sum(string_column["value_counts"].values()) <= n_non_null * 1.2
+        # the number of distinct values is estimated on all rows
+        n_unique = exact["columns"][2]["n_unique"]
+        assert string_column["n_unique_is_approximate"]
+        assert string_column["n_unique"] == pytest.approx(n_unique, rel=0.05)
+        html = to_html(summary)
+        assert "time budget" in html
+        assert f">≈ {string_column['n_unique']}" in html
+    assert "≈" in Report(df, time_budget=1e-9, sample_size=500).text
+    ids = pl.DataFrame({"id": [str(i) for i in range(20_000)]})
+    summary = summarize_dataframe(ids, time_budget=1e-9, sample_size=500)
+    assert summary["columns"][0]["n_unique"] == pytest.approx(20_000, rel=0.05)
+    assert summary["columns"][0]["unique_proportion"] == pytest.approx(1.0, rel=0.05)
+    with pytest.raises(ValueError, match="'time_budget' is not supported"):
+        summarize_dataframe(df, return_state=True, time_budget=1)
+    with pytest.raises(ValueError, match="positive number"):
+        summarize_dataframe(df, time_budget=0)
+
+
+def _write_partitions(tmp_path):
+    df = pl.read_parquet(
+        pathlib.Path(__file__).parent / "data" / "air_quality_no2_long.parquet"
+    )
+    parts = []
+    for i, city in enumerate(df["city"].unique(maintain_order=True)):
+        part = df.filter(pl.col("city") == city).drop("city")
+        part_dir = tmp_path / "dataset" / f"city={city}"
+        part_dir.mkdir(parents=True)
+        part.write_parquet(part_dir / f"part-{i}.parquet")
+        parts.append(part)
+    (tmp_path / "dataset" / "_SUCCESS").touch()
+    return parts
+
+
+def test_read_dataset(tmp_path):
+    parts = _write_partitions(tmp_path)
+    files = _utils.list_files(tmp_path / "dataset")
+    assert len(files) == len(parts)
+    df = _utils.collect(_utils.read(tmp_path / "dataset"))
+    assert "city" in df.columns and df.shape[0] == sum(p.shape[0] for p in parts)
+    glob_df = _utils.collect(_utils.read(tmp_path / "dataset" / "**" / "*.parquet"))
+    assert glob_df.shape == (df.shape[0], df.shape[1] - 1)
+    partitions = _utils.read_partitions(tmp_path / "dataset")
+    assert [p.collect_schema() for p in partitions] == [df.schema] * len(parts)
+
+
+def test_summarize_partitions(tmp_path):
+    parts = _write_partitions(tmp_path)
+    report = Report(tmp_path / "dataset", n_jobs=2)
+    summary = report.summary_without_plots
+    expected = summarize_dataframe(_utils.read(tmp_path / "dataset"))
+    assert summary["n_rows"] == expected["n_rows"]
+    assert [c["name"] for c in summary["columns"]] == [
+        c["name"] for c in expected["columns"]
+    ]
+    for col, col_expected in zip(summary["columns"], expected["columns"]):
+        assert col["null_count"] == col_expected["null_count"]
+    partitions = summary["partitions"]
+    # files are sorted by path
+    assert sorted(p["n_rows"] for p in partitions) == sorted(p.shape[0] for p in parts)
+    assert [p["name"].split("/")[0] for p in partitions] == sorted(
+        f"city={city}" for city in expected["columns"][-1]["value_counts"]
+    )
+    assert "Dataset of" in report.html
+    assert "partitions" in json.loads(report.json)
+    # the text report lists the files too, with their rows and null values
+    text = report.text
+    for partition in partitions:
+        assert partition["name"] in text
+        assert str(partition["n_rows"]) in text